@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of per-step pipeline overhead: building the next step's
+PipelineData and carrying its metadata forward, with no real work in the steps.
+
+    python benchmarks/pipeline_overhead.py [--steps 20] [--metadata-keys 200]
+
+"rebuild" is the pattern steps used before `PipelineData.derive`: a fully
+validated PipelineData with a copied metadata dict per step. "derive" is the
+fast path.
+"""
+
+import argparse
+import time
+
+import anyio
+
+from llm_server.core import Pipeline
+from llm_server.core.types import MediaType, PipelineData
+
+
+class RebuildStep:
+    accepted_media_types = [MediaType.TEXT]
+
+    def __init__(self, index: int):
+        self.key = f"step_{index}"
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        return PipelineData(
+            media_type=data.media_type,
+            content=data.content,
+            metadata={**data.metadata, self.key: True},
+        )
+
+
+class DeriveStep(RebuildStep):
+    async def process(self, data: PipelineData) -> PipelineData:
+        return data.derive(**{self.key: True})
+
+
+async def measure(step_class: type, steps: int, data: PipelineData, runs: int) -> float:
+    pipeline = Pipeline([step_class(i) for i in range(steps)])
+    start = time.perf_counter()
+    for _ in range(runs):
+        await pipeline.execute(data)
+    return (time.perf_counter() - start) / (runs * steps)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--metadata-keys", type=int, default=200)
+    parser.add_argument("--content-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    data = PipelineData(
+        media_type=MediaType.TEXT,
+        content=b"\0" * args.content_bytes,
+        metadata={f"key_{i}": {"size": (800, 600)} for i in range(args.metadata_keys)},
+    )
+    for name, step_class in [("rebuild", RebuildStep), ("derive", DeriveStep)]:
+        per_step = await measure(step_class, args.steps, data, args.runs)
+        print(f"{name:>8}: {per_step * 1e6:8.2f} us/step")
+
+
+if __name__ == "__main__":
+    anyio.run(main)
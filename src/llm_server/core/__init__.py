@@ -1,44 +1,140 @@
 # --- Core Protocols ---
 from llm_server.core import logging
+from llm_server.core.admission import (
+    AdmissionController,
+    OverloadedError,
+    add_admission_handler,
+)
+from llm_server.core.cascade import (
+    CascadeProcessor,
+    all_of,
+    min_confidence,
+    non_empty,
+)
 from llm_server.core.circuit_breaker import CircuitBreaker
-from llm_server.core.image_utils import extract_gps_from_image
+from llm_server.core.concurrency import AdaptiveLimiter
+from llm_server.core.deadline import (
+    DeadlineExceededError,
+    deadline_scope,
+    remaining_time,
+)
+from llm_server.core.fallback import FallbackPolicy
+from llm_server.core.health import HealthProber
+from llm_server.core.hedging import HedgePolicy
+from llm_server.core.http_pool import HTTPClientPool, HTTPPoolConfig
+from llm_server.core.image_cache import ProcessedImageCache
+from llm_server.core.image_utils import (
+    ImageInfo,
+    ImageLimitError,
+    ImageLimits,
+    extract_gps_from_image,
+    inspect_image,
+)
 
 # --- Core Implementations ---
 from llm_server.core.implementations import ImageProcessor, ModelProcessor
+from llm_server.core.incremental_parser import (
+    IncrementalJSONParser,
+    ParsedField,
+    StreamedOutputParser,
+)
+from llm_server.core.latency import LatencyTracker
 
 # --- Core Utilities and Managers ---
-from llm_server.core.pipeline import Pipeline
+from llm_server.core.pipeline import (
+    DAGPipeline,
+    Pipeline,
+    PipelineNode,
+    merge_pipeline_data,
+)
 from llm_server.core.protocols import (
     ConfigProvider,
     ModelBackend,
+    ModelRegistry,
     OutputProcessor,
     PipelineStep,
     StorageAdapter,
+    StreamingOutputProcessor,
+    StreamingPipelineStep,
+)
+from llm_server.core.rate_limit import RateLimiter, RateLimitExceededError
+from llm_server.core.retry import RetryPolicy
+from llm_server.core.scheduling import (
+    FairScheduler,
+    add_request_class_middleware,
+    request_scope,
 )
+from llm_server.core.streaming import sse_response
+from llm_server.core.stub import StubLM
 
 # --- Core Data Types ---
 from llm_server.core.types import (
     MediaType,
     PipelineData,
+    PipelineEvent,
+    PipelineEventType,
     ProgramExecutionInfo,
     ProgramMetadata,
 )
+from llm_server.core.warmup import model_lifespan
 
 # --- Define the public API for this module ---
 __all__ = [
     "ConfigProvider",
     "ModelBackend",
+    "ModelRegistry",
     "OutputProcessor",
     "PipelineStep",
     "StorageAdapter",
     "MediaType",
     "PipelineData",
+    "PipelineEvent",
+    "PipelineEventType",
+    "StreamingPipelineStep",
+    "StreamingOutputProcessor",
+    "IncrementalJSONParser",
+    "ParsedField",
+    "StreamedOutputParser",
+    "sse_response",
     "ProgramExecutionInfo",
     "ProgramMetadata",
     "ImageProcessor",
     "ModelProcessor",
+    "CascadeProcessor",
+    "min_confidence",
+    "non_empty",
+    "all_of",
     "Pipeline",
+    "DAGPipeline",
+    "PipelineNode",
+    "merge_pipeline_data",
     "logging",
     "CircuitBreaker",
     "extract_gps_from_image",
+    "inspect_image",
+    "ImageInfo",
+    "ImageLimits",
+    "ImageLimitError",
+    "ProcessedImageCache",
+    "DeadlineExceededError",
+    "deadline_scope",
+    "remaining_time",
+    "LatencyTracker",
+    "HedgePolicy",
+    "FallbackPolicy",
+    "HealthProber",
+    "StubLM",
+    "HTTPClientPool",
+    "HTTPPoolConfig",
+    "RateLimiter",
+    "RateLimitExceededError",
+    "RetryPolicy",
+    "FairScheduler",
+    "request_scope",
+    "add_request_class_middleware",
+    "AdaptiveLimiter",
+    "AdmissionController",
+    "OverloadedError",
+    "add_admission_handler",
+    "model_lifespan",
 ]
@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from llm_server.core import logging
+from llm_server.core.deadline import remaining_time
+from llm_server.core.latency import LatencyTracker
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import ADMISSION_REJECTED_TOTAL
+except ImportError:
+    ADMISSION_REJECTED_TOTAL = None
+# --- End OTel Integration ---
+
+
+class OverloadedError(RuntimeError):
+    """
+    Raised when admission control sheds a request. Maps to HTTP 503 with a
+    Retry-After header (see `add_admission_handler`).
+    """
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Lane:
+    """Admission state for one key (a model or route)."""
+
+    semaphore: anyio.Semaphore
+    in_flight: int = 0
+    queued: int = 0
+    service_time: LatencyTracker = field(default_factory=LatencyTracker)
+    queue_time: LatencyTracker = field(default_factory=LatencyTracker)
+    stats: dict[str, int] = field(
+        default_factory=lambda: {
+            "admitted": 0,
+            "rejected_queue_full": 0,
+            "rejected_queue_timeout": 0,
+        }
+    )
+
+
+class AdmissionController:
+    """
+    Bounds concurrent executions per key (a model id or route name).
+
+    Up to `max_in_flight` executions run at once and up to `max_queue` wait
+    for a slot, first come first served. A request that finds the queue
+    full is rejected immediately; one that waits longer than
+    `queue_timeout`, or past its request deadline, is rejected when it
+    gives up. Rejections raise OverloadedError with a Retry-After estimate
+    from the queue length and recent execution times, so excess load is
+    shed at the door instead of slowing down every admitted request.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        max_in_flight: int = 32,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._lanes: dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, key: str) -> _Lane:
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = _Lane(anyio.Semaphore(self.max_in_flight))
+            return lane
+
+    def _retry_after(self, lane: _Lane) -> float:
+        """Rough time for the queue ahead to drain, at least one second."""
+        service = lane.service_time.expected() or 1.0
+        waves = (lane.queued + 1) / self.max_in_flight
+        return max(1.0, math.ceil(waves * service))
+
+    def _reject(self, lane: _Lane, key: str, reason: str) -> OverloadedError:
+        lane.stats[f"rejected_{reason}"] += 1
+        if ADMISSION_REJECTED_TOTAL:
+            ADMISSION_REJECTED_TOTAL.add(
+                1, {"controller": self.name, "key": key, "reason": reason}
+            )
+        retry_after = self._retry_after(lane)
+        logging.warning(
+            f"Admission '{self.name}' rejected a request for {key} ({reason}): "
+            f"{lane.in_flight} in flight, {lane.queued} queued"
+        )
+        return OverloadedError(
+            f"Overloaded: '{key}' is at capacity ({reason.replace('_', ' ')}). "
+            f"Retry after {retry_after:.0f} seconds",
+            retry_after=retry_after,
+        )
+
+    @asynccontextmanager
+    async def admit(self, key: str = "default") -> AsyncIterator[None]:
+        """Hold an execution slot for `key` for the duration of the block."""
+        lane = self._lane(key)
+        enqueued = time.perf_counter()
+        if lane.in_flight + lane.queued >= self.max_in_flight + self.max_queue:
+            raise self._reject(lane, key, "queue_full")
+
+        wait = self.queue_timeout
+        remaining = remaining_time()
+        if remaining is not None:
+            wait = min(wait, remaining)
+
+        lane.queued += 1
+        acquired = False
+        try:
+            with anyio.move_on_after(wait):
+                await lane.semaphore.acquire()
+                acquired = True
+        finally:
+            lane.queued -= 1
+        if not acquired:
+            raise self._reject(lane, key, "queue_timeout")
+
+        lane.in_flight += 1
+        lane.stats["admitted"] += 1
+        started = time.perf_counter()
+        lane.queue_time.record(started - enqueued)
+        try:
+            yield
+        finally:
+            lane.in_flight -= 1
+            lane.semaphore.release()
+            lane.service_time.record(time.perf_counter() - started)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            lanes = dict(self._lanes)
+        return {
+            key: {
+                **lane.stats,
+                "in_flight": lane.in_flight,
+                "queued": lane.queued,
+                "queue_time_p50_s": lane.queue_time.percentile(50),
+                "queue_time_p95_s": lane.queue_time.percentile(95),
+            }
+            for key, lane in lanes.items()
+        }
+
+
+def add_admission_handler(app):
+    """Map OverloadedError to HTTP 503 with Retry-After on a FastAPI application"""
+
+    async def handle_overloaded(request: Request, exc: OverloadedError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        )
+
+    app.add_exception_handler(OverloadedError, handle_overloaded)
+    return app
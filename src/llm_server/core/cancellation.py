@@ -0,0 +1,159 @@
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import anyio
+
+from llm_server.core import logging
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import (
+        ABANDONED_THREADS,
+        CANCELLED_WORK_TOTAL,
+    )
+except ImportError:
+    ABANDONED_THREADS = None
+    CANCELLED_WORK_TOTAL = None
+# --- End OTel Integration ---
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_stats = {
+    "cancelled_requests": 0,
+    "cancelled_model_calls": 0,
+    "abandoned_threads_total": 0,
+    "abandoned_threads_running": 0,
+}
+
+
+def record_cancelled(kind: str, **attributes: Any) -> None:
+    """Count a unit of work ("request" or "model_call") cancelled before completion."""
+    with _lock:
+        _stats[f"cancelled_{kind}s"] = _stats.get(f"cancelled_{kind}s", 0) + 1
+    if CANCELLED_WORK_TOTAL:
+        CANCELLED_WORK_TOTAL.add(1, {"kind": kind, **attributes})
+
+
+def get_cancellation_stats() -> dict[str, int]:
+    """Process-wide counts of cancelled work and abandoned threads."""
+    with _lock:
+        return dict(_stats)
+
+
+async def run_sync_abandonable(func: Callable[[], T], model_id: str) -> T:
+    """
+    Run a blocking model call in a worker thread that the caller can abandon.
+
+    If the caller is cancelled (client disconnect, deadline), it stops
+    waiting right away. A thread cannot be killed, so the call runs on until
+    the provider returns or times out; it is counted as abandoned until then,
+    so the capacity it still holds stays visible.
+    """
+    state = {"finished": False, "abandoned": False}
+
+    def run() -> T:
+        try:
+            return func()
+        finally:
+            with _lock:
+                state["finished"] = True
+                if state["abandoned"]:
+                    _stats["abandoned_threads_running"] -= 1
+            if state["abandoned"]:
+                if ABANDONED_THREADS:
+                    ABANDONED_THREADS.add(-1, {"model_id": model_id})
+                logging.info(f"Abandoned call to {model_id} finished in the background")
+
+    try:
+        return await anyio.to_thread.run_sync(run, abandon_on_cancel=True)
+    except anyio.get_cancelled_exc_class():
+        with _lock:
+            if not state["finished"]:
+                state["abandoned"] = True
+                _stats["abandoned_threads_total"] += 1
+                _stats["abandoned_threads_running"] += 1
+        if state["abandoned"] and ABANDONED_THREADS:
+            ABANDONED_THREADS.add(1, {"model_id": model_id})
+        record_cancelled("model_call", model_id=model_id)
+        raise
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    ASGI middleware that cancels request handling as soon as the client
+    disconnects, so abandoned requests stop consuming model calls and
+    threads. Cancellation propagates through `Pipeline.execute` into
+    `ModelProcessor`, which aborts async provider calls and abandons
+    threaded ones.
+
+    The middleware reads the ASGI receive channel in the background and
+    relays messages to the app, which is how it sees `http.disconnect`
+    while the app is busy.
+    """
+
+    def __init__(self, app, tracked_paths: list | None = None):
+        self.app = app
+        self.tracked_paths = tracked_paths or [
+            "/v1/predict",
+            "/v1/pipeline",
+        ]
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope["type"] != "http" or not any(
+            scope.get("path", "").startswith(p) for p in self.tracked_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        relay_send, relay_receive = anyio.create_memory_object_stream[dict](16)
+        disconnected = False
+        app_done = False
+        app_error: Exception | None = None
+
+        with relay_receive:
+            async with anyio.create_task_group() as tg:
+
+                async def watch_for_disconnect() -> None:
+                    nonlocal disconnected
+                    async with relay_send:
+                        while True:
+                            message = await receive()
+                            await relay_send.send(message)
+                            if message["type"] == "http.disconnect":
+                                disconnected = not app_done
+                                tg.cancel_scope.cancel()
+                                return
+
+                async def relayed_receive() -> dict:
+                    try:
+                        return await relay_receive.receive()
+                    except anyio.EndOfStream:
+                        return {"type": "http.disconnect"}
+
+                tg.start_soon(watch_for_disconnect)
+                try:
+                    await self.app(scope, relayed_receive, send)
+                except Exception as e:
+                    # Re-raised below, unwrapped by the task group
+                    app_error = e
+                finally:
+                    # The response is complete (or failed); stop watching
+                    app_done = True
+                    tg.cancel_scope.cancel()
+
+        if app_error is not None:
+            raise app_error
+        if disconnected:
+            record_cancelled("request", path=scope.get("path", ""))
+            logging.info(
+                f"Client disconnected; cancelled request to {scope.get('path', '')}"
+            )
+
+
+def add_disconnect_middleware(app):
+    """Add disconnect-aware cancellation to a FastAPI application"""
+    logging.info("Registering CancelOnDisconnectMiddleware")
+    app.add_middleware(CancelOnDisconnectMiddleware)
+    return app
@@ -0,0 +1,163 @@
+import functools
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from llm_server.core import logging
+from llm_server.core.implementations import ModelProcessor
+from llm_server.core.protocols import ModelRegistry
+from llm_server.core.types import PipelineData, PipelineEvent, PipelineEventType, Usage
+from llm_server.core.utils import run_concurrently
+
+# Decides whether a tier's answer is good enough: (raw prediction, processed output)
+AcceptanceCheck = Callable[[Any, Any], bool]
+
+
+def min_confidence(threshold: float, field: str = "confidence") -> AcceptanceCheck:
+    """Accept when the prediction's `field` is a number of at least `threshold`."""
+
+    def check(prediction: Any, output: Any) -> bool:
+        try:
+            return float(getattr(prediction, field)) >= threshold
+        except (AttributeError, TypeError, ValueError):
+            return False
+
+    return check
+
+
+def non_empty(*fields: str) -> AcceptanceCheck:
+    """Accept when each of the prediction's `fields` (or the output) is non-empty."""
+
+    def check(prediction: Any, output: Any) -> bool:
+        if not fields:
+            return bool(output)
+        return all(
+            getattr(prediction, name, None) not in (None, "", [], {}) for name in fields
+        )
+
+    return check
+
+
+def all_of(*checks: AcceptanceCheck) -> AcceptanceCheck:
+    """Accept only when every check accepts."""
+
+    def check(prediction: Any, output: Any) -> bool:
+        return all(c(prediction, output) for c in checks)
+
+    return check
+
+
+class CascadeProcessor(ModelProcessor):
+    """
+    A ModelProcessor that tries an ordered list of models, cheapest first,
+    and escalates to the next tier only when `accept` rejects an answer.
+
+    An answer is also rejected when the output processor raises, e.g.
+    because the output fails schema validation. The last tier's answer is
+    returned regardless. Tiers may be model ids or group names.
+
+    The output metadata records which tier answered under `cascade`, with
+    the model, latency, usage and verdict of each attempt; `usage` holds
+    the total across tiers. With a `fallback` policy, an unavailable tier
+    is answered by the fallback, and the metadata says `degraded`.
+
+    Other keyword arguments are passed on to ModelProcessor. Cascades are
+    not streamed: `process_stream` runs `process` and emits its result.
+    """
+
+    def __init__(
+        self,
+        model_manager: ModelRegistry,
+        tiers: list[str],
+        accept: AcceptanceCheck,
+        **kwargs: Any,
+    ):
+        if not tiers:
+            raise ValueError("CascadeProcessor needs at least one model tier")
+        super().__init__(model_manager, tiers[0], **kwargs)
+        self.tiers = tiers
+        self.accept = accept
+        self.stats = {"requests": 0, "answered_by_tier": [0] * len(tiers)}
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        content = data.content
+        fan_out = isinstance(content, (list, tuple)) and (
+            not self._accepts_multiple_inputs()
+        )
+        if fan_out:
+            results = await run_concurrently(
+                [functools.partial(self._cascade, item, data) for item in content],
+                self.max_concurrency,
+            )
+            final_result: Any = [output for output, _ in results]
+            records = [record for _, record in results]
+        else:
+            if isinstance(content, tuple):
+                content = list(content)
+            final_result, record = await self._cascade(content, data)
+            records = [record]
+
+        usage = Usage()
+        for record in records:
+            for attempt in record["attempts"]:
+                usage.prompt_tokens += attempt["usage"].prompt_tokens
+                usage.completion_tokens += attempt["usage"].completion_tokens
+        annotations: dict[str, Any] = {}
+        degraded = [record["degraded"] for record in records]
+        if any(degraded):
+            annotations["degraded"] = degraded if fan_out else degraded[0]
+        return data.derive(
+            content=final_result,
+            media_type=self.output_type,
+            metadata=annotations,
+            processed=True,
+            usage=usage,
+            cascade=records if fan_out else records[0],
+        )
+
+    async def _cascade(
+        self, value: Any, data: PipelineData
+    ) -> tuple[Any, dict[str, Any]]:
+        """Run the tiers for one input; returns the output and its cascade record."""
+        attempts: list[dict[str, Any]] = []
+        for tier, tier_model in enumerate(self.tiers):
+            is_last = tier == len(self.tiers) - 1
+            start = time.perf_counter()
+            raw, model_id, degraded = await self._predict_or_fall_back(
+                {self.input_key: value}, tier_model
+            )
+            attempt: dict[str, Any] = {
+                "tier": tier,
+                "model_id": model_id,
+                "latency_s": time.perf_counter() - start,
+                "usage": self._prediction_usage(raw, model_id or tier_model),
+                "degraded": degraded,
+            }
+            attempts.append(attempt)
+
+            try:
+                output = self.output_processor.process(raw, pipeline_data=data)
+                accepted = self.accept(raw, output)
+            except Exception as e:
+                if is_last:
+                    raise
+                logging.info(f"Cascade tier {tier} ({model_id}) output invalid: {e}")
+                accepted = False
+            attempt["accepted"] = accepted
+
+            if accepted or is_last:
+                self.stats["requests"] += 1
+                self.stats["answered_by_tier"][tier] += 1
+                return output, {
+                    "tier": tier,
+                    "model_id": model_id,
+                    "degraded": degraded,
+                    "attempts": attempts,
+                }
+            logging.info(f"Cascade escalating from tier {tier} ({model_id})")
+
+        raise AssertionError("unreachable: the last tier always returns")
+
+    async def process_stream(self, data: PipelineData) -> AsyncIterator[PipelineEvent]:
+        output = await self.process(data)
+        yield PipelineEvent(type=PipelineEventType.STEP_COMPLETED, data=output)
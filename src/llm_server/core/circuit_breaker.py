@@ -1,5 +1,6 @@
-import asyncio
-from collections.abc import Callable, Coroutine
+import threading
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from enum import Enum
 from functools import wraps
@@ -33,16 +34,31 @@ class State(Enum):
     HALF_OPEN = "HALF_OPEN"  # Testing if it's safe to resume
 
 
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is blocked because the circuit is OPEN."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 10, reset_timeout: int = 120):
+    def __init__(
+        self,
+        failure_threshold: int = 10,
+        reset_timeout: int = 120,
+        name: str | None = None,
+    ):
         self.failure_threshold = failure_threshold
         self.reset_timeout = reset_timeout
         self.state = State.CLOSED
         self.failures = 0
         self.last_failure_time = None
-        self.lock = asyncio.Lock()
+        # Guards state bookkeeping only; never held across the protected call
+        self.lock = threading.Lock()
+        self._trial_in_flight = False
         self.protected_function_name = (
-            None  # Store the name of the function being protected
+            name  # Store the name of the function (or model) being protected
         )
 
         # Metrics tracking
@@ -71,150 +87,235 @@ class CircuitBreaker:
     def __call__(
         self, func: Callable[P, Coroutine[Any, Any, R]]
     ) -> Callable[P, Coroutine[Any, Any, R]]:
-        self.protected_function_name = func.__name__  # Capture function name
+        self.protected_function_name = (
+            self.protected_function_name or func.__name__
+        )  # Capture function name
 
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            async with self.protect():
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    @property
+    def is_blocking(self) -> bool:
+        """Whether a call made now would be rejected (OPEN, or HALF_OPEN mid-trial)."""
+        with self.lock:
+            if self.state == State.OPEN:
+                return not self._should_reset()
+            return self.state == State.HALF_OPEN and self._trial_in_flight
+
+    @asynccontextmanager
+    async def protect(self) -> AsyncIterator[None]:
+        """
+        Guard a block of code with the breaker.
+
+        The lock only covers state bookkeeping, never the protected call
+        itself, so concurrent calls run in parallel. In HALF_OPEN a single
+        trial call is let through; others are blocked until it resolves.
+        """
+        is_trial = self._before_call()
+        outcome_recorded = False
+        try:
+            yield
+        except Exception as e:
+            # Handle failure
+            outcome_recorded = True
+            self._handle_failure(e, is_trial)
+            raise
+        else:
+            outcome_recorded = True
+            self._handle_success(is_trial)
+        finally:
+            if is_trial and not outcome_recorded:
+                # Cancelled trial: let the next caller probe instead
+                with self.lock:
+                    self._trial_in_flight = False
+
+    def _before_call(self) -> bool:
+        """Admit or block a call. Returns True if the call is the HALF_OPEN trial."""
+        with self.lock:
             self.metrics["total_calls"] += 1
 
-            async with self.lock:
-                # Update time spent in current state
-                current_time = get_utc_now()
-                last_state_change = self.metrics["state_change_timestamps"][
-                    self.state.value
-                ]
-                if last_state_change:
-                    time_delta = (current_time - last_state_change).total_seconds()
-                    self.metrics["time_in_states"][self.state.value] += time_delta
-                    # Update the timestamp for the current state
-                    self.metrics["state_change_timestamps"][self.state.value] = (
-                        current_time
-                    )
+            # Update time spent in current state
+            current_time = get_utc_now()
+            last_state_change = self.metrics["state_change_timestamps"][
+                self.state.value
+            ]
+            if last_state_change:
+                time_delta = (current_time - last_state_change).total_seconds()
+                self.metrics["time_in_states"][self.state.value] += time_delta
+                # Update the timestamp for the current state
+                self.metrics["state_change_timestamps"][self.state.value] = current_time
+
+            if self.state == State.OPEN and self._should_reset():
+                # Track state change
+                old_state = self.state
+                self.state = State.HALF_OPEN
+                self._track_state_change(old_state, self.state)
+
+                self.metrics["recovery_attempts"] += 1
+
+                logging.info(
+                    f"Circuit breaker for '{self.protected_function_name}' attempting reset "
+                    f"after {self.reset_timeout} seconds in OPEN state"
+                )
 
-                if self.state == State.OPEN:
-                    if await self._should_reset():
-                        # Track state change
-                        old_state = self.state
-                        self.state = State.HALF_OPEN
-                        await self._track_state_change(old_state, self.state)
-
-                        self.metrics["recovery_attempts"] += 1
-
-                        logging.info(
-                            f"Circuit breaker for '{self.protected_function_name}' attempting reset "
-                            f"after {self.reset_timeout} seconds in OPEN state"
-                        )
-                    else:
-                        # Add a check to assure the type checker and for robustness
-                        if self.last_failure_time:
-                            remaining_time = (
-                                self.last_failure_time
-                                + timedelta(seconds=self.reset_timeout)
-                                - datetime.now()
-                            )
-                        else:
-                            # This case should not be reached in the current logic,
-                            # but it's safe to have a fallback.
-                            remaining_time = timedelta(seconds=self.reset_timeout)
-
-                        logging.warning(
-                            f"Circuit breaker for '{self.protected_function_name}' is OPEN. "
-                            f"Blocking request. Will try reset in {remaining_time.seconds} seconds. "
-                            f"Last failure was at {self.last_failure_time}"
-                        )
-                        # Track blocked request
-                        self.metrics["blocked_requests"] = (
-                            self.metrics.get("blocked_requests", 0) + 1
-                        )
-
-                        raise RuntimeError(
-                            f"Circuit breaker is OPEN for '{self.protected_function_name}'. "
-                            f"Too many failures (threshold: {self.failure_threshold}). "
-                            f"Retry after {remaining_time.seconds} seconds"
-                        )
-
-                try:
-                    if self.state == State.HALF_OPEN:
-                        logging.info(
-                            f"Circuit breaker for '{self.protected_function_name}' is HALF-OPEN. "
-                            f"Testing with single request..."
-                        )
-
-                    result = await func(*args, **kwargs)
-
-                    # Handle successful execution
-                    self.metrics["successful_calls"] += 1
-
-                    if self.state == State.HALF_OPEN:
-                        # Track state change and successful recovery
-                        old_state = self.state
-                        self.state = State.CLOSED
-                        await self._track_state_change(old_state, self.state)
-
-                        self.failures = 0
-                        self.metrics["consecutive_failures"] = 0
-                        self.metrics["successful_recoveries"] += 1
-
-                        logging.info(
-                            f"Circuit breaker for '{self.protected_function_name}' test succeeded. "
-                            f"Resetting to CLOSED state."
-                        )
-                    return result
-
-                except Exception as e:
-                    # Handle failure
-                    self.metrics["failed_calls"] += 1
-                    await self._handle_failure(e)
-                    raise
+            if self.state == State.HALF_OPEN and not self._trial_in_flight:
+                logging.info(
+                    f"Circuit breaker for '{self.protected_function_name}' is HALF-OPEN. "
+                    f"Testing with single request..."
+                )
+                self._trial_in_flight = True
+                return True
+
+            if self.state == State.CLOSED:
+                return False
+
+            # OPEN, or HALF_OPEN with the trial request still in flight
+            # Add a check to assure the type checker and for robustness
+            if self.last_failure_time:
+                remaining_time = (
+                    self.last_failure_time
+                    + timedelta(seconds=self.reset_timeout)
+                    - datetime.now()
+                )
+            else:
+                # This case should not be reached in the current logic,
+                # but it's safe to have a fallback.
+                remaining_time = timedelta(seconds=self.reset_timeout)
+            remaining_time = max(remaining_time, timedelta(0))
+
+            logging.warning(
+                f"Circuit breaker for '{self.protected_function_name}' is {self.state.value}. "
+                f"Blocking request. Will try reset in {remaining_time.seconds} seconds. "
+                f"Last failure was at {self.last_failure_time}"
+            )
+            # Track blocked request
+            self.metrics["blocked_requests"] = (
+                self.metrics.get("blocked_requests", 0) + 1
+            )
 
-        return wrapper
+            raise CircuitOpenError(
+                f"Circuit breaker is OPEN for '{self.protected_function_name}'. "
+                f"Too many failures (threshold: {self.failure_threshold}). "
+                f"Retry after {remaining_time.seconds} seconds",
+                retry_after=remaining_time.total_seconds(),
+            )
+
+    def _handle_success(self, is_trial: bool) -> None:
+        with self.lock:
+            # Handle successful execution
+            self.metrics["successful_calls"] += 1
+            self.metrics["consecutive_failures"] = 0
+
+            if is_trial:
+                self._trial_in_flight = False
+            if is_trial and self.state == State.HALF_OPEN:
+                # Track state change and successful recovery
+                old_state = self.state
+                self.state = State.CLOSED
+                self._track_state_change(old_state, self.state)
+
+                self.failures = 0
+                self.metrics["successful_recoveries"] += 1
+
+                logging.info(
+                    f"Circuit breaker for '{self.protected_function_name}' test succeeded. "
+                    f"Resetting to CLOSED state."
+                )
 
-    async def _should_reset(self) -> bool:
+    def record_probe(self, healthy: bool, error: Exception | None = None) -> None:
+        """
+        Feed the outcome of an out-of-band health probe. A healthy probe
+        closes an OPEN or HALF_OPEN circuit without a user request having to
+        be the trial; an unhealthy one opens the circuit, or keeps it open
+        for another `reset_timeout`.
+        """
+        with self.lock:
+            if healthy:
+                if self.state == State.CLOSED:
+                    return
+                old_state = self.state
+                self.state = State.CLOSED
+                self._track_state_change(old_state, self.state)
+                self.failures = 0
+                self.metrics["successful_recoveries"] += 1
+                logging.info(
+                    f"Circuit breaker for '{self.protected_function_name}' closed "
+                    "after a healthy probe"
+                )
+                return
+
+            self.last_failure_time = datetime.now()
+            if self.state == State.OPEN:
+                return
+            old_state = self.state
+            self.state = State.OPEN
+            self._track_state_change(old_state, self.state)
+            logging.error(
+                f"Circuit breaker opened for '{self.protected_function_name}' after "
+                f"failed health probes. Last error: {type(error).__name__}: {error}. "
+                f"Will reset in {self.reset_timeout}s"
+            )
+
+    def _should_reset(self) -> bool:
         if not self.last_failure_time:
             return True
         reset_after = self.last_failure_time + timedelta(seconds=self.reset_timeout)
         return datetime.now() >= reset_after
 
-    async def _handle_failure(self, exception: Exception):
-        self.failures += 1
-        self.last_failure_time = datetime.now()
+    def _handle_failure(self, exception: Exception, is_trial: bool = False) -> None:
+        with self.lock:
+            self.metrics["failed_calls"] += 1
+            self.failures += 1
+            self.last_failure_time = datetime.now()
+            if is_trial:
+                self._trial_in_flight = False
+
+            # --- OTel Instrumentation ---
+            if CIRCUIT_BREAKER_FAILURES_TOTAL:
+                attributes = {
+                    "function.name": self.protected_function_name or "unknown"
+                }
+                CIRCUIT_BREAKER_FAILURES_TOTAL.add(1, attributes)
+
+            # Update consecutive failures metric
+            self.metrics["consecutive_failures"] += 1
+            self.metrics["max_consecutive_failures"] = max(
+                self.metrics["max_consecutive_failures"],
+                self.metrics["consecutive_failures"],
+            )
 
-        # --- OTel Instrumentation ---
-        if CIRCUIT_BREAKER_FAILURES_TOTAL:
-            attributes = {"function.name": self.protected_function_name or "unknown"}
-            CIRCUIT_BREAKER_FAILURES_TOTAL.add(1, attributes)
-
-        # Update consecutive failures metric
-        self.metrics["consecutive_failures"] += 1
-        self.metrics["max_consecutive_failures"] = max(
-            self.metrics["max_consecutive_failures"],
-            self.metrics["consecutive_failures"],
-        )
+            if self.state == State.OPEN:
+                # Late failure from a call admitted before the breaker opened
+                return
 
-        if self.state == State.HALF_OPEN or self.failures >= self.failure_threshold:
-            old_state = self.state
-            self.state = State.OPEN
+            if self.state == State.HALF_OPEN or self.failures >= self.failure_threshold:
+                old_state = self.state
+                self.state = State.OPEN
 
-            # Track state change
-            await self._track_state_change(old_state, self.state)
+                # Track state change
+                self._track_state_change(old_state, self.state)
 
-            # Log detailed failure information
-            # Only log detailed message when circuit first opens
-            logging.error(
-                f"Circuit breaker opened for '{self.protected_function_name}' after {self.failures} "
-                f"failures. Last error: {type(exception).__name__}: {str(exception)}. "
-                f"Will reset in {self.reset_timeout}s"
-            )
-        else:
-            # Log warning for accumulating failures
-            # Only log every other failure to reduce noise
-            if self.failures % 2 == 0:
-                logging.warning(
-                    f"Circuit breaker for '{self.protected_function_name}': "
-                    f"{self.failures}/{self.failure_threshold} failures"
+                # Log detailed failure information
+                # Only log detailed message when circuit first opens
+                logging.error(
+                    f"Circuit breaker opened for '{self.protected_function_name}' after {self.failures} "
+                    f"failures. Last error: {type(exception).__name__}: {str(exception)}. "
+                    f"Will reset in {self.reset_timeout}s"
                 )
+            else:
+                # Log warning for accumulating failures
+                # Only log every other failure to reduce noise
+                if self.failures % 2 == 0:
+                    logging.warning(
+                        f"Circuit breaker for '{self.protected_function_name}': "
+                        f"{self.failures}/{self.failure_threshold} failures"
+                    )
 
-    async def _track_state_change(self, from_state: State, to_state: State):
+    def _track_state_change(self, from_state: State, to_state: State):
         """Track a state transition for metrics purposes"""
         current_time = get_utc_now()
         # Record time spent in previous state
@@ -265,6 +366,10 @@ class CircuitBreaker:
 
     def get_metrics(self) -> dict[str, Any]:
         """Get current circuit breaker metrics"""
+        with self.lock:
+            return self._snapshot_metrics()
+
+    def _snapshot_metrics(self) -> dict[str, Any]:
         # Update time spent in current state
         current_time = get_utc_now()
         last_state_change = self.metrics["state_change_timestamps"][self.state.value]
@@ -0,0 +1,193 @@
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import anyio
+
+from llm_server.core import logging
+from llm_server.core.deadline import enforce_budget, remaining_time
+from llm_server.core.retry import is_retryable
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import CONCURRENCY_LIMIT
+except ImportError:
+    CONCURRENCY_LIMIT = None
+# --- End OTel Integration ---
+
+CONCURRENCY_ALGORITHMS = ("gradient", "aimd")
+
+
+class AdaptiveLimiter:
+    """
+    A concurrency limit for one model backend that adapts to its measured
+    round-trip times, in the spirit of Netflix's concurrency-limits.
+
+    "gradient" compares a slow-moving baseline RTT with recent RTTs: while
+    they match (within `rtt_tolerance`) and the limit is in use, it grows
+    by about sqrt(limit); as queueing at the provider inflates recent RTTs,
+    the ratio drops below one and the limit shrinks proportionally.
+
+    "aimd" adds one when calls succeed with the limit in use and multiplies
+    by `backoff_ratio` on a timeout, 429 or 5xx. Errors that say nothing
+    about load (e.g. 4xx) and cancelled calls are ignored.
+
+    Callers beyond the limit wait for a slot, first come first served,
+    within the request deadline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        algorithm: str = "gradient",
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+        rtt_tolerance: float = 1.5,
+    ):
+        if algorithm not in CONCURRENCY_ALGORITHMS:
+            raise ValueError(
+                f"Unknown concurrency algorithm '{algorithm}', "
+                f"expected one of {CONCURRENCY_ALGORITHMS}"
+            )
+        self.name = name
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.rtt_tolerance = rtt_tolerance
+        self._limit = float(initial_limit)
+        self.in_flight = 0
+        # Baseline (long window) and recent (short window) RTT averages
+        self.baseline_rtt: float | None = None
+        self.recent_rtt: float | None = None
+        self._waiters: deque[anyio.Event] = deque()
+        self._lock = threading.Lock()
+        self.stats = {"samples": 0, "drops": 0, "waited": 0}
+        if CONCURRENCY_LIMIT:
+            CONCURRENCY_LIMIT.add(self.limit, {"model_id": self.name})
+
+    @classmethod
+    def from_config(
+        cls, name: str, config: dict[str, Any] | None
+    ) -> "AdaptiveLimiter | None":
+        """Build a limiter from a model's `concurrency` config block, if any."""
+        if not config:
+            return None
+        return cls(
+            name,
+            algorithm=config.get("algorithm", "gradient"),
+            initial_limit=config.get("initial", 8),
+            min_limit=config.get("min", 1),
+            max_limit=config.get("max", 256),
+        )
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _set_limit(self, value: float) -> None:
+        old = self.limit
+        self._limit = min(float(self.max_limit), max(float(self.min_limit), value))
+        if self.limit != old:
+            if CONCURRENCY_LIMIT:
+                CONCURRENCY_LIMIT.add(self.limit - old, {"model_id": self.name})
+            logging.debug(f"Concurrency limit for {self.name}: {old} -> {self.limit}")
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            self._waiters.popleft().set()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold one of the limited slots while the enclosed call runs."""
+        with self._lock:
+            admitted = not self._waiters and self.in_flight < self.limit
+            if admitted:
+                self.in_flight += 1
+            else:
+                event = anyio.Event()
+                self._waiters.append(event)
+                self.stats["waited"] += 1
+        if not admitted:
+            try:
+                with enforce_budget(remaining_time(), f"{self.name} concurrency slot"):
+                    await event.wait()
+            except BaseException:
+                with self._lock:
+                    if event.is_set():
+                        # Slot was handed over as we gave up; pass it on
+                        self.in_flight -= 1
+                        self._wake()
+                    else:
+                        self._waiters.remove(event)
+                raise
+
+        start = time.perf_counter()
+        dropped: bool | None = None
+        try:
+            yield
+            dropped = False
+        except Exception as e:
+            if is_retryable(e):
+                dropped = True
+            raise
+        finally:
+            with self._lock:
+                if dropped is not None:
+                    self._on_sample(time.perf_counter() - start, dropped)
+                self.in_flight -= 1
+                self._wake()
+
+    def _on_sample(self, rtt: float, dropped: bool) -> None:
+        self.stats["samples"] += 1
+        if dropped:
+            self.stats["drops"] += 1
+        if self.algorithm == "aimd":
+            if dropped:
+                self._set_limit(self._limit * self.backoff_ratio)
+            elif self.in_flight * 2 >= self.limit:
+                # Only grow while the current limit is actually being used
+                self._set_limit(self._limit + 1)
+            return
+
+        if self.baseline_rtt is None or self.recent_rtt is None:
+            self.baseline_rtt = self.recent_rtt = rtt
+            return
+        self.recent_rtt += 0.5 * (rtt - self.recent_rtt)
+        self.baseline_rtt += 0.02 * (rtt - self.baseline_rtt)
+        if dropped:
+            gradient = 0.5
+        else:
+            gradient = max(
+                0.5, min(1.0, self.rtt_tolerance * self.baseline_rtt / self.recent_rtt)
+            )
+        if gradient >= 1.0 and self.in_flight * 2 < self.limit:
+            # Mostly idle: no evidence that the limit is too low
+            return
+        headroom = math.sqrt(self.limit) if gradient >= 1.0 else 0.0
+        target = self._limit * gradient + headroom
+        self._set_limit(self._limit * (1 - self.smoothing) + target * self.smoothing)
+        if self.baseline_rtt > self.recent_rtt:
+            # Let the baseline follow improvements quickly
+            self.baseline_rtt = self.recent_rtt
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "algorithm": self.algorithm,
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "baseline_rtt_s": self.baseline_rtt,
+                "recent_rtt_s": self.recent_rtt,
+            }
@@ -10,6 +10,26 @@ class FrameworkSettings(BaseSettings):
     huggingface_api_key: str = os.getenv("HUGGINGFACE_API_KEY", "")
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
 
+    # How requests to a model group are spread: "p2c" or "least_outstanding"
+    routing_strategy: str = os.getenv("LLM_ROUTING_STRATEGY", "p2c")
+
+    # Seconds between background health probes of each model; 0 disables them
+    health_check_interval: float = float(os.getenv("LLM_HEALTH_CHECK_INTERVAL", "0"))
+
+    # Send provider calls through one shared, tuned HTTP connection pool
+    http_pool_enabled: bool = (
+        os.getenv("LLM_HTTP_POOL_ENABLED", "false").lower() == "true"
+    )
+    http_pool_max_connections: int = int(
+        os.getenv("LLM_HTTP_POOL_MAX_CONNECTIONS", "100")
+    )
+    http_pool_max_keepalive: int = int(os.getenv("LLM_HTTP_POOL_MAX_KEEPALIVE", "20"))
+    # Seconds an idle connection is kept open for reuse
+    http_pool_keepalive_expiry: float = float(
+        os.getenv("LLM_HTTP_POOL_KEEPALIVE_EXPIRY", "120")
+    )
+    http_pool_http2: bool = os.getenv("LLM_HTTP_POOL_HTTP2", "true").lower() == "true"
+
     # --- OpenTelemetry Configuration ---
     # Master switch for the entire OTel integration
     otel_enabled: bool = os.getenv("OTEL_ENABLED", "false").lower() == "true"
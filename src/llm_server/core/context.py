@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from llm_server.core.metrics_wrappers import PerformanceMetrics
+    from llm_server.core.scheduling import RequestClass
 
 # Forward reference to avoid circular imports
 _current_metrics: ContextVar[Optional["PerformanceMetrics"]] = ContextVar(
@@ -17,3 +18,14 @@ def get_current_metrics() -> Optional["PerformanceMetrics"]:
 def set_current_metrics(metrics: Optional["PerformanceMetrics"]) -> None:
     """Sets the current metrics instance in the context."""
     _current_metrics.set(metrics)
+
+
+# Absolute request deadline on the time.monotonic() clock; see core.deadline
+_current_deadline: ContextVar[float | None] = ContextVar(
+    "current_deadline", default=None
+)
+
+# Tenant and priority class of the current request; see core.scheduling
+_current_request_class: ContextVar[Optional["RequestClass"]] = ContextVar(
+    "current_request_class", default=None
+)
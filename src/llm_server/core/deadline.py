@@ -0,0 +1,89 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import anyio
+
+from llm_server.core.context import _current_deadline
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request's deadline has passed or cannot cover the next step."""
+
+
+def get_deadline() -> float | None:
+    """The current request deadline on the `time.monotonic()` clock, if any."""
+    return _current_deadline.get()
+
+
+def remaining_time() -> float | None:
+    """Seconds left until the current deadline, or None if there is none."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(timeout: float | None) -> Iterator[float | None]:
+    """
+    Set a deadline `timeout` seconds from now for the enclosed code and
+    everything it calls. A nested scope can tighten an outer deadline but
+    never extend it. With `timeout=None` the outer deadline, if any, applies.
+    """
+    current = _current_deadline.get()
+    if timeout is None:
+        yield current
+        return
+
+    deadline = time.monotonic() + timeout
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_budget(name: str, expected_latency: float | None = None) -> float | None:
+    """
+    Return the seconds left for `name`, or None without a deadline.
+
+    Raises DeadlineExceededError if the deadline has passed, or if the time
+    left is less than the work's `expected_latency`: there is no point
+    starting a call that will almost certainly be cut off.
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return None
+    if remaining <= 0:
+        raise DeadlineExceededError(
+            f"Deadline exceeded before {name} started ({-remaining:.3f}s ago)"
+        )
+    if expected_latency is not None and remaining < expected_latency:
+        raise DeadlineExceededError(
+            f"Only {remaining:.3f}s left for {name}, which typically takes "
+            f"{expected_latency:.3f}s"
+        )
+    return remaining
+
+
+@contextmanager
+def enforce_budget(budget: float | None, name: str) -> Iterator[None]:
+    """
+    Cancel the enclosed work if it runs longer than `budget` seconds, and
+    raise DeadlineExceededError instead. The budget is also the enclosed
+    work's deadline, so it can see how long it has and stop itself first.
+    No-op when `budget` is None.
+    """
+    if budget is None:
+        yield
+        return
+
+    with deadline_scope(max(budget, 0)), anyio.move_on_after(max(budget, 0)) as scope:
+        yield
+    if scope.cancelled_caught:
+        raise DeadlineExceededError(
+            f"{name} did not finish within its {budget:.3f}s budget"
+        )
@@ -0,0 +1,172 @@
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any
+
+from llm_server.core import logging
+from llm_server.core.circuit_breaker import CircuitOpenError
+from llm_server.core.deadline import (
+    DeadlineExceededError,
+    deadline_scope,
+    remaining_time,
+)
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import FALLBACK_EVENTS_TOTAL
+except ImportError:
+    FALLBACK_EVENTS_TOTAL = None
+# --- End OTel Integration ---
+
+# A call that returns a prediction and the model that produced it
+ModelCall = Callable[[], Awaitable[tuple[Any, str]]]
+
+FALLBACK_REASONS: dict[type[Exception], str] = {
+    CircuitOpenError: "circuit_open",
+    DeadlineExceededError: "deadline_exceeded",
+}
+
+
+def input_key(model_id: str, input_dict: dict[str, Any]) -> str:
+    """A stable cache key for one call's inputs."""
+    encoded = json.dumps(input_dict, sort_keys=True, default=repr)
+    return hashlib.sha256(f"{model_id}\0{encoded}".encode()).hexdigest()
+
+
+class FallbackPolicy:
+    """
+    What a ModelProcessor serves instead of failing when its model cannot
+    answer: the circuit is OPEN or the request deadline is blown. In order:
+
+    1. The last response to the same input, if `max_staleness` is set and
+       it is at most that many seconds old (stale-while-error).
+    2. A call to `fallback_model_id`, unless the deadline has already passed.
+    3. `fallback_fn(input_dict)`, a local (sync or async) function returning
+       what the output processor expects of a prediction.
+
+    Responses served this way are marked `degraded` in the output metadata.
+    None of them touch the failing model, so a provider incident costs
+    availability only where no fallback is configured.
+
+    Under a deadline, model calls stop `deadline_reserve` seconds early so
+    there is still time to serve the fallback before the request (or the
+    pipeline step) is cut off.
+    """
+
+    def __init__(
+        self,
+        max_staleness: float | None = None,
+        max_entries: int = 1024,
+        fallback_model_id: str | None = None,
+        fallback_fn: Callable[[dict[str, Any]], Any] | None = None,
+        deadline_reserve: float = 0.05,
+    ):
+        self.max_staleness = max_staleness
+        self.deadline_reserve = deadline_reserve
+        self.max_entries = max_entries
+        self.fallback_model_id = fallback_model_id
+        self.fallback_fn = fallback_fn
+        # input key -> (stored at, prediction), least recently used first
+        self._responses: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "stale": 0,
+            "fallback_model": 0,
+            "fallback_function": 0,
+            "unavailable": 0,
+        }
+
+    def model_deadline(self) -> AbstractContextManager[Any]:
+        """A deadline for model calls that keeps `deadline_reserve` for the fallback."""
+        remaining = remaining_time()
+        if remaining is None:
+            return nullcontext()
+        return deadline_scope(remaining - self.deadline_reserve)
+
+    def handles(self, error: Exception) -> bool:
+        return isinstance(error, tuple(FALLBACK_REASONS))
+
+    def remember(self, model_id: str, input_dict: dict[str, Any], result: Any) -> None:
+        """Keep a successful response to serve if the model later fails."""
+        if not self.max_staleness:
+            return
+        key = input_key(model_id, input_dict)
+        with self._lock:
+            self._responses[key] = (time.monotonic(), result)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+
+    def _stale(self, model_id: str, input_dict: dict[str, Any]) -> tuple[Any, float]:
+        """A remembered response and its age, or (None, 0) if none is fresh enough."""
+        if not self.max_staleness:
+            return None, 0.0
+        with self._lock:
+            entry = self._responses.get(input_key(model_id, input_dict))
+        if entry is None:
+            return None, 0.0
+        age = time.monotonic() - entry[0]
+        return (entry[1], age) if age <= self.max_staleness else (None, 0.0)
+
+    def _record(self, source: str, model_id: str, reason: str) -> None:
+        with self._lock:
+            self.stats[source] += 1
+        if FALLBACK_EVENTS_TOTAL:
+            FALLBACK_EVENTS_TOTAL.add(
+                1, {"model_id": model_id, "source": source, "reason": reason}
+            )
+
+    async def serve(
+        self,
+        error: Exception,
+        model_id: str,
+        input_dict: dict[str, Any],
+        call_fallback_model: ModelCall,
+    ) -> tuple[Any, str | None, dict[str, Any]]:
+        """
+        Serve a fallback for a call to `model_id` that failed with `error`.
+        Returns the prediction, the model that produced it (None if no model
+        was called) and the `degraded` metadata. Re-raises `error` if no
+        fallback is available.
+        """
+        reason = next(
+            name for cls, name in FALLBACK_REASONS.items() if isinstance(error, cls)
+        )
+        degraded: dict[str, Any] = {"reason": reason}
+
+        result, age = self._stale(model_id, input_dict)
+        if result is not None:
+            self._record("stale", model_id, reason)
+            return result, None, {**degraded, "source": "stale", "age_s": age}
+
+        remaining = remaining_time()
+        if self.fallback_model_id and (remaining is None or remaining > 0):
+            try:
+                result, served_by = await call_fallback_model()
+            except Exception as e:
+                logging.warning(
+                    f"Fallback model {self.fallback_model_id} for {model_id} "
+                    f"also failed: {type(e).__name__}: {e}"
+                )
+            else:
+                self._record("fallback_model", model_id, reason)
+                return result, served_by, {**degraded, "source": "fallback_model"}
+
+        if self.fallback_fn is not None:
+            result = self.fallback_fn(input_dict)
+            if inspect.isawaitable(result):
+                result = await result
+            self._record("fallback_function", model_id, reason)
+            return result, None, {**degraded, "source": "fallback_function"}
+
+        self._record("unavailable", model_id, reason)
+        raise error
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "cached_responses": len(self._responses)}
@@ -0,0 +1,208 @@
+import functools
+import random
+import threading
+import time
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any
+
+import anyio
+
+from llm_server.core import logging
+from llm_server.core.cancellation import run_sync_abandonable
+from llm_server.core.rate_limit import (
+    RateLimitExceededError,
+    estimate_tokens,
+    response_headers,
+)
+from llm_server.core.retry import is_retryable, retry_after, status_code
+from llm_server.core.runtime import RATE_LIMITED_COOLDOWN, ModelRuntime
+from llm_server.core.scheduling import FairScheduler
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import HEALTH_PROBES_TOTAL
+except ImportError:
+    HEALTH_PROBES_TOTAL = None
+# --- End OTel Integration ---
+
+
+def _tokens_used(lm: Any) -> int | None:
+    """Tokens of the LM's last call, as reported in its history."""
+    history = getattr(lm, "history", None)
+    if not isinstance(history, list) or not history:
+        return None
+    usage = history[-1].get("usage") or {}
+    total = usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+    return total or None
+
+
+class HealthProber:
+    """
+    Sends cheap synthetic probes (a tiny prompt, `max_tokens` output, no
+    cache) to each model in the background, so its circuit breaker and
+    routing state track the provider's health between user requests.
+
+    A healthy probe closes an open circuit before a user request has to be
+    its trial; `failures_to_open` probes in a row failing on the provider's
+    side open it before a user request pays for the timeout. A 429 only
+    cools the model down for routing. Each model is probed every `interval`
+    seconds, +/- `jitter` of it, starting at a random offset so probes do
+    not arrive in bursts.
+
+    Probes spend the model's rate-limit quota like any call and, with a
+    `scheduler`, queue in its batch class behind user requests.
+    """
+
+    def __init__(
+        self,
+        model_manager: Any,
+        interval: float = 30.0,
+        jitter: float = 0.2,
+        timeout: float = 10.0,
+        prompt: str = "Reply with OK.",
+        max_tokens: int = 1,
+        failures_to_open: int = 2,
+        model_ids: list[str] | None = None,
+        scheduler: FairScheduler | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.model_manager = model_manager
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.failures_to_open = failures_to_open
+        self.model_ids = model_ids
+        self.scheduler = scheduler
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def _model_stats(self, model_id: str) -> dict[str, Any]:
+        """The model's probe stats; call with `_lock` held."""
+        return self._stats.setdefault(
+            model_id,
+            {
+                "probes": 0,
+                "skipped": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "last_latency_s": None,
+                "last_error": None,
+            },
+        )
+
+    def _scheduled(self) -> AbstractAsyncContextManager[None]:
+        if self.scheduler is None:
+            return nullcontext()
+        # Probes yield to every user request
+        return self.scheduler.slot(tenant="health", priority="batch")
+
+    async def probe(self, model_id: str) -> bool:
+        """
+        Probe one model now and update its breaker; returns whether it
+        answered. Probes are paced by the model's rate limits like user
+        calls, and skipped when those have no room for one.
+        """
+        runtime = self.model_manager.get_runtime(model_id)
+        lm = self.model_manager.get_model(model_id)
+        if runtime.limiters:
+            # Its own copy, so the settle reads this probe's response
+            lm = lm.copy()
+        reserved = estimate_tokens({"prompt": self.prompt}, self.max_tokens)
+        async with self._scheduled():
+            try:
+                await runtime.reserve(reserved)
+            except RateLimitExceededError:
+                with self._lock:
+                    self._model_stats(model_id)["skipped"] += 1
+                return False
+            with self._lock:
+                self._model_stats(model_id)["probes"] += 1
+            start = time.perf_counter()
+            answered = False
+            try:
+                with anyio.fail_after(self.timeout):
+                    await run_sync_abandonable(
+                        functools.partial(
+                            lm,
+                            self.prompt,
+                            max_tokens=self.max_tokens,
+                            cache=False,
+                            timeout=self.timeout,
+                        ),
+                        model_id,
+                    )
+                answered = True
+            except Exception as e:
+                self._failed(model_id, runtime, e)
+                return False
+            finally:
+                if runtime.limiters:
+                    runtime.settle(
+                        reserved,
+                        _tokens_used(lm) if answered else 0,
+                        response_headers(lm),
+                    )
+
+        with self._lock:
+            stats = self._model_stats(model_id)
+            stats["consecutive_failures"] = 0
+            stats["last_latency_s"] = time.perf_counter() - start
+        self._record(model_id, "success")
+        runtime.breaker.record_probe(True)
+        return True
+
+    def _failed(self, model_id: str, runtime: ModelRuntime, error: Exception) -> None:
+        """
+        Only errors that speak to the provider's health (5xx, timeouts,
+        dropped connections) count towards opening the circuit. A 429 cools
+        the model down; other rejections of the probe itself, such as a 400
+        for its parameters or a 401 for a bad key, are reported but leave
+        the breaker alone.
+        """
+        retryable = is_retryable(error)
+        with self._lock:
+            stats = self._model_stats(model_id)
+            stats["failures"] += 1
+            stats["last_error"] = f"{type(error).__name__}: {error}"
+            if retryable:
+                stats["consecutive_failures"] += 1
+            last_error = stats["last_error"]
+            consecutive_failures = stats["consecutive_failures"]
+        self._record(model_id, "failure")
+        logging.warning(f"Health probe of {model_id} failed: {last_error}")
+        if status_code(error) == 429:
+            runtime.cool_down(retry_after(error) or RATE_LIMITED_COOLDOWN)
+        elif retryable and consecutive_failures >= self.failures_to_open:
+            runtime.breaker.record_probe(False, error)
+
+    def _record(self, model_id: str, result: str) -> None:
+        if HEALTH_PROBES_TOTAL:
+            HEALTH_PROBES_TOTAL.add(1, {"model_id": model_id, "result": result})
+
+    def _next_delay(self) -> float:
+        return self.interval * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _probe_loop(self, model_id: str) -> None:
+        await anyio.sleep(self._rng.uniform(0, self.interval))
+        while True:
+            await self.probe(model_id)
+            await anyio.sleep(self._next_delay())
+
+    async def run(self) -> None:
+        """Probe every model on its own jittered schedule until cancelled."""
+        model_ids = self.model_ids
+        if model_ids is None:
+            model_ids = list(self.model_manager.models)
+        logging.info(
+            f"Health probing {len(model_ids)} models every ~{self.interval:.0f}s"
+        )
+        async with anyio.create_task_group() as tg:
+            for model_id in model_ids:
+                tg.start_soon(self._probe_loop, model_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {model_id: dict(stats) for model_id, stats in self._stats.items()}
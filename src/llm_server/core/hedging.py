@@ -0,0 +1,149 @@
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import anyio
+
+from llm_server.core import logging
+from llm_server.core.latency import LatencyTracker
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import HEDGE_EVENTS_TOTAL
+except ImportError:
+    HEDGE_EVENTS_TOTAL = None
+# --- End OTel Integration ---
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Hedged requests for tail latency: if a call has not returned after the
+    model's `percentile` latency (learned online), send a duplicate to the
+    same model or to `alternate_model_id`, use whichever succeeds first and
+    cancel the other.
+
+    Hedges draw on a budget: each request earns `max_extra_ratio` of a token
+    (up to `burst` tokens) and each hedge spends one, so hedges stay below
+    that fraction of traffic even when the model is slow across the board.
+    Share one policy between processors to share its budget.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        alternate_model_id: str | None = None,
+        max_extra_ratio: float = 0.1,
+        burst: float = 10.0,
+        min_delay: float = 0.05,
+    ):
+        self.percentile = percentile
+        self.alternate_model_id = alternate_model_id
+        self.max_extra_ratio = max_extra_ratio
+        self.burst = burst
+        self.min_delay = min_delay
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "hedges_sent": 0,
+            "hedge_wins": 0,
+            "budget_exhausted": 0,
+        }
+
+    def hedge_delay(self, latency: LatencyTracker) -> float | None:
+        """How long to wait before hedging, or None until latency is known."""
+        observed = latency.percentile(self.percentile)
+        if observed is None:
+            return None
+        return max(observed, self.min_delay)
+
+    def _record(self, event: str, model_id: str) -> None:
+        if HEDGE_EVENTS_TOTAL:
+            HEDGE_EVENTS_TOTAL.add(1, {"event": event, "model_id": model_id})
+
+    def _try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.stats["hedges_sent"] += 1
+                return True
+            self.stats["budget_exhausted"] += 1
+            return False
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+        delay: float | None,
+        model_id: str,
+    ) -> T:
+        """
+        Run `primary`, racing it against `hedge` started after `delay`
+        seconds. Without a delay (latency not learned yet) only the primary
+        runs. If the primary fails before the hedge is sent, its error is
+        raised; once both are running, the first success wins and the call
+        fails only if both fail.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            self._tokens = min(self.burst, self._tokens + self.max_extra_ratio)
+        if delay is None:
+            return await primary()
+
+        results: list[tuple[T, bool]] = []
+        errors: list[Exception] = []
+        hedge_sent = False
+
+        async with anyio.create_task_group() as tg:
+
+            async def attempt(call: Callable[[], Awaitable[T]], is_hedge: bool) -> None:
+                try:
+                    result = await call()
+                except Exception as e:
+                    errors.append(e)
+                    if not is_hedge and not hedge_sent:
+                        # Nothing else in flight; don't wait to send the hedge
+                        tg.cancel_scope.cancel()
+                    return
+                if not results:
+                    results.append((result, is_hedge))
+                    # The loser is cancelled: aborted or abandoned, see ModelProcessor
+                    tg.cancel_scope.cancel()
+
+            async def send_hedge() -> None:
+                nonlocal hedge_sent
+                await anyio.sleep(delay)
+                if not self._try_spend():
+                    self._record("budget_exhausted", model_id)
+                    return
+                hedge_sent = True
+                self._record("sent", model_id)
+                logging.info(
+                    f"Hedging call to {model_id} after {delay:.3f}s "
+                    f"to {self.alternate_model_id or model_id}"
+                )
+                await attempt(hedge, is_hedge=True)
+
+            tg.start_soon(attempt, primary, False)
+            tg.start_soon(send_hedge)
+
+        if not results:
+            raise errors[0]
+        result, hedge_won = results[0]
+        if hedge_won:
+            with self._lock:
+                self.stats["hedge_wins"] += 1
+            self._record("won", model_id)
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self.stats)
+        requests = stats["requests"] or 1
+        stats["hedge_rate"] = stats["hedges_sent"] / requests
+        stats["hedge_win_rate"] = (
+            stats["hedge_wins"] / stats["hedges_sent"] if stats["hedges_sent"] else 0.0
+        )
+        return stats
@@ -0,0 +1,119 @@
+import importlib.util
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from llm_server.core import logging
+from llm_server.core.opentelemetry_integration import observe_gauge
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool settings for the HTTP clients that reach providers."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    # Idle connections are kept this long, so traffic after a lull reuses
+    # them instead of paying for a new DNS lookup and TLS handshake
+    keepalive_expiry: float = 120.0
+    http2: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientPool:
+    """
+    One sync and one async httpx client, with tuned limits and keep-alive,
+    shared by every model call instead of each provider client building
+    its own. Connections are pooled per origin, so models of the same
+    provider reuse each other's warm connections.
+
+    `install` hands the clients to LiteLLM, whose provider clients are
+    process-wide; ProviderManager then routes models through LiteLLM. Pool
+    utilization is exported as `llm_server.http_pool.connections`.
+    """
+
+    def __init__(self, name: str = "default", config: HTTPPoolConfig | None = None):
+        self.name = name
+        self.config = config or HTTPPoolConfig()
+        self.http2 = self.config.http2 and http2_available()
+        if self.config.http2 and not self.http2:
+            logging.warning("HTTP/2 requested but the h2 package is missing")
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            self.config.read_timeout, connect=self.config.connect_timeout
+        )
+        self._transport = httpx.HTTPTransport(limits=limits, http2=self.http2)
+        self._async_transport = httpx.AsyncHTTPTransport(
+            limits=limits, http2=self.http2
+        )
+        self.client = httpx.Client(transport=self._transport, timeout=timeout)
+        self.async_client = httpx.AsyncClient(
+            transport=self._async_transport, timeout=timeout
+        )
+        observe_gauge(
+            "llm_server.http_pool.connections",
+            "Provider HTTP connections, partitioned by client and state (active, idle).",
+            self._observe,
+        )
+
+    def install(self, target: Any = None) -> None:
+        """Make LiteLLM (or `target`) send every provider call through this pool."""
+        if target is None:
+            import litellm as target
+        target.client_session = self.client
+        target.aclient_session = self.async_client
+        logging.info(
+            f"Provider HTTP pool '{self.name}' installed: "
+            f"{self.config.max_connections} connections, "
+            f"keep-alive {self.config.keepalive_expiry:.0f}s, "
+            f"HTTP/{'2' if self.http2 else '1.1'}"
+        )
+
+    @staticmethod
+    def _count(transport: Any) -> dict[str, int]:
+        # httpx does not expose its connection pool; read httpcore's if present
+        pool = getattr(transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"active": len(connections) - idle, "idle": idle}
+
+    def _observe(self) -> list[tuple[float, dict[str, Any]]]:
+        return [
+            (count, {"pool": self.name, "client": client, "state": state})
+            for client, transport in (
+                ("sync", self._transport),
+                ("async", self._async_transport),
+            )
+            for state, count in self._count(transport).items()
+        ]
+
+    def get_stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "max_connections": self.config.max_connections,
+            "http2": self.http2,
+        }
+        for client, transport in (
+            ("sync", self._transport),
+            ("async", self._async_transport),
+        ):
+            counts = self._count(transport)
+            stats[client] = {
+                **counts,
+                "utilization": counts["active"] / self.config.max_connections,
+            }
+        return stats
+
+    async def aclose(self) -> None:
+        self.client.close()
+        await self.async_client.aclose()
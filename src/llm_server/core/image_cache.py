@@ -0,0 +1,247 @@
+"""
+Content-addressed cache for processed images.
+
+Entries are keyed by a hash of the raw image bytes plus the processing
+parameters, and hold the final encoded output so a repeated image skips
+decoding, orientation and resizing entirely.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from llm_server.core import logging
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import (
+        IMAGE_CACHE_BYTES,
+        IMAGE_CACHE_BYTES_SAVED_TOTAL,
+        IMAGE_CACHE_LOOKUPS_TOTAL,
+    )
+except ImportError:
+    IMAGE_CACHE_BYTES = None
+    IMAGE_CACHE_BYTES_SAVED_TOTAL = None
+    IMAGE_CACHE_LOOKUPS_TOTAL = None
+# --- End OTel Integration ---
+
+
+@dataclass
+class ProcessedImage:
+    """The encoded output of image processing plus the metadata describing it."""
+
+    data: bytes
+    mime_type: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+
+class ProcessedImageCache:
+    """
+    Byte-size-aware LRU cache of processed images with an optional disk tier.
+
+    The memory tier evicts least recently used entries once `max_bytes` is
+    exceeded. When `disk_dir` is set, evicted entries spill to disk (bounded
+    by `max_disk_bytes`) and are promoted back to memory on the next hit.
+    The `llm_server.image_cache.bytes` gauge reports each tier's size.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: str | Path | None = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._memory: OrderedDict[str, ProcessedImage] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(content_hash: str, *params: Any) -> str:
+        """Build a cache key from the content hash and processing parameters."""
+        return ":".join([content_hash, *(repr(p) for p in params)])
+
+    def get(self, key: str) -> ProcessedImage | None:
+        """Return the cached entry for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._record_hit(entry, tier="memory")
+                return entry
+            on_disk = key in self._disk
+
+        if on_disk:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    self._record_hit(entry, tier="disk")
+                self.put(key, entry)
+                return entry
+
+        with self._lock:
+            self.stats["misses"] += 1
+        if IMAGE_CACHE_LOOKUPS_TOTAL:
+            IMAGE_CACHE_LOOKUPS_TOTAL.add(1, {"result": "miss"})
+        return None
+
+    def put(self, key: str, entry: ProcessedImage) -> None:
+        """Insert an entry, evicting (and optionally spilling) LRU entries."""
+        if entry.size_bytes > self.max_bytes:
+            return
+
+        spilled: list[tuple[str, ProcessedImage]] = []
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            delta = entry.size_bytes - (previous.size_bytes if previous else 0)
+            self._memory[key] = entry
+            self._memory_bytes += entry.size_bytes
+            if previous:
+                self._memory_bytes -= previous.size_bytes
+
+            while self._memory_bytes > self.max_bytes:
+                old_key, old_entry = self._memory.popitem(last=False)
+                self._memory_bytes -= old_entry.size_bytes
+                delta -= old_entry.size_bytes
+                self.stats["evictions"] += 1
+                if self.disk_dir and old_key not in self._disk:
+                    spilled.append((old_key, old_entry))
+
+        if IMAGE_CACHE_BYTES and delta:
+            IMAGE_CACHE_BYTES.add(delta, {"tier": "memory"})
+
+        for old_key, old_entry in spilled:
+            self._write_disk(old_key, old_entry)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics, including the hit rate."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_bytes"] = self._disk_bytes
+            stats["disk_entries"] = len(self._disk)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _record_hit(self, entry: ProcessedImage, tier: str) -> None:
+        """Update hit counters. Must be called with the lock held."""
+        self.stats["hits"] += 1
+        self.stats[f"{tier}_hits"] += 1
+        self.stats["bytes_saved"] += entry.size_bytes
+        if IMAGE_CACHE_LOOKUPS_TOTAL:
+            IMAGE_CACHE_LOOKUPS_TOTAL.add(1, {"result": "hit", "tier": tier})
+        if IMAGE_CACHE_BYTES_SAVED_TOTAL:
+            IMAGE_CACHE_BYTES_SAVED_TOTAL.add(entry.size_bytes, {"tier": tier})
+
+    # --- Disk tier ---
+
+    def _disk_paths(self, key: str) -> tuple[Path, Path]:
+        assert self.disk_dir is not None
+        name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return self.disk_dir / f"{name}.img", self.disk_dir / f"{name}.json"
+
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk LRU order from sidecar files, oldest first."""
+        assert self.disk_dir is not None
+        sidecars = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for sidecar in sidecars:
+            try:
+                record = json.loads(sidecar.read_text(encoding="utf-8"))
+                self._disk[record["key"]] = record["size_bytes"]
+                self._disk_bytes += record["size_bytes"]
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Ignoring unreadable image cache entry {sidecar}: {e}")
+        if IMAGE_CACHE_BYTES and self._disk_bytes:
+            IMAGE_CACHE_BYTES.add(self._disk_bytes, {"tier": "disk"})
+
+    def _write_disk(self, key: str, entry: ProcessedImage) -> None:
+        data_path, sidecar_path = self._disk_paths(key)
+        record = {
+            "key": key,
+            "mime_type": entry.mime_type,
+            "metadata": entry.metadata,
+            "size_bytes": entry.size_bytes,
+        }
+        try:
+            # Write to temporary files and rename so readers never see partial data
+            tmp_data = data_path.with_suffix(".img.tmp")
+            tmp_data.write_bytes(entry.data)
+            os.replace(tmp_data, data_path)
+            tmp_sidecar = sidecar_path.with_suffix(".json.tmp")
+            tmp_sidecar.write_text(json.dumps(record, default=list), encoding="utf-8")
+            os.replace(tmp_sidecar, sidecar_path)
+        except OSError as e:
+            logging.warning(f"Failed to spill image cache entry to disk: {e}")
+            return
+
+        expired: list[str] = []
+        with self._lock:
+            delta = entry.size_bytes - self._disk.pop(key, 0)
+            self._disk[key] = entry.size_bytes
+            self._disk_bytes += delta
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                old_key, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                delta -= old_size
+                expired.append(old_key)
+
+        if IMAGE_CACHE_BYTES and delta:
+            IMAGE_CACHE_BYTES.add(delta, {"tier": "disk"})
+
+        for old_key in expired:
+            for path in self._disk_paths(old_key):
+                path.unlink(missing_ok=True)
+
+    def _read_disk(self, key: str) -> ProcessedImage | None:
+        data_path, sidecar_path = self._disk_paths(key)
+        try:
+            record = json.loads(sidecar_path.read_text(encoding="utf-8"))
+            data = data_path.read_bytes()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to read image cache entry from disk: {e}")
+            with self._lock:
+                size = self._disk.pop(key, None)
+                if size is not None:
+                    self._disk_bytes -= size
+            if IMAGE_CACHE_BYTES and size:
+                IMAGE_CACHE_BYTES.add(-size, {"tier": "disk"})
+            return None
+
+        metadata = record.get("metadata", {})
+        # JSON has no tuples; restore the (width, height) pairs
+        for size_key in ("original_size", "processed_size"):
+            if isinstance(metadata.get(size_key), list):
+                metadata[size_key] = tuple(metadata[size_key])
+        return ProcessedImage(
+            data=data, mime_type=record["mime_type"], metadata=metadata
+        )
@@ -2,64 +2,251 @@
 Image processing utilities for the LLM Server framework.
 """
 
+import base64
+import binascii
 import io
+from dataclasses import dataclass
 from typing import Any
 
-from PIL import Image
-from PIL.ExifTags import TAGS
+from PIL import ExifTags, Image
 
 from llm_server.core import logging
 
+# EXIF tag holding the camera orientation (1-8)
+EXIF_ORIENTATION_TAG = 0x0112
 
-def extract_gps_from_image(image_bytes: bytes) -> dict[str, Any] | None:
+# Characters of base64 text decoded per step; must be a multiple of 4
+BASE64_CHUNK_CHARS = 256 * 1024
+
+_BASE64_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """Header-level facts about an image, read without decoding any pixels."""
+
+    width: int
+    height: int
+    format: str | None
+    mime_type: str | None
+    orientation: int = 1
+    gps: dict[str, Any] | None = None
+    frames: int = 1
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+class ImageLimitError(ValueError):
+    """Raised when an image exceeds a configured size, pixel or frame limit."""
+
+    def __init__(self, limit: str, actual: int | None, maximum: int):
+        detail = f"{actual} > {maximum}" if actual is not None else f"limit {maximum}"
+        super().__init__(f"Image rejected: {limit} exceeded ({detail})")
+        self.limit = limit
+        self.actual = actual
+        self.maximum = maximum
+
+
+@dataclass(frozen=True)
+class ImageLimits:
     """
-    Extract GPS coordinates from photo EXIF data if present.
+    Per-processor bounds on the images a worker is willing to decode.
+
+    `max_bytes` is checked before the image is parsed (for base64 text,
+    before it is decoded), `max_frames` from the header, and `max_pixels`
+    against the pixels that will actually be decoded (after any
+    reduced-resolution JPEG decode). None disables a check.
+    """
+
+    max_pixels: int | None = 50_000_000
+    max_bytes: int | None = 50 * 1024 * 1024
+    max_frames: int | None = 1000
+
+    def check_bytes(self, size_bytes: int) -> None:
+        if self.max_bytes is not None and size_bytes > self.max_bytes:
+            raise ImageLimitError("max_bytes", size_bytes, self.max_bytes)
+
+    def check_frames(self, frames: int) -> None:
+        if self.max_frames is not None and frames > self.max_frames:
+            raise ImageLimitError("max_frames", frames, self.max_frames)
+
+    def check_pixels(self, pixels: int) -> None:
+        if self.max_pixels is not None and pixels > self.max_pixels:
+            raise ImageLimitError("max_pixels", pixels, self.max_pixels)
+
+
+def inspect_image(image: Image.Image | bytes) -> ImageInfo:
+    """
+    Parse the container header and EXIF block of an image in a single pass.
+
+    PIL opens images lazily, so this only reads the header and metadata
+    segments; pixel data is not decoded until the image is loaded.
 
     Args:
-        image_bytes: Raw image data
+        image: Raw image data, or an already opened (not yet loaded) PIL image
 
     Returns:
-        Dictionary with latitude, longitude, and source, or None if no GPS data
+        ImageInfo with dimensions, format, EXIF orientation and GPS location
     """
+    if not isinstance(image, Image.Image):
+        image = Image.open(io.BytesIO(image))
+
+    orientation = 1
+    gps = None
     try:
-        image = Image.open(io.BytesIO(image_bytes))
         exif = image.getexif()
-
-        if not exif:
+        if exif:
+            orientation = exif.get(EXIF_ORIENTATION_TAG, 1)
+            gps = _parse_gps_info(exif.get_ifd(ExifTags.IFD.GPSInfo))
+        else:
             logging.debug("No EXIF data found in image")
-            return None
+    except Exception as e:
+        logging.warning(f"Error reading EXIF data: {e}")
 
-        # Look for GPS info
-        gps_info = None
-        for tag, value in exif.items():
-            if TAGS.get(tag) == "GPSInfo":
-                gps_info = value
-                break
+    return ImageInfo(
+        width=image.width,
+        height=image.height,
+        format=image.format,
+        mime_type=image.get_format_mimetype() if image.format else None,
+        orientation=orientation,
+        gps=gps,
+        frames=getattr(image, "n_frames", 1),
+    )
 
-        if not gps_info:
-            logging.debug("No GPS data found in EXIF")
-            return None
 
-        logging.info(f"Found GPS data in EXIF: {gps_info}")
+class BufferReader(io.RawIOBase):
+    """
+    Seekable, read-only file object over an in-memory buffer.
+
+    Unlike `io.BytesIO(...)`, wrapping a `bytearray`, `memoryview` or `mmap`
+    does not copy the buffer; readers only copy the chunks they request.
+    """
 
-        # Parse GPS coordinates
-        lat = _parse_gps_coord(gps_info.get(2), gps_info.get(1))
-        lng = _parse_gps_coord(gps_info.get(4), gps_info.get(3))
+    def __init__(self, buffer: Any):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
 
-        if lat is None or lng is None:
-            logging.warning("Could not parse GPS coordinates from EXIF data")
-            return None
+    def readable(self) -> bool:
+        return True
 
-        location_data = {"latitude": lat, "longitude": lng, "source": "photo_exif"}
+    def seekable(self) -> bool:
+        return True
 
-        logging.info(f"Extracted photo location: {location_data}")
-        return location_data
+    def tell(self) -> int:
+        return self._pos
 
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer: Any) -> int:
+        target = memoryview(buffer).cast("B")
+        chunk = self._view[self._pos : self._pos + len(target)]
+        target[: len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def read(self, size: int | None = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos : end].tobytes()
+        self._pos += len(chunk)
+        return chunk
+
+
+def decode_base64_text(text: str, start: int = 0) -> bytearray:
+    """
+    Decode base64 text in fixed-size chunks, starting at `start`.
+
+    Avoids building padded or sliced copies of the whole input string:
+    only one chunk of text is held in flight, whitespace is dropped per
+    chunk, and missing trailing padding is repaired on the final chunk.
+
+    Raises:
+        ValueError: If the text is not valid base64
+    """
+    decoded = bytearray()
+    carry = ""
+    try:
+        for offset in range(start, len(text), BASE64_CHUNK_CHARS):
+            chunk = carry + text[offset : offset + BASE64_CHUNK_CHARS].translate(
+                _BASE64_WHITESPACE
+            )
+            usable = len(chunk) - len(chunk) % 4
+            decoded += base64.b64decode(chunk[:usable])
+            carry = chunk[usable:]
+
+        if carry:
+            logging.debug(
+                f"Applied {4 - len(carry)} base64 padding character(s) to final chunk"
+            )
+            decoded += base64.b64decode(carry + "=" * (4 - len(carry)))
+    except (binascii.Error, TypeError) as e:
+        raise ValueError(f"Content is not a valid base64 string: {e}") from e
+
+    logging.debug(
+        f"Decoded {len(text) - start} base64 characters to {len(decoded)} bytes"
+    )
+    return decoded
+
+
+def extract_gps_from_image(image_bytes: bytes) -> dict[str, Any] | None:
+    """
+    Extract GPS coordinates from photo EXIF data if present.
+
+    Callers that already hold an `ImageContent` should use its cached
+    `info.gps` instead, which avoids parsing the image a second time.
+
+    Args:
+        image_bytes: Raw image data
+
+    Returns:
+        Dictionary with latitude, longitude, and source, or None if no GPS data
+    """
+    try:
+        return inspect_image(image_bytes).gps
     except Exception as e:
         logging.warning(f"Error extracting GPS from EXIF: {e}")
         return None
 
 
+def _parse_gps_info(gps_info: dict[int, Any]) -> dict[str, Any] | None:
+    """Convert a raw EXIF GPSInfo IFD into a location dictionary."""
+    if not gps_info:
+        logging.debug("No GPS data found in EXIF")
+        return None
+
+    logging.info(f"Found GPS data in EXIF: {gps_info}")
+
+    # Parse GPS coordinates
+    lat = _parse_gps_coord(gps_info.get(2), gps_info.get(1))
+    lng = _parse_gps_coord(gps_info.get(4), gps_info.get(3))
+
+    if lat is None or lng is None:
+        logging.warning("Could not parse GPS coordinates from EXIF data")
+        return None
+
+    location_data = {"latitude": lat, "longitude": lng, "source": "photo_exif"}
+
+    logging.info(f"Extracted photo location: {location_data}")
+    return location_data
+
+
 def _parse_gps_coord(coord_tuple, ref) -> float | None:
     """Parse GPS coordinate from EXIF format to decimal degrees."""
     try:
@@ -1,29 +1,99 @@
 import base64
-import binascii
+import collections.abc
+import copy
+import dataclasses
 import functools
+import hashlib
 import io
-from typing import Any
+import mmap
+from collections.abc import AsyncIterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    aclosing,
+    nullcontext,
+)
+from typing import Any, BinaryIO, get_origin
 
 import anyio
 import dspy
+from dspy.streaming import StreamListener, StreamResponse
 from PIL import Image
 
 from llm_server.core import logging
-from llm_server.core.circuit_breaker import CircuitBreaker
+from llm_server.core.cancellation import record_cancelled, run_sync_abandonable
+from llm_server.core.deadline import check_budget, enforce_budget, remaining_time
+from llm_server.core.fallback import FallbackPolicy
+from llm_server.core.hedging import HedgePolicy
+from llm_server.core.image_cache import ProcessedImage, ProcessedImageCache
+from llm_server.core.image_utils import (
+    BufferReader,
+    ImageInfo,
+    ImageLimitError,
+    ImageLimits,
+    decode_base64_text,
+    inspect_image,
+)
 from llm_server.core.protocols import (
+    ModelRegistry,
     OutputProcessor,
     PipelineStep,
     ProgramMetadata,
+    StreamingOutputProcessor,
+)
+from llm_server.core.rate_limit import estimate_tokens, response_headers
+from llm_server.core.retry import RetryPolicy
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.scheduling import FairScheduler
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEvent,
+    PipelineEventType,
+    Usage,
 )
-from llm_server.core.types import MediaType, PipelineData, Usage
+from llm_server.core.utils import run_concurrently
+
+# Inputs accepted by ImageContent. File-like objects include FastAPI's
+# UploadFile (via its `.file` attribute) and SpooledTemporaryFile.
+ImageSource = str | bytes | bytearray | memoryview | mmap.mmap | BinaryIO
+
+
+class _UsageTrackingPredict(dspy.Predict):
+    """
+    A Predict whose predictions carry their own token usage, also where the
+    caller cannot hold a `dspy.context` around the call (e.g. streamify).
+    """
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        with dspy.context(track_usage=True):
+            return super().__call__(*args, **kwargs)
 
 
 class ModelProcessor(PipelineStep):
-    """Standard processor for model-based operations with metadata tracking"""
+    """
+    Standard processor for model-based operations with metadata tracking.
+
+    `data.content` may be a list (e.g. the pages of a document). If the
+    signature's input field is list-typed, such as `list[dspy.Image]`, the
+    whole list goes into a single model call; otherwise each item gets its
+    own call, at most `max_concurrency` at a time, and the output is a list.
+
+    `process_stream` streams the signature's output fields (or only
+    `stream_fields`, if given) as the provider generates them.
+
+    Each call honors the request deadline (`_call_config`), may be routed
+    within a group of models (`_select_model`) and is paced by the model's
+    rate and concurrency limits (`_reserve`). `async_calls=True` uses DSPy's
+    async API so cancellation aborts the provider request (`_run_predictor`).
+
+    Optional policies: `retry` (`_call`), `hedging` (`_predict`),
+    `scheduler` (`_scheduled`) and `fallback` (`_fall_back`).
+    """
 
     def __init__(
         self,
-        model_manager: Any,
+        model_manager: ModelRegistry,
         model_id: str,
         signature_class: type[dspy.Signature],
         input_key: str,
@@ -31,6 +101,13 @@ class ModelProcessor(PipelineStep):
         accepted_types: list[MediaType],
         output_type: MediaType,
         program_metadata: ProgramMetadata | None = None,
+        max_concurrency: int = 4,
+        stream_fields: list[str] | None = None,
+        async_calls: bool = False,
+        hedging: HedgePolicy | None = None,
+        retry: RetryPolicy | None = None,
+        scheduler: FairScheduler | None = None,
+        fallback: FallbackPolicy | None = None,
     ):
         self.model_manager = model_manager
         self.model_id = model_id
@@ -40,16 +117,45 @@ class ModelProcessor(PipelineStep):
         self._accepted_types = accepted_types
         self.output_type = output_type
         self.program_metadata = program_metadata
+        self.max_concurrency = max_concurrency
+        self.stream_fields = stream_fields
+        self.async_calls = async_calls
+        self.hedging = hedging
+        self.retry = retry
+        self.scheduler = scheduler
+        self.fallback = fallback
 
-    def _extract_usage_from_history(self, lm: Any, model_id: str) -> Usage:
+    @property
+    def expected_latency(self) -> float | None:
+        """Typical duration of one model call, once enough calls have completed."""
+        return self._runtime(self._select_model()).latency.expected()
+
+    def _select_model(
+        self, exclude: tuple[str, ...] = (), model_id: str | None = None
+    ) -> str:
         """
-        Extracts token usage from a model's history, handling provider differences.
-        This is the core provider-agnostic logic.
+        The model for the next call. When `model_id` names a group of
+        equivalent models (see `ModelManager.select_model`), the member that
+        currently looks fastest and healthiest.
         """
-        if not lm or not hasattr(lm, "history") or not lm.history:
-            return Usage()
+        return self.model_manager.select_model(
+            model_id or self.model_id, exclude=exclude
+        )
 
-        last_call_usage = lm.history[-1].get("usage", {})
+    def _scheduled(self) -> AbstractAsyncContextManager[None]:
+        """A slot by the priority class and tenant of the current request."""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot()
+
+    def _runtime(self, model_id: str) -> ModelRuntime:
+        """The model's shared breaker, latency and limits."""
+        return self.model_manager.get_runtime(model_id)
+
+    def _usage_from_entry(
+        self, last_call_usage: dict[str, Any], model_id: str
+    ) -> Usage:
+        """Normalizes one call's usage dict, handling provider differences."""
 
         # Provider-agnostic extraction based on model ID prefix
         if "gpt-" in model_id or "o1-" in model_id:  # OpenAI
@@ -73,54 +179,453 @@ class ModelProcessor(PipelineStep):
 
         return Usage()
 
-    @CircuitBreaker()
-    async def _protected_predict(self, input_dict: dict[str, Any]) -> Any:
+    def _prediction_usage(self, prediction: Any, model_id: str) -> Usage:
         """
-        Internal method that runs the DSPy predictor. This is the operation
-        that is protected by the circuit breaker.
+        Token usage DSPy tracked for this prediction's own calls. The LM's
+        history is shared by concurrent requests, so usage is never read
+        from it.
         """
-        lm = self.model_manager.get_model(self.model_id)
+        get_lm_usage = getattr(prediction, "get_lm_usage", None)
+        tracked = get_lm_usage() if callable(get_lm_usage) else None
+        total = Usage()
+        if not isinstance(tracked, dict):
+            return total
+        for usage in tracked.values():
+            if isinstance(usage, dict):
+                entry = self._usage_from_entry(usage, model_id)
+                total.prompt_tokens += entry.prompt_tokens
+                total.completion_tokens += entry.completion_tokens
+        return total
+
+    def _get_lm(self, model_id: str | None = None) -> Any:
+        model_id = model_id or self.model_id
+        lm = self.model_manager.get_model(model_id)
         if not lm:
-            raise ValueError(f"Model {self.model_id} not found")
+            raise ValueError(f"Model {model_id} not found")
+        return lm
+
+    def _call_config(self, lm: Any) -> dict[str, Any]:
+        """
+        Per-call LM settings: under a request deadline (see `core.deadline`)
+        the remaining time becomes the provider timeout, capped at the
+        model's configured `timeout`.
+        """
+        remaining = remaining_time()
+        if remaining is None:
+            return {}
+        configured = getattr(lm, "kwargs", {}).get("timeout")
+        if isinstance(configured, (int, float)):
+            remaining = min(remaining, configured)
+        return {"config": {"timeout": max(remaining, 0.001)}}
+
+    async def _predict(
+        self, input_dict: dict[str, Any], model_id: str | None = None
+    ) -> tuple[Any, str]:
+        """
+        Run one call to `model_id` (default: the processor's model). With a
+        `hedging` policy, a call still running after the model's usual tail
+        latency is duplicated and the first result wins (see HedgePolicy).
+        Returns the prediction and the model that produced it.
+        """
+        target = model_id or self.model_id
+        model_id = self._select_model(model_id=target)
+        if self.hedging is None:
+            return await self._call(model_id, input_dict, target)
+        hedge_target = self.hedging.alternate_model_id or target
+        hedge_model_id = self._select_model(exclude=(model_id,), model_id=hedge_target)
+        return await self.hedging.run(
+            functools.partial(self._call, model_id, input_dict, target),
+            functools.partial(self._call, hedge_model_id, input_dict, hedge_target),
+            self.hedging.hedge_delay(self._runtime(model_id).latency),
+            model_id,
+        )
+
+    async def _predict_or_fall_back(
+        self, input_dict: dict[str, Any], model_id: str | None = None
+    ) -> tuple[Any, str | None, dict[str, Any] | None]:
+        """
+        `_predict` against `model_id` (default: the processor's model),
+        falling back if a policy is set. Calls are not started when the
+        deadline cannot cover the model's typical latency, which is learned
+        from completed calls. Returns the prediction, the model that
+        produced it (None if none was called) and the `degraded` metadata,
+        if any.
+        """
+        target = model_id or self.model_id
+        try:
+            # Inside the fallback's reach: a deadline that cannot cover the
+            # call is answered by the fallback like one the call overruns
+            with self._model_deadline():
+                # Fail fast, outside the breaker: a short deadline is not a model fault
+                latency = self._runtime(self._select_model(model_id=target)).latency
+                check_budget(f"model {target}", latency.expected())
+                result, model_id = await self._predict(input_dict, target)
+        except Exception as e:
+            if self.fallback is None or not self.fallback.handles(e):
+                raise
+            return await self._fall_back(e, input_dict, target)
+        if self.fallback is not None:
+            self.fallback.remember(target, input_dict, result)
+        return result, model_id, None
+
+    async def _fall_back(
+        self, error: Exception, input_dict: dict[str, Any], model_id: str | None = None
+    ) -> tuple[Any, str | None, dict[str, Any]]:
+        """
+        Answer a call rejected by an OPEN circuit or cut off by the deadline
+        from a recent response, a fallback model or a local function; the
+        output metadata then says `degraded`.
+        """
+        assert self.fallback is not None
+        target = model_id or self.model_id
+        logging.warning(
+            f"Model {target} unavailable ({type(error).__name__}), serving a fallback"
+        )
+        fallback_model_id = self.fallback.fallback_model_id
+
+        async def call_fallback_model() -> tuple[Any, str]:
+            with self._model_deadline():
+                return await self._predict(input_dict, fallback_model_id)
+
+        return await self.fallback.serve(error, target, input_dict, call_fallback_model)
+
+    def _model_deadline(self) -> AbstractContextManager[Any]:
+        """The deadline for model calls, minus the time the fallback may need."""
+        if self.fallback is None:
+            return nullcontext()
+        return self.fallback.model_deadline()
+
+    async def _call(
+        self, model_id: str, input_dict: dict[str, Any], target: str
+    ) -> tuple[Any, str]:
+        """
+        One protected call. With a `retry` policy, transient provider errors
+        (429, 5xx, timeouts) are retried with jittered backoff under a shared
+        retry budget; when `target` is a group or key pool, retries move to
+        another member.
+        """
+        if self.retry is None:
+            return await self._protected_predict(model_id, input_dict)
+        tried: list[str] = []
+
+        async def attempt() -> tuple[Any, str]:
+            chosen = model_id
+            if tried:
+                chosen = self._select_model(exclude=tuple(tried), model_id=target)
+            tried.append(chosen)
+            return await self._protected_predict(chosen, input_dict)
+
+        # A routed target has other members to move to
+        return await self.retry.run(attempt, model_id, rotating=target != model_id)
+
+    async def _protected_predict(
+        self, model_id: str, input_dict: dict[str, Any]
+    ) -> tuple[Any, str]:
+        """
+        Internal method that runs the DSPy predictor against `model_id`. This
+        is the operation that is protected by the model's circuit breaker.
+        Models with a `concurrency` config wait for a slot under their
+        adaptive concurrency limit first.
+        """
+        runtime = self._runtime(model_id)
+        lm = self._call_lm(runtime, model_id)
+        result = None
+        # The deadline is enforced outside the breaker and tracking: a call
+        # it cuts off is cancelled in there, which is no fault of the model
+        with enforce_budget(remaining_time(), f"model {model_id}"):
+            async with self._scheduled():
+                # Paced before the breaker: waiting for quota is not a model fault
+                reserved = await self._reserve(runtime, lm, input_dict)
+                try:
+                    async with runtime.slot(), runtime.breaker.protect():
+                        with runtime.track():
+                            result = await self._run_predictor(model_id, lm, input_dict)
+                finally:
+                    self._settle(runtime, lm, model_id, reserved, result)
+        return result, model_id
+
+    def _call_lm(self, runtime: ModelRuntime, model_id: str) -> Any:
+        """
+        The LM for one call. A rate-limited call gets its own copy, so the
+        response `_settle` reads back from its history is this call's, not
+        that of a concurrent request on the same model.
+        """
+        lm = self._get_lm(model_id)
+        return lm.copy() if runtime.limiters else lm
 
-        # Configure DSPy for this specific call
-        with dspy.context(lm=lm):
+    async def _reserve(
+        self, runtime: ModelRuntime, lm: Any, input_dict: dict[str, Any]
+    ) -> int:
+        """
+        Wait for (or be rejected by) the rate limits of the model and its
+        provider, reserving an estimate of the call's tokens that `_settle`
+        corrects afterwards. Returns the tokens reserved.
+        """
+        if not runtime.limiters:
+            return 0
+        max_tokens = getattr(lm, "kwargs", {}).get("max_tokens")
+        tokens = estimate_tokens(input_dict, max_tokens)
+        await runtime.reserve(tokens)
+        return tokens
+
+    def _settle(
+        self,
+        runtime: ModelRuntime,
+        lm: Any,
+        model_id: str,
+        reserved: int,
+        prediction: Any,
+    ) -> None:
+        """
+        Correct the reservation once the call is over, from the usage its
+        prediction reports and the headers of its response. A call that
+        failed or was cancelled (no prediction) refunds its tokens.
+        """
+        if not runtime.limiters:
+            return
+        actual: int | None = 0
+        if prediction is not None:
+            usage = self._prediction_usage(prediction, model_id)
+            actual = (usage.prompt_tokens + usage.completion_tokens) or None
+        runtime.settle(reserved, actual, response_headers(lm))
+
+    async def _run_predictor(
+        self, model_id: str, lm: Any, input_dict: dict[str, Any]
+    ) -> Any:
+        """
+        Run the blocking DSPy predictor in a worker thread or, with
+        `async_calls=True`, through DSPy's async API, so cancelling the
+        request (deadline, client disconnect) also aborts the provider
+        request rather than abandoning a thread.
+        """
+        # Configure DSPy for this specific call, tracking usage on the
+        # prediction itself (see `_prediction_usage`)
+        with dspy.context(lm=lm, track_usage=True):
             # Create and run the predictor
             predictor = dspy.Predict(self.signature)
 
-            # Run the blocking call in a separate thread using anyio for compatibility.
-            # We use functools.partial to correctly pass keyword arguments to the threaded function.
-            callable_with_kwargs = functools.partial(predictor, **input_dict)
-            return await anyio.to_thread.run_sync(callable_with_kwargs)  # type: ignore
+            call_kwargs = {**self._call_config(lm), **input_dict}
+            if self.async_calls:
+                # Cancellation aborts the provider request itself
+                try:
+                    result = await predictor.acall(**call_kwargs)
+                except anyio.get_cancelled_exc_class():
+                    record_cancelled("model_call", model_id=model_id)
+                    raise
+            else:
+                # Run the blocking call in a separate thread. If we are
+                # cancelled we stop waiting; the abandoned thread is bounded
+                # by the provider timeout passed above.
+                # We use functools.partial to correctly pass keyword arguments to the threaded function.
+                result = await run_sync_abandonable(
+                    functools.partial(predictor, **call_kwargs), model_id
+                )
+
+        return result
+
+    async def _protected_stream(
+        self, model_id: str, input_dict: dict[str, Any]
+    ) -> AsyncIterator[Any]:
+        """
+        Streaming counterpart of `_protected_predict`. Yields DSPy
+        StreamResponse chunks followed by the final Prediction.
+        """
+        runtime = self._runtime(model_id)
+        lm = self._call_lm(runtime, model_id)
+        field_names = self.stream_fields or list(self.signature.output_fields)
+        stream_predict = dspy.streamify(
+            _UsageTrackingPredict(self.signature),
+            stream_listeners=[
+                StreamListener(signature_field_name=name) for name in field_names
+            ],
+        )
+
+        prediction = None
+        async with self._scheduled():
+            reserved = await self._reserve(runtime, lm, input_dict)
+            try:
+                async with runtime.slot(), runtime.breaker.protect():
+                    with runtime.track():
+                        # The LM is passed per call, as a dspy.context would be
+                        # held across yields
+                        async with aclosing(
+                            stream_predict(lm=lm, **self._call_config(lm), **input_dict)
+                        ) as stream:
+                            async for value in stream:
+                                if isinstance(value, dspy.Prediction):
+                                    prediction = value
+                                yield value
+            finally:
+                self._settle(runtime, lm, model_id, reserved, prediction)
+
+    def _accepts_multiple_inputs(self) -> bool:
+        """Whether the signature's input field is list-typed, e.g. list[dspy.Image]."""
+        field = getattr(self.signature, "input_fields", {}).get(self.input_key)
+        annotation = getattr(field, "annotation", None)
+        return get_origin(annotation) in (list, tuple, collections.abc.Sequence)
 
     async def process(self, data: PipelineData) -> PipelineData:
         """
         This method conforms to the PipelineStep protocol. It is NOT decorated,
         so its signature remains compatible for the type checker.
         """
-        # 1. Prepare the input dictionary for the model
-        input_dict = {self.input_key: data.content}
+        content = data.content
+        fan_out = isinstance(content, (list, tuple)) and (
+            not self._accepts_multiple_inputs()
+        )
+        # 1. Prepare the input(s) and call the *protected* internal method
+        if fan_out:
+            results = await run_concurrently(
+                [
+                    functools.partial(
+                        self._predict_or_fall_back, {self.input_key: item}
+                    )
+                    for item in content
+                ],
+                self.max_concurrency,
+            )
+            raw: Any = [result for result, _, _ in results]
+            served_by = [model_id for _, model_id, _ in results]
+            degraded = [info for _, _, info in results]
+        else:
+            if isinstance(content, tuple):
+                content = list(content)
+            raw, model_id, info = await self._predict_or_fall_back(
+                {self.input_key: content}
+            )
+            served_by = [model_id]
+            degraded = [info]
 
-        # 2. Call the *protected* internal method
-        raw_result = await self._protected_predict(input_dict)
+        return self._build_output(data, raw, served_by, fan_out, degraded)
 
+    def _build_output(
+        self,
+        data: PipelineData,
+        raw: Any,
+        served_by: list[str | None],
+        fan_out: bool,
+        degraded: list[dict[str, Any] | None] | None = None,
+    ) -> PipelineData:
+        """
+        Attach usage and run the output processor over the raw prediction(s).
+        `served_by` lists the model behind each prediction (None for a
+        fallback that called no model), and `degraded` how each was served
+        if it was a fallback.
+        """
         # --- EXTRACT AND ATTACH USAGE ---
-        lm = self.model_manager.get_model(self.model_id)
-        usage = self._extract_usage_from_history(lm, self.model_id)
-        data.metadata["usage"] = usage  # Attach the usage object to metadata
+        usage = Usage()
+        predictions = raw if fan_out else [raw]
+        for prediction, model_id in zip(predictions, served_by, strict=True):
+            if model_id is None:
+                continue  # A stale response or local fallback called no model
+            call_usage = self._prediction_usage(prediction, model_id)
+            usage.prompt_tokens += call_usage.prompt_tokens
+            usage.completion_tokens += call_usage.completion_tokens
+        # New keys go in a layer of their own: `data` may be shared with
+        # other steps (e.g. DAG siblings) and must not change under them
+        annotations: dict[str, Any] = {"usage": usage}
+        if any(model_id != self.model_id for model_id in served_by):
+            # Routed within a group, or answered by a hedge's alternate model
+            annotations["served_by"] = served_by if fan_out else served_by[0]
+        if degraded and any(degraded):
+            annotations["degraded"] = degraded if fan_out else degraded[0]
+        data = data.derive(metadata=annotations)
         logging.info(
             f"Framework extracted token usage: {usage.prompt_tokens} prompt, {usage.completion_tokens} completion"
         )
 
-        # 3. Process the raw output into its final form
-        final_result = self.output_processor.process(raw_result, pipeline_data=data)
+        # 2. Process the raw output into its final form
+        if fan_out:
+            final_result: Any = [
+                self.output_processor.process(result, pipeline_data=data)
+                for result in raw
+            ]
+        else:
+            final_result = self.output_processor.process(raw, pipeline_data=data)
 
-        # 4. Construct and return the final PipelineData object
-        final_metadata = data.metadata.copy()
-        final_metadata["processed"] = True
+        # 3. Construct and return the final PipelineData object
+        return data.derive(
+            content=final_result, media_type=self.output_type, processed=True
+        )
 
-        return PipelineData(
-            media_type=self.output_type, content=final_result, metadata=final_metadata
+    async def process_stream(self, data: PipelineData) -> AsyncIterator[PipelineEvent]:
+        """
+        Streaming variant of `process`: yields a PARTIAL event per chunk of
+        each streamed output field, then a STEP_COMPLETED event with the same
+        output `process` would return. Inputs that fan out into several
+        calls are not streamed.
+
+        If the output processor can parse streams, FIELD_COMPLETED events are
+        also emitted as soon as each field (or list element / object member
+        of a structured field) is complete.
+        """
+        content = data.content
+        if isinstance(content, (list, tuple)) and not self._accepts_multiple_inputs():
+            output = await self.process(data)
+            yield PipelineEvent(type=PipelineEventType.STEP_COMPLETED, data=output)
+            return
+        if isinstance(content, tuple):
+            content = list(content)
+        model_id = self._select_model()
+        check_budget(
+            f"model {self.model_id}", self._runtime(model_id).latency.expected()
+        )
+
+        parser = None
+        if isinstance(self.output_processor, StreamingOutputProcessor):
+            parser = self.output_processor.create_stream_parser(
+                {
+                    name: field.annotation
+                    for name, field in self.signature.output_fields.items()
+                }
+            )
+
+        input_dict = {self.input_key: content}
+        raw_result = None
+        served_by: str | None = model_id
+        degraded = None
+        started = False
+        try:
+            async with aclosing(self._protected_stream(model_id, input_dict)) as stream:
+                async for value in stream:
+                    if isinstance(value, StreamResponse):
+                        started = True
+                        yield PipelineEvent(
+                            type=PipelineEventType.PARTIAL,
+                            field=value.signature_field_name,
+                            delta=value.chunk,
+                        )
+                        if parser is None:
+                            continue
+                        for parsed in parser.feed(
+                            value.signature_field_name,
+                            value.chunk,
+                            value.is_last_chunk,
+                        ):
+                            yield PipelineEvent(
+                                type=PipelineEventType.FIELD_COMPLETED,
+                                field=value.signature_field_name,
+                                path=list(parsed.path),
+                                value=parsed.value,
+                            )
+                    elif isinstance(value, dspy.Prediction):
+                        raw_result = value
+        except Exception as e:
+            # Only a stream that failed before any output can be replaced
+            if started or self.fallback is None or not self.fallback.handles(e):
+                raise
+            raw_result, served_by, degraded = await self._fall_back(e, input_dict)
+        else:
+            if raw_result is not None and self.fallback is not None:
+                self.fallback.remember(self.model_id, input_dict, raw_result)
+
+        if raw_result is None:
+            raise RuntimeError(f"Model {model_id} stream ended without a prediction")
+        yield PipelineEvent(
+            type=PipelineEventType.STEP_COMPLETED,
+            data=self._build_output(
+                data, raw_result, [served_by], fan_out=False, degraded=[degraded]
+            ),
         )
 
     @property
@@ -129,105 +634,192 @@ class ModelProcessor(PipelineStep):
 
 
 class ImageContent:
-    """Wrapper class to handle different image formats and conversions"""
+    """
+    Wrapper class to handle different image formats and conversions.
+
+    Accepts raw buffers (`bytes`, `bytearray`, `memoryview`, `mmap`), base64
+    text or data URIs, and file-like objects such as FastAPI's `UploadFile`
+    or a `SpooledTemporaryFile`. Buffers and seekable files are handed to PIL
+    without being copied; base64 text is decoded in chunks exactly once.
+
+    With `limits`, base64 text and non-seekable streams are checked against
+    `max_bytes` before they are decoded or read into memory.
+    """
 
-    def __init__(self, content: str | bytes):
+    def __init__(self, content: ImageSource, limits: ImageLimits | None = None):
         self._content = content
+        self._limits = limits
+        self._buffer: memoryview | None = None
+        self._file: BinaryIO | None = None
+        self._file_start = 0
         self._bytes: bytes | None = None
+        self._source_image: Image.Image | None = None
+        self._info: ImageInfo | None = None
         self._pil_image: Image.Image | None = None
         self._data_uri: str | None = None
+        self._resolve_source()
+
+    def _resolve_source(self) -> None:
+        """Classify the input as an in-memory buffer or a seekable file."""
+        content = self._content
+        if isinstance(content, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._buffer = memoryview(content).cast("B")
+            return
+
+        if isinstance(content, str):
+            start = 0
+            if content.startswith("data:"):
+                start = content.find(",") + 1
+                if not start:
+                    raise ValueError("Invalid data URI provided: missing ',' separator")
+            if self._limits is not None:
+                # Every 4 base64 characters decode to at most 3 bytes
+                self._limits.check_bytes((len(content) - start) * 3 // 4)
+            self._buffer = memoryview(decode_base64_text(content, start))
+            return
+
+        # UploadFile exposes its underlying (sync) file object as `.file`
+        file = getattr(content, "file", content)
+        if not hasattr(file, "read"):
+            raise TypeError(
+                f"Image content of type {type(content).__name__} could not be converted to bytes."
+            )
+        try:
+            self._file_start = file.tell()
+            file.seek(self._file_start)
+            self._file = file
+        except (AttributeError, OSError, ValueError):
+            # Non-seekable stream: it can only be read once, so keep the bytes
+            max_bytes = self._limits.max_bytes if self._limits else None
+            data = file.read() if max_bytes is None else file.read(max_bytes + 1)
+            self._buffer = memoryview(data).cast("B")
+
+    def open_stream(self) -> BinaryIO:
+        """Get a seekable binary stream positioned at the start of the image."""
+        if self._buffer is not None:
+            return BufferReader(self._buffer)  # type: ignore[return-value]
+        assert self._file is not None
+        self._file.seek(self._file_start)
+        return self._file
 
     @property
-    def bytes(self) -> bytes:
-        """Get image as bytes, converting if necessary and fixing padding errors."""
-        import base64
+    def buffer(self) -> memoryview:
+        """Get image data as a zero-copy view where possible."""
+        if self._buffer is None:
+            self._buffer = memoryview(self.bytes)
+        return self._buffer
 
+    @property
+    def bytes(self) -> bytes:
+        """Get image as bytes. Prefer `buffer` or `open_stream()` to avoid a copy."""
         if self._bytes is None:
             if isinstance(self._content, bytes):
                 self._bytes = self._content
-            elif isinstance(self._content, str):
-                content_str = self._content
-
-                if content_str.startswith("data:"):
-                    try:
-                        _, base64_data = content_str.split(",", 1)
-                        content_str = base64_data
-                    except ValueError as e:
-                        raise ValueError(f"Invalid data URI provided: {e}") from e
-
-                try:
-                    # Log the initial state for diagnostics
-                    initial_len = len(content_str)
-                    logging.info(
-                        f"ImageContent: Attempting to decode base64 string. Initial length: {initial_len}"
-                    )
-                    logging.debug(
-                        f"ImageContent: First 30 chars of string: '{content_str[:30]}...'"
-                    )
-                    logging.debug(
-                        f"ImageContent: Last 30 chars of string: '...{content_str[-30:]}'"
-                    )
-
-                    # Calculate and log required padding
-                    missing_padding = len(content_str) % 4
-                    logging.debug(
-                        f"ImageContent: Calculated missing padding characters: {missing_padding}"
-                    )
-
-                    if missing_padding:
-                        padding_to_add = "=" * (4 - missing_padding)
-                        content_str += padding_to_add
-                        logging.info(
-                            f"ImageContent: Applied '{padding_to_add}' padding. New length: {len(content_str)}"
-                        )
-                    else:
-                        logging.info(
-                            "ImageContent: String length is valid, no padding needed."
-                        )
+            elif self._buffer is not None:
+                self._bytes = self._buffer.tobytes()
+            else:
+                self._bytes = self.open_stream().read()
+        return self._bytes
 
-                    # Attempt the decode operation
-                    self._bytes = base64.b64decode(content_str)
-                    logging.info(
-                        f"ImageContent: Successfully decoded base64 string to {len(self._bytes)} bytes."
-                    )
+    def content_hash(self) -> str:
+        """Get a fast hash of the raw image bytes, computed without copying them."""
+        digest = hashlib.blake2b(digest_size=16)
+        if self._buffer is not None:
+            digest.update(self._buffer)
+        else:
+            stream = self.open_stream()
+            while chunk := stream.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
 
-                except (binascii.Error, TypeError) as e:
-                    logging.error(
-                        f"ImageContent: base64.b64decode FAILED even after padding attempt. Final length was {len(content_str)}.",
-                        exc_info=True,
-                    )
-                    raise ValueError(
-                        f"Content is not a valid base64 string: {e}"
-                    ) from e
+    def _peek(self, size: int) -> bytes:
+        """Read the first `size` bytes without materializing the whole image."""
+        if self._buffer is not None:
+            return self._buffer[:size].tobytes()
+        return self.open_stream().read(size)
 
-        if self._bytes is None:
-            raise TypeError("Image content could not be converted to bytes.")
+    @property
+    def size_bytes(self) -> int:
+        """Get the encoded size of the image without reading it."""
+        if self._buffer is not None:
+            return len(self._buffer)
+        stream = self.open_stream()
+        return stream.seek(0, io.SEEK_END) - self._file_start
+
+    def _open_source(self) -> Image.Image:
+        """Open the image lazily; only the header is parsed until pixels are needed."""
+        if self._source_image is None:
+            try:
+                self._source_image = Image.open(self.open_stream())
+            except Image.DecompressionBombError as e:
+                raise ImageLimitError(
+                    "max_pixels", None, 2 * (Image.MAX_IMAGE_PIXELS or 0)
+                ) from e
+        return self._source_image
 
-        return self._bytes
+    @property
+    def info(self) -> ImageInfo:
+        """Get header and EXIF facts (size, format, orientation, GPS), parsed once."""
+        if self._info is None:
+            self._info = inspect_image(self._open_source())
+        return self._info
 
     @property
     def pil_image(self) -> Image.Image:
         """Get as PIL Image, converting if necessary"""
         if self._pil_image is None:
-            self._pil_image = Image.open(io.BytesIO(self.bytes))
-            if self._pil_image.mode != "RGB":
-                self._pil_image = self._pil_image.convert("RGB")
+            image = self._open_source()
+            if self._info is None:
+                # Read EXIF before decoding so orientation/GPS stay available
+                self._info = inspect_image(image)
+            self._pil_image = image if image.mode == "RGB" else image.convert("RGB")
         return self._pil_image
 
+    def decode(
+        self,
+        draft_size: tuple[int, int] | None = None,
+        limits: ImageLimits | None = None,
+    ) -> Image.Image:
+        """
+        Decode to an RGB PIL image, optionally at reduced resolution.
+
+        Only JPEG supports a reduced-resolution decode: for JPEGs larger than
+        `draft_size` the decoder scales by 1/2, 1/4 or 1/8 while decoding, so
+        the full-size bitmap is never allocated; the result still covers
+        `draft_size`. Other formats are decoded at full size. `limits.max_pixels`
+        is checked against the size that will actually be decoded, before
+        decoding.
+        """
+        info = self.info
+        image = self._open_source()
+        if draft_size and (image.width > draft_size[0] or image.height > draft_size[1]):
+            image.draft("RGB", draft_size)
+        if limits is not None:
+            limits.check_pixels(image.width * image.height)
+
+        decoded = image if image.mode == "RGB" else image.convert("RGB")
+        if decoded.size == info.size:
+            self._pil_image = decoded
+        else:
+            # Reduced-resolution decode; reopen if full resolution is needed later
+            self._source_image = None
+        return decoded
+
     @property
     def data_uri(self) -> str:
         """Get as data URI, converting if necessary"""
         if self._data_uri is None:
             mime_type = self.detect_mime_type()
-            base64_data = base64.b64encode(self.bytes).decode("utf-8")
+            base64_data = base64.b64encode(self.buffer).decode("ascii")
             self._data_uri = f"data:{mime_type};base64,{base64_data}"
         return self._data_uri
 
     def detect_mime_type(self) -> str:
         """Detect MIME type from image bytes"""
-        if self.bytes.startswith(b"\x89PNG\r\n"):
+        header = self._peek(8)
+        if header.startswith(b"\x89PNG\r\n"):
             return "image/png"
-        if self.bytes.startswith(b"\xff\xd8\xff"):
+        if header.startswith(b"\xff\xd8\xff"):
             return "image/jpeg"
         return "image/png"  # Default to PNG
 
@@ -235,23 +827,41 @@ class ImageContent:
 class ImageProcessor:
     """Combined image processing step that handles validation, conversion, and preprocessing"""
 
-    def __init__(self, max_size: tuple[int, int] = (800, 800)):
+    def __init__(
+        self,
+        max_size: tuple[int, int] = (800, 800),
+        cache: ProcessedImageCache | None = None,
+        output_format: str | None = None,
+        max_concurrency: int = 4,
+        limits: ImageLimits | None = None,
+    ):
+        """
+        Args:
+            max_size: Bounding box the image is downscaled to fit within. JPEGs
+                are decoded directly at reduced resolution; other formats are
+                decoded at full size and then resized.
+            cache: Optional cache of processed output keyed by image content
+            output_format: PIL format for the output (e.g. "JPEG"). Defaults to
+                the source format for untouched images and PNG otherwise.
+            max_concurrency: Images processed in parallel when `content` is a list
+            limits: Byte, pixel and frame limits; rejected images raise
+                ImageLimitError before their pixels are decoded
+        """
         self.max_size = max_size
+        self.cache = cache
+        self.output_format = output_format
+        self.max_concurrency = max_concurrency
+        self.limits = limits or ImageLimits()
         self._accepted_types = [MediaType.IMAGE]
 
-    def _apply_orientation(self, image: Image.Image) -> Image.Image:
-        """Apply EXIF orientation to the image if necessary."""
+    def _apply_orientation(self, image: Image.Image, orientation: int) -> Image.Image:
+        """Apply EXIF orientation (read once from the image header) if necessary."""
         try:
-            exif_data = image.getexif()
-            if not exif_data:
+            if orientation == 1:  # Normal
                 return image
 
-            orientation = exif_data.get(0x0112, 1)  # 0x0112 is the EXIF Orientation tag
             logging.info(f"ImageProcessor found EXIF orientation: {orientation}")
-
-            if orientation == 1:  # Normal
-                return image
-            elif orientation == 2:  # Mirror horizontal
+            if orientation == 2:  # Mirror horizontal
                 return image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
             elif orientation == 3:  # Rotate 180
                 return image.transpose(Image.Transpose.ROTATE_180)
@@ -278,14 +888,14 @@ class ImageProcessor:
     def accepted_media_types(self) -> list[MediaType]:
         return self._accepted_types
 
-    async def process(self, data: PipelineData) -> PipelineData:
-        # Wrap content in ImageContent for unified handling
-        image_content = ImageContent(data.content)
-        pil_image = image_content.pil_image
-        corrected_pil_image = self._apply_orientation(pil_image)
+    def _process_image(self, image_content: ImageContent) -> ProcessedImage:
+        """Decode, orient, resize and encode a single image."""
+        info = image_content.info
 
-        # Get original size before any processing
-        original_size = corrected_pil_image.size
+        # Get original size before any processing, as displayed after orientation
+        original_size = info.size
+        if info.orientation in (5, 6, 7, 8):  # Rotated by 90 degrees
+            original_size = (info.height, info.width)
 
         # Calculate resize ratio if needed
         ratio = min(
@@ -298,6 +908,15 @@ class ImageProcessor:
                 int(original_size[0] * ratio),
                 int(original_size[1] * ratio),
             )
+
+        # Decode at reduced resolution where the format allows it (JPEG)
+        draft_size = processed_size
+        if info.orientation in (5, 6, 7, 8):
+            draft_size = (processed_size[1], processed_size[0])
+        pil_image = image_content.decode(draft_size=draft_size, limits=self.limits)
+        corrected_pil_image = self._apply_orientation(pil_image, info.orientation)
+
+        if corrected_pil_image.size != processed_size:
             # Resize the image
             processed_pil = corrected_pil_image.resize(
                 processed_size, Image.Resampling.LANCZOS
@@ -306,18 +925,94 @@ class ImageProcessor:
             # If no resize needed, use original
             processed_pil = corrected_pil_image
 
-        # Convert to dspy.Image before returning
-        processed_dspy = dspy.Image.from_PIL(processed_pil)
+        # Untouched images keep their source format; anything re-rendered is PNG
+        output_format = self.output_format or processed_pil.format or "PNG"
+        buffer = io.BytesIO()
+        processed_pil.save(buffer, format=output_format)
+
+        metadata = {
+            "mime_type": image_content.detect_mime_type(),
+            "original_size": original_size,
+            "processed_size": processed_size,
+            "compression_ratio": ratio if ratio < 1 else 1.0,
+        }
+        # GPS comes from the same header parse used for orientation
+        if image_content.info.gps:
+            metadata["gps_location"] = image_content.info.gps
+
+        return ProcessedImage(
+            data=buffer.getvalue(),
+            mime_type=Image.MIME.get(output_format.upper(), "image/png"),
+            metadata=metadata,
+        )
+
+    def _process_cached(self, content: Any) -> ProcessedImage:
+        """Process one image, consulting the cache first when one is configured."""
+        # Wrap content in ImageContent for unified handling
+        image_content = ImageContent(content, limits=self.limits)
+
+        # Reject oversized input from its length and header, before decoding
+        self.limits.check_bytes(image_content.size_bytes)
+        self.limits.check_frames(image_content.info.frames)
+
+        cache_key = None
+        processed = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                image_content.content_hash(), self.max_size, self.output_format
+            )
+            processed = self.cache.get(cache_key)
+
+        if processed is None:
+            processed = self._process_image(image_content)
+            if self.cache is not None and cache_key is not None:
+                self.cache.put(cache_key, processed)
+        elif self.cache is not None:
+            logging.debug(f"ImageProcessor cache hit for {cache_key}")
+        if self.cache is not None:
+            # Later steps may edit the metadata (including nested values such
+            # as `gps_location`); keep the cached entry intact
+            processed = dataclasses.replace(
+                processed, metadata=copy.deepcopy(processed.metadata)
+            )
+        return processed
+
+    @staticmethod
+    def _to_dspy_image(processed: ProcessedImage) -> dspy.Image:
+        encoded = base64.b64encode(processed.data).decode("ascii")
+        return dspy.Image(url=f"data:{processed.mime_type};base64,{encoded}")
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        if isinstance(data.content, (list, tuple)):
+            return await self._process_batch(data)
+
+        processed = self._process_cached(data.content)
+
+        return data.derive(
+            content=self._to_dspy_image(processed),
+            media_type=MediaType.IMAGE,
+            metadata=processed.metadata,
+            processed=True,
+        )
+
+    async def _process_batch(self, data: PipelineData) -> PipelineData:
+        """
+        Process a list of images in worker threads, at most `max_concurrency`
+        at a time. Output order matches input order; per-image metadata is
+        reported under `images`.
+        """
+        batch = await run_concurrently(
+            [
+                functools.partial(anyio.to_thread.run_sync, self._process_cached, item)
+                for item in data.content
+            ],
+            self.max_concurrency,
+        )
 
-        return PipelineData(
+        return data.derive(
+            content=[self._to_dspy_image(processed) for processed in batch],
             media_type=MediaType.IMAGE,
-            content=processed_dspy,
-            metadata={
-                **data.metadata,
-                "processed": True,
-                "mime_type": image_content.detect_mime_type(),
-                "original_size": original_size,
-                "processed_size": processed_size,
-                "compression_ratio": ratio if ratio < 1 else 1.0,
-            },
+            processed=True,
+            image_count=len(batch),
+            images=[processed.metadata for processed in batch],
         )
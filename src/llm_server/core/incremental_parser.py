@@ -0,0 +1,198 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+# A location inside a parsed document: object keys and list indices
+Path = tuple[str | int, ...]
+
+
+@dataclass(frozen=True)
+class ParsedField:
+    """A value that has finished streaming, and where it sits in the output."""
+
+    path: Path
+    value: Any
+
+
+@dataclass
+class _Frame:
+    kind: str  # "{" or "["
+    path: Path
+    start: int
+    key: str | None = None
+    expect_key: bool = True
+    index: int = 0
+    value_start: int | None = None
+    value_done: bool = False
+
+    @property
+    def member(self) -> str | int | None:
+        return self.key if self.kind == "{" else self.index
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON document that arrives in chunks and reports each value as
+    soon as it is complete, rather than after the whole document.
+
+    `feed` returns the members of containers up to `max_depth` levels deep
+    that completed within the chunk, e.g. with the default depth both
+    ``("name",)`` and each ``("items", 0)``, ``("items", 1)``... of
+    ``{"name": ..., "items": [...]}``, and finally the root itself at path
+    ``()``. Anything before the root's opening bracket is skipped, so
+    fragments such as a leading ``"field": `` are tolerated. Strings and
+    containers complete on their closing character; numbers and literals
+    complete on the following delimiter.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self._buffer = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._string_start = 0
+        self.done = False
+
+    @property
+    def started(self) -> bool:
+        return self.done or bool(self._stack)
+
+    def feed(self, chunk: str) -> list[ParsedField]:
+        """Consume the next chunk of text and return the values it completed."""
+        completed: list[ParsedField] = []
+        self._buffer += chunk
+        buffer = self._buffer
+
+        while self._pos < len(buffer) and not self.done:
+            i = self._pos
+            c = buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._end_string(i, completed)
+                continue
+
+            if not self._stack:
+                if c in "{[":
+                    self._stack.append(_Frame(kind=c, path=(), start=i))
+                continue
+
+            if c.isspace():
+                continue
+
+            frame = self._stack[-1]
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = frame.kind == "{" and frame.expect_key
+                if not self._string_is_key:
+                    self._start_value(frame, i)
+            elif c in "{[":
+                self._start_value(frame, i)
+                self._stack.append(
+                    _Frame(kind=c, path=(*frame.path, frame.member), start=i)  # type: ignore[arg-type]
+                )
+            elif c in "}]":
+                self._finish_scalar(frame, i, completed)
+                self._stack.pop()
+                if self._stack:
+                    self._complete_value(self._stack[-1], i + 1, completed)
+                else:
+                    self.done = True
+                    completed.append(
+                        ParsedField((), json.loads(buffer[frame.start : i + 1]))
+                    )
+            elif c == ",":
+                self._finish_scalar(frame, i, completed)
+                frame.key = None
+                frame.expect_key = frame.kind == "{"
+                frame.value_start = None
+                frame.value_done = False
+                if frame.kind == "[":
+                    frame.index += 1
+            elif c == ":":
+                frame.expect_key = False
+            else:
+                # Part of a number or literal
+                self._start_value(frame, i)
+
+        return completed
+
+    def _end_string(self, end: int, completed: list[ParsedField]) -> None:
+        frame = self._stack[-1]
+        if self._string_is_key:
+            frame.key = json.loads(self._buffer[self._string_start : end + 1])
+        else:
+            self._complete_value(frame, end + 1, completed)
+
+    @staticmethod
+    def _start_value(frame: _Frame, position: int) -> None:
+        if frame.value_start is None:
+            frame.value_start = position
+
+    def _finish_scalar(
+        self, frame: _Frame, end: int, completed: list[ParsedField]
+    ) -> None:
+        if frame.value_start is not None and not frame.value_done:
+            self._complete_value(frame, end, completed)
+
+    def _complete_value(
+        self, frame: _Frame, end: int, completed: list[ParsedField]
+    ) -> None:
+        frame.value_done = True
+        if len(frame.path) < self.max_depth and frame.value_start is not None:
+            value = json.loads(self._buffer[frame.value_start : end])
+            completed.append(ParsedField((*frame.path, frame.member), value))  # type: ignore[arg-type]
+
+
+@dataclass
+class StreamedOutputParser:
+    """
+    Tracks the streamed chunks of a signature's output fields, as relayed by
+    DSPy stream listeners, and reports completed values.
+
+    Text fields are reported whole once their last chunk arrives. Structured
+    fields (lists, dicts, models) are parsed incrementally, so each list
+    element or object member is reported as soon as it closes, followed by
+    the field itself. Paths start with the field name.
+    """
+
+    output_fields: dict[str, Any]
+    _text: dict[str, str] = field(default_factory=dict)
+    _parsers: dict[str, IncrementalJSONParser] = field(default_factory=dict)
+
+    def feed(self, field_name: str, chunk: str, is_last: bool) -> list[ParsedField]:
+        """Consume a chunk of one output field."""
+        self._text[field_name] = self._text.get(field_name, "") + chunk
+        annotation = self.output_fields.get(field_name, str)
+
+        if annotation in (str, None):
+            if is_last:
+                return [ParsedField((field_name,), self._text[field_name].strip())]
+            return []
+
+        parser = self._parsers.get(field_name)
+        if parser is None:
+            parser = self._parsers[field_name] = IncrementalJSONParser(max_depth=1)
+        completed = [
+            ParsedField((field_name, *parsed.path), parsed.value)
+            for parsed in parser.feed(chunk)
+        ]
+        if is_last and not parser.started:
+            # A scalar such as an int or bool; no brackets to track
+            text = self._text[field_name].strip()
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                value = text
+            completed.append(ParsedField((field_name,), value))
+        return completed
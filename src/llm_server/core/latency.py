@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+from typing import Any
+
+from llm_server.core.utils import percentile
+
+
+class LatencyTracker:
+    """
+    Online latency statistics for one model or step: an exponentially
+    weighted moving average plus percentiles over a window of recent samples.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 256, min_samples: int = 5):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.count = 0
+        self.ewma: float | None = None
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self._samples.append(seconds)
+            if self.ewma is None:
+                self.ewma = seconds
+            else:
+                self.ewma += self.alpha * (seconds - self.ewma)
+
+    def percentile(self, pct: float) -> float | None:
+        """Percentile (0-100) of recent samples, or None before `min_samples`."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return percentile(ordered, pct)
+
+    def expected(self) -> float | None:
+        """Typical latency (the EWMA), or None before `min_samples`."""
+        with self._lock:
+            return self.ewma if self.count >= self.min_samples else None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "ewma_s": self.ewma,
+            "p50_s": self.percentile(50),
+            "p95_s": self.percentile(95),
+            "p99_s": self.percentile(99),
+        }
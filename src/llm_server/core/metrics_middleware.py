@@ -58,6 +58,14 @@ class PerformanceMetricsMiddleware:
             )
             return body_bytes  # Return original body if anything goes wrong
 
+    @staticmethod
+    def _is_json_response(start_message: dict) -> bool:
+        """Only JSON bodies can carry pipeline metrics worth relocating."""
+        for key, value in start_message.get("headers", []):
+            if key.lower() == b"content-type":
+                return value.split(b";")[0].strip().lower() == b"application/json"
+        return False
+
     async def __call__(self, scope: dict, receive: Callable, send: Callable):
         if scope["type"] != "http" or not any(
             scope.get("path", "").startswith(p) for p in self.tracked_paths
@@ -67,14 +75,25 @@ class PerformanceMetricsMiddleware:
 
         response_body = bytearray()
         original_start_message = {}
+        passthrough = False
 
         async def send_interceptor(message: dict):
-            nonlocal response_body, original_start_message
+            nonlocal response_body, original_start_message, passthrough
             if message["type"] == "http.response.start":
+                if not self._is_json_response(message):
+                    # Streaming (e.g. SSE) and other non-JSON responses are
+                    # forwarded untouched, chunk by chunk, without buffering
+                    passthrough = True
+                    await send(message)
+                    return
                 # Don't send yet, just store it
                 original_start_message = message
                 return
 
+            if passthrough:
+                await send(message)
+                return
+
             if message["type"] == "http.response.body":
                 response_body.extend(message.get("body", b""))
                 # If this is the last chunk, process and send the full response
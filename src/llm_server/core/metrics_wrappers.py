@@ -1,3 +1,4 @@
+import random
 import time
 import uuid
 from typing import Any
@@ -14,6 +15,7 @@ from llm_server.core.opentelemetry_integration import (
 )
 from llm_server.core.protocols import PipelineStep
 from llm_server.core.types import MediaType, PipelineData, Usage
+from llm_server.core.utils import percentile
 
 
 class PerformanceMetrics:
@@ -124,6 +126,98 @@ class PerformanceMetrics:
         return summary
 
 
+class LatencySample:
+    """
+    Exact count and mean of a stream of durations, plus a uniform random
+    sample of at most `size` of them for percentiles, so memory stays
+    fixed however many items a batch has (reservoir sampling).
+    """
+
+    def __init__(self, size: int = 10_000, rng: random.Random | None = None):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.samples: list[float] = []
+        self._rng = rng or random.Random()
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if len(self.samples) < self.size:
+            self.samples.append(duration)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = duration
+
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        }
+
+
+class BatchMetrics:
+    """
+    Aggregates timings across a batch of pipeline executions, such as one
+    `Pipeline.execute_many` call: item outcomes, throughput, and latency
+    percentiles overall and per step. Percentiles come from a sample of at
+    most `sample_size` durations per series, so memory does not grow with
+    the batch.
+    """
+
+    def __init__(self, sample_size: int = 10_000):
+        self.start_time = time.perf_counter()
+        self.end_time: float | None = None
+        self.succeeded = 0
+        self.failed = 0
+        self.sample_size = sample_size
+        self.item_durations = LatencySample(sample_size)
+        # Keyed by step index, since a pipeline may reuse a step class
+        self.step_names: dict[int, str] = {}
+        self.step_durations: dict[int, LatencySample] = {}
+
+    def record_step(self, index: int, name: str, duration: float) -> None:
+        """Record the duration in seconds of one step for one item."""
+        self.step_names[index] = name
+        if index not in self.step_durations:
+            self.step_durations[index] = LatencySample(self.sample_size)
+        self.step_durations[index].add(duration)
+
+    def record_item(self, duration: float, success: bool) -> None:
+        """Record the end-to-end duration in seconds of one item."""
+        if success:
+            self.succeeded += 1
+            self.item_durations.add(duration)
+        else:
+            self.failed += 1
+
+    def finish(self) -> None:
+        self.end_time = time.perf_counter()
+
+    def get_summary(self) -> dict[str, Any]:
+        """Get a summary of the batch, suitable for logging or a job report."""
+        elapsed = (self.end_time or time.perf_counter()) - self.start_time
+        completed = self.succeeded + self.failed
+        return {
+            "items": completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "duration_s": round(elapsed, 3),
+            "throughput_per_s": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency": self.item_durations.summary(),
+            "steps": [
+                {"index": index, "name": self.step_names[index]}
+                | self.step_durations[index].summary()
+                for index in sorted(self.step_durations)
+            ],
+        }
+
+
 class PipelineStepTracker:
     """Wrapper that adds OTel tracing to any PipelineStep implementation."""
 
@@ -121,6 +121,146 @@ try:
         else None
     )
 
+    # Image processing cache metrics
+    IMAGE_CACHE_LOOKUPS_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.image_cache.lookups_total",
+            description="Total number of processed-image cache lookups, partitioned by result.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    IMAGE_CACHE_BYTES_SAVED_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.image_cache.bytes_saved_total",
+            description="Bytes of processed image output served from cache instead of being recomputed.",
+            unit="By",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    IMAGE_CACHE_BYTES = (
+        _meter.create_up_down_counter(
+            name="llm_server.image_cache.bytes",
+            description="Bytes held by the processed-image cache, partitioned by tier (memory, disk).",
+            unit="By",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Cancellation metrics
+    CANCELLED_WORK_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.cancelled_work_total",
+            description="Requests and model calls cancelled before completion, e.g. on client disconnect.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    ABANDONED_THREADS = (
+        _meter.create_up_down_counter(
+            name="llm_server.abandoned_threads",
+            description="Worker threads still running a model call whose caller was cancelled.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Hedged request metrics
+    HEDGE_EVENTS_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.hedge.events_total",
+            description="Hedged request events, partitioned by event (sent, won, budget_exhausted).",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Client-side rate limiting metrics
+    RATE_LIMIT_EVENTS_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.rate_limit.events_total",
+            description="Calls delayed or rejected by client-side rate limits, partitioned by limiter and event.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Retry metrics
+    RETRY_EVENTS_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.retry.events_total",
+            description="Model call retry events, partitioned by event (retries, recovered, budget_exhausted, gave_up).",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Admission control metrics
+    ADMISSION_REJECTED_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.admission.rejected_total",
+            description="Requests shed by admission control, partitioned by key and reason.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Adaptive concurrency metrics
+    CONCURRENCY_LIMIT = (
+        _meter.create_up_down_counter(
+            name="llm_server.concurrency.limit",
+            description="Current adaptive concurrency limit of each model backend.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Scheduler metrics
+    SCHEDULER_QUEUE_SECONDS = (
+        _meter.create_histogram(
+            name="llm_server.scheduler.queue_seconds",
+            description="Time model calls waited for a scheduler slot, partitioned by priority class.",
+            unit="s",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Fallback metrics
+    FALLBACK_EVENTS_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.fallback.events_total",
+            description="Degraded responses served instead of failing, partitioned by source and reason.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
+    # Health probe metrics
+    HEALTH_PROBES_TOTAL = (
+        _meter.create_counter(
+            name="llm_server.health.probes_total",
+            description="Background health probes of model backends, partitioned by result.",
+            unit="1",
+        )
+        if _OTEL_ENABLED
+        else None
+    )
+
     # Application & Business Metrics
     TOKEN_USAGE_TOTAL = (
         _meter.create_counter(
@@ -159,6 +299,19 @@ except ImportError:
     CIRCUIT_BREAKER_FAILURES_TOTAL = None
     CIRCUIT_BREAKER_STATE_CHANGES_TOTAL = None
     CIRCUIT_BREAKER_STATE = None
+    IMAGE_CACHE_LOOKUPS_TOTAL = None
+    IMAGE_CACHE_BYTES_SAVED_TOTAL = None
+    IMAGE_CACHE_BYTES = None
+    CANCELLED_WORK_TOTAL = None
+    ABANDONED_THREADS = None
+    HEDGE_EVENTS_TOTAL = None
+    RATE_LIMIT_EVENTS_TOTAL = None
+    RETRY_EVENTS_TOTAL = None
+    ADMISSION_REJECTED_TOTAL = None
+    CONCURRENCY_LIMIT = None
+    SCHEDULER_QUEUE_SECONDS = None
+    FALLBACK_EVENTS_TOTAL = None
+    HEALTH_PROBES_TOTAL = None
     TOKEN_USAGE_TOTAL = None
     TOKEN_COST_TOTAL = None
 #
@@ -213,3 +366,25 @@ def instrument_with_trace(
         return wrapper
 
     return decorator
+
+
+def observe_gauge(
+    name: str,
+    description: str,
+    callback: Callable[[], list[tuple[float, dict[str, Any]]]],
+    unit: str = "1",
+) -> None:
+    """
+    Registers an observable gauge whose values are read from `callback` at
+    each collection, as (value, attributes) pairs. A no-op when OTel is disabled.
+    """
+    if not _OTEL_ENABLED or not _meter:
+        return
+    from opentelemetry.metrics import Observation
+
+    def observe(options: Any) -> list[Observation]:
+        return [Observation(value, attributes) for value, attributes in callback()]
+
+    _meter.create_observable_gauge(
+        name=name, callbacks=[observe], description=description, unit=unit
+    )
@@ -2,11 +2,17 @@ import json
 from typing import Any
 
 from llm_server.core import logging
-from llm_server.core.protocols import OutputProcessor
+from llm_server.core.incremental_parser import StreamedOutputParser
+from llm_server.core.protocols import StreamingOutputProcessor
 from llm_server.core.types import PipelineData
 
 
-class DefaultOutputProcessor(OutputProcessor):
+class DefaultOutputProcessor(StreamingOutputProcessor):
+    def create_stream_parser(
+        self, output_fields: dict[str, Any]
+    ) -> StreamedOutputParser:
+        return StreamedOutputParser(output_fields)
+
     def process(self, result: Any, pipeline_data: PipelineData) -> Any:
         if hasattr(result, "output"):
             return result.output
@@ -1,12 +1,66 @@
-from collections.abc import Sequence
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from contextlib import (
+    AbstractAsyncContextManager,
+    aclosing,
+    asynccontextmanager,
+    nullcontext,
+)
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
 
+from llm_server.core import logging
+from llm_server.core.admission import AdmissionController
+from llm_server.core.deadline import (
+    check_budget,
+    deadline_scope,
+    enforce_budget,
+    remaining_time,
+)
+from llm_server.core.metrics_wrappers import BatchMetrics
 from llm_server.core.opentelemetry_integration import (
     _OTEL_ENABLED,
     _tracer,
     trace,
 )
-from llm_server.core.protocols import PipelineStep
-from llm_server.core.types import PipelineData
+from llm_server.core.protocols import PipelineStep, StreamingPipelineStep
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEvent,
+    PipelineEventType,
+)
+
+MergeFunction = Callable[[dict[str, PipelineData]], PipelineData]
+
+
+@dataclass
+class PipelineNode:
+    """A step in a DAGPipeline, with the names of the nodes it consumes."""
+
+    name: str
+    step: PipelineStep
+    depends_on: list[str] = field(default_factory=list)
+    # Combines the outputs of several dependencies into this node's input
+    merge: MergeFunction | None = None
+
+
+def merge_pipeline_data(results: dict[str, PipelineData]) -> PipelineData:
+    """
+    Default join for nodes with several dependencies: content is a dict keyed
+    by upstream node name and metadata is merged in dependency order.
+    """
+    media_types = {data.media_type for data in results.values()}
+    metadata: dict[str, Any] = {}
+    for data in results.values():
+        metadata.update(data.metadata)
+    return PipelineData(
+        media_type=media_types.pop() if len(media_types) == 1 else MediaType.TEXT,
+        content={name: data.content for name, data in results.items()},
+        metadata=metadata,
+    )
 
 
 class PipelineValidator:
@@ -19,16 +73,65 @@ class PipelineValidator:
             raise ValueError("Pipeline must contain at least one step")
 
         for i in range(len(steps) - 1):
-            current = steps[i]
-            next_step = steps[i + 1]
-            if not any(
-                media_type in next_step.accepted_media_types
-                for media_type in current.accepted_media_types
-            ):
-                raise ValueError(
-                    f"Incompatible steps: {current.__class__.__name__} "
-                    f"-> {next_step.__class__.__name__}"
-                )
+            PipelineValidator.validate_connection(steps[i], steps[i + 1])
+
+    @staticmethod
+    def validate_connection(current: PipelineStep, next_step: PipelineStep) -> None:
+        """Validate that the output of one step can feed another"""
+        if not any(
+            media_type in next_step.accepted_media_types
+            for media_type in current.accepted_media_types
+        ):
+            raise ValueError(
+                f"Incompatible steps: {current.__class__.__name__} "
+                f"-> {next_step.__class__.__name__}"
+            )
+
+    @staticmethod
+    def validate_graph(nodes: Sequence[PipelineNode]) -> list[PipelineNode]:
+        """
+        Validate a DAG of nodes: unique names, known dependencies, no cycles
+        and compatible media types on every edge. Returns the nodes in
+        topological order.
+        """
+        if not nodes:
+            raise ValueError("Pipeline must contain at least one step")
+
+        by_name: dict[str, PipelineNode] = {}
+        for node in nodes:
+            if node.name in by_name:
+                raise ValueError(f"Duplicate pipeline node name: {node.name}")
+            by_name[node.name] = node
+
+        for node in nodes:
+            for dependency in node.depends_on:
+                if dependency not in by_name:
+                    raise ValueError(
+                        f"Node {node.name} depends on unknown node {dependency}"
+                    )
+                # A custom merge decides what the joined input looks like
+                if node.merge is None:
+                    PipelineValidator.validate_connection(
+                        by_name[dependency].step, node.step
+                    )
+
+        # Kahn's algorithm; anything left over is part of a cycle
+        remaining = {node.name: len(set(node.depends_on)) for node in nodes}
+        ordered: list[PipelineNode] = []
+        ready = [node for node in nodes if not node.depends_on]
+        while ready:
+            node = ready.pop(0)
+            ordered.append(node)
+            for candidate in nodes:
+                if node.name in candidate.depends_on:
+                    remaining[candidate.name] -= 1
+                    if remaining[candidate.name] == 0:
+                        ready.append(candidate)
+
+        if len(ordered) != len(nodes):
+            cyclic = sorted(set(by_name) - {node.name for node in ordered})
+            raise ValueError(f"Pipeline graph contains a cycle through: {cyclic}")
+        return ordered
 
     @staticmethod
     def validate_initial_data(data: PipelineData, first_step: PipelineStep) -> None:
@@ -40,23 +143,102 @@ class PipelineValidator:
             )
 
 
+async def _process_traced(
+    step: PipelineStep,
+    data: PipelineData,
+    span_name: str,
+    attributes: dict[str, Any],
+) -> PipelineData:
+    """Run a single step inside its own OTel span, if tracing is enabled."""
+    if not (_OTEL_ENABLED and _tracer):
+        return await step.process(data)
+
+    with _tracer.start_as_current_span(span_name, attributes=attributes) as step_span:
+        try:
+            # Add rich attributes before processing
+            step_span.set_attribute("pipeline.step.input_type", data.media_type.value)
+
+            result = await step.process(data)
+
+            # Add attributes after processing
+            step_span.set_attribute(
+                "pipeline.step.output_type", result.media_type.value
+            )
+            return result
+
+        except Exception as e:
+            step_span.record_exception(e)
+            step_span.set_status(trace.StatusCode.ERROR, str(e))
+            raise
+
+
+def _expected_latency(step: PipelineStep) -> float:
+    """A step's typical latency in seconds, if it reports one (see ModelProcessor)."""
+    expected = getattr(step, "expected_latency", None)
+    return float(expected) if isinstance(expected, (int, float)) else 0.0
+
+
+def _required_latency(step: PipelineStep) -> float:
+    """
+    The time a step needs before it is worth starting: its expected latency,
+    or none if it answers a blown deadline itself (a ModelProcessor with a
+    fallback policy).
+    """
+    if getattr(step, "fallback", None) is not None:
+        return 0.0
+    return _expected_latency(step)
+
+
 class Pipeline:
-    """Manages execution of multiple pipeline steps in sequence"""
+    """
+    Manages execution of multiple pipeline steps in sequence.
 
-    def __init__(self, steps: Sequence[PipelineStep]):
+    When a deadline is set, via `timeout` or an enclosing `deadline_scope`,
+    each step gets the remaining time minus the expected latency of the
+    steps after it, and is cancelled with DeadlineExceededError if it
+    overruns. A step is not started at all if its budget cannot cover its
+    own expected latency, unless it can answer with a fallback.
+
+    With an `admission` controller, `execute`, `execute_stream` and each
+    `execute_many` batch first take a slot under `admission_key`, and are
+    rejected with OverloadedError when the pipeline is at capacity.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[PipelineStep],
+        admission: AdmissionController | None = None,
+        admission_key: str = "pipeline",
+    ):
         self.steps = steps
+        self.admission = admission
+        self.admission_key = admission_key
         self.validator = PipelineValidator()
         self.validator.validate_steps(list(steps))
 
-    async def execute(self, initial_data: PipelineData) -> PipelineData:
-        """Execute steps in sequence"""
+    def _admitted(self) -> AbstractAsyncContextManager[None]:
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(self.admission_key)
+
+    async def execute(
+        self, initial_data: PipelineData, timeout: float | None = None
+    ) -> PipelineData:
+        """Execute steps in sequence, optionally within `timeout` seconds"""
         self.validator.validate_initial_data(initial_data, self.steps[0])
 
+        with deadline_scope(timeout):
+            async with self._admitted():
+                return await self._execute_steps(initial_data)
+
+    async def _execute_steps(
+        self, initial_data: PipelineData, metrics: BatchMetrics | None = None
+    ) -> PipelineData:
         if not (_OTEL_ENABLED and _tracer):
             # Fallback to non-traced execution if OTel is disabled
             current_data = initial_data
-            for step in self.steps:
-                current_data = await step.process(current_data)
+            for i, step in enumerate(self.steps):
+                current_data = await self._run_step(i, step, current_data, metrics)
             return current_data
 
         # Execute with tracing using the idiomatic nested `with` pattern
@@ -65,30 +247,411 @@ class Pipeline:
         ) as parent_span:
             current_data = initial_data
             for i, step in enumerate(self.steps):
-                step_name = step.__class__.__name__
-                with _tracer.start_as_current_span(
-                    f"pipeline.step.{step_name}", attributes={"pipeline.step.index": i}
-                ) as step_span:
+                try:
+                    current_data = await self._run_step(i, step, current_data, metrics)
+                except Exception:
+                    parent_span.set_status(
+                        trace.StatusCode.ERROR,
+                        f"Step {i} ({step.__class__.__name__}) failed",
+                    )
+                    raise
+
+            return current_data
+
+    def _step_budget(self, index: int) -> float | None:
+        """
+        Time the step at `index` may use: what is left of the deadline after
+        reserving the expected latency of the later steps. None without a
+        deadline. Raises DeadlineExceededError if the budget cannot cover
+        this step's own expected latency.
+        """
+        if remaining_time() is None:
+            return None
+        step = self.steps[index]
+        reserve = sum(_expected_latency(later) for later in self.steps[index + 1 :])
+        remaining = check_budget(
+            f"step {step.__class__.__name__}", _required_latency(step) + reserve
+        )
+        return None if remaining is None else remaining - reserve
+
+    async def _run_step(
+        self,
+        index: int,
+        step: PipelineStep,
+        data: PipelineData,
+        metrics: BatchMetrics | None = None,
+    ) -> PipelineData:
+        step_name = step.__class__.__name__
+        start = time.perf_counter()
+        with enforce_budget(self._step_budget(index), f"step {step_name}"):
+            result = await _process_traced(
+                step,
+                data,
+                f"pipeline.step.{step_name}",
+                {"pipeline.step.index": index},
+            )
+        if metrics is not None:
+            metrics.record_step(index, step_name, time.perf_counter() - start)
+        return result
+
+    async def execute_many(
+        self,
+        inputs: Iterable[PipelineData],
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+        metrics: BatchMetrics | None = None,
+        timeout: float | None = None,
+    ) -> list[PipelineData | Exception]:
+        """
+        Execute the pipeline for every input, at most `concurrency` at a
+        time, and return the results in input order.
+
+        With `return_exceptions=True` a failed item's exception takes its
+        place in the results; otherwise the first failure cancels the batch
+        and is re-raised. Timings are recorded into `metrics` if given.
+        `timeout` applies to each item separately. Items are traced like a
+        call to `execute`; with an `admission` controller the batch as a
+        whole takes one slot, so its own items never compete for capacity.
+        """
+        results: dict[int, PipelineData | Exception] = {}
+        async with self.execute_many_stream(
+            inputs, concurrency, return_exceptions, metrics, timeout
+        ) as stream:
+            async for index, result in stream:
+                results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    @asynccontextmanager
+    async def execute_many_stream(
+        self,
+        inputs: Iterable[PipelineData],
+        concurrency: int = 8,
+        return_exceptions: bool = False,
+        metrics: BatchMetrics | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[AsyncIterator[tuple[int, PipelineData | Exception]]]:
+        """
+        Like `execute_many`, but yields `(input_index, result)` pairs as items
+        complete::
+
+            async with pipeline.execute_many_stream(inputs) as results:
+                async for index, result in results:
+                    ...
+
+        The workers run only inside the `async with` block: leaving it early
+        (break, error or cancellation) stops them.
+
+        A fixed pool of `concurrency` workers pulls from `inputs` lazily, so
+        a generator of 100k items never becomes 100k tasks or a 100k-item
+        list, and a slow consumer applies backpressure to the workers.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        metrics = metrics or BatchMetrics()
+        items = enumerate(inputs)
+        errors: list[Exception] = []
+        send, receive = anyio.create_memory_object_stream[
+            tuple[int, PipelineData | Exception]
+        ](concurrency)
+
+        async def results() -> AsyncIterator[tuple[int, PipelineData | Exception]]:
+            async for item in receive:
+                yield item
+            if errors:
+                raise errors[0]
+
+        consumer_error: Exception | None = None
+        try:
+            async with self._admitted(), receive, anyio.create_task_group() as tg:
+                tg.start_soon(
+                    self._run_workers,
+                    items,
+                    send,
+                    concurrency,
+                    return_exceptions,
+                    metrics,
+                    errors,
+                    timeout,
+                )
+                try:
+                    yield results()
+                except Exception as e:
+                    # Re-raised below, unwrapped by the task group
+                    consumer_error = e
+                finally:
+                    # Workers still running belong to a consumer that left early
+                    tg.cancel_scope.cancel()
+            if consumer_error is not None:
+                raise consumer_error
+        finally:
+            metrics.finish()
+        logging.info(f"Pipeline batch finished: {metrics.get_summary()}")
+
+    async def _run_workers(
+        self,
+        items: Iterator[tuple[int, PipelineData]],
+        send: Any,
+        concurrency: int,
+        return_exceptions: bool,
+        metrics: BatchMetrics,
+        errors: list[Exception],
+        timeout: float | None,
+    ) -> None:
+        async with send, anyio.create_task_group() as workers:
+
+            async def worker() -> None:
+                # Workers share one iterator, so each input is taken exactly once
+                for index, data in items:
+                    result: PipelineData | Exception
+                    try:
+                        with deadline_scope(timeout):
+                            result = await self._execute_timed(data, metrics)
+                    except Exception as e:
+                        if not return_exceptions:
+                            errors.append(e)
+                            workers.cancel_scope.cancel()
+                            return
+                        result = e
                     try:
-                        # Add rich attributes before processing
-                        step_span.set_attribute(
-                            "pipeline.step.input_type", current_data.media_type.value
+                        await send.send((index, result))
+                    except anyio.BrokenResourceError:
+                        return  # Consumer went away
+
+            for _ in range(concurrency):
+                workers.start_soon(worker)
+
+    async def _execute_timed(
+        self, data: PipelineData, metrics: BatchMetrics
+    ) -> PipelineData:
+        """
+        Execute one item as `execute` does, but under the batch's admission
+        slot, recording per-step and total durations.
+        """
+        start = time.perf_counter()
+        try:
+            self.validator.validate_initial_data(data, self.steps[0])
+            current_data = await self._execute_steps(data, metrics)
+        except Exception:
+            metrics.record_item(time.perf_counter() - start, success=False)
+            raise
+        metrics.record_item(time.perf_counter() - start, success=True)
+        return current_data
+
+    async def execute_stream(
+        self, initial_data: PipelineData
+    ) -> AsyncIterator[PipelineEvent]:
+        """
+        Execute steps in sequence, yielding events as they happen: STEP_STARTED
+        and STEP_COMPLETED for every step, PARTIAL events from steps that
+        support streaming, and a FINAL event carrying the pipeline output.
+
+        An enclosing `deadline_scope` is honored. Streaming steps are checked
+        against their budget before they start but are bounded by their own
+        provider timeout rather than cancelled mid-stream.
+        """
+        self.validator.validate_initial_data(initial_data, self.steps[0])
+
+        async with self._admitted():
+            current_data = initial_data
+            for i, step in enumerate(self.steps):
+                step_name = step.__class__.__name__
+                yield PipelineEvent(
+                    type=PipelineEventType.STEP_STARTED, step=step_name, step_index=i
+                )
+
+                if isinstance(step, StreamingPipelineStep):
+                    self._step_budget(i)
+                    output = None
+                    async for event in self._stream_step(step, current_data, i):
+                        if event.type == PipelineEventType.STEP_COMPLETED:
+                            output = event.data
+                        else:
+                            yield event
+                    if output is None:
+                        raise RuntimeError(
+                            f"Streaming step {step_name} produced no output"
                         )
+                    current_data = output
+                else:
+                    current_data = await self._run_step(i, step, current_data)
+
+                yield PipelineEvent(
+                    type=PipelineEventType.STEP_COMPLETED,
+                    step=step_name,
+                    step_index=i,
+                    data=current_data,
+                )
 
-                        result = await step.process(current_data)
+            yield PipelineEvent(type=PipelineEventType.FINAL, data=current_data)
 
-                        # Add attributes after processing
-                        step_span.set_attribute(
-                            "pipeline.step.output_type", result.media_type.value
+    @staticmethod
+    async def _stream_step(
+        step: StreamingPipelineStep, data: PipelineData, index: int
+    ) -> AsyncIterator[PipelineEvent]:
+        """Relay a streaming step's events, tagged with the step."""
+        step_name = step.__class__.__name__
+        # Not a current span: the context would otherwise leak across yields
+        span = (
+            _tracer.start_span(
+                f"pipeline.step.{step_name}",
+                attributes={
+                    "pipeline.step.index": index,
+                    "pipeline.step.streaming": True,
+                },
+            )
+            if _OTEL_ENABLED and _tracer
+            else None
+        )
+        try:
+            async with aclosing(step.process_stream(data)) as events:
+                async for event in events:
+                    yield event.model_copy(
+                        update={"step": step_name, "step_index": index}
+                    )
+        except Exception as e:
+            if span:
+                span.record_exception(e)
+                span.set_status(trace.StatusCode.ERROR, str(e))
+            raise
+        finally:
+            if span:
+                span.end()
+
+
+class DAGPipeline:
+    """
+    Executes pipeline nodes as a directed acyclic graph.
+
+    Each node runs as soon as all of its dependencies have finished, so
+    independent branches run concurrently and end-to-end latency follows the
+    critical path rather than the sum of all steps. Nodes without
+    dependencies receive the initial data; nodes with several dependencies
+    receive their merged outputs. If any node fails, the remaining nodes are
+    cancelled and the error is re-raised.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[PipelineNode],
+        admission: AdmissionController | None = None,
+        admission_key: str = "pipeline",
+    ):
+        self.admission = admission
+        self.admission_key = admission_key
+        self.validator = PipelineValidator()
+        self.nodes = self.validator.validate_graph(nodes)
+        self.roots = [node for node in self.nodes if not node.depends_on]
+        consumed = {dep for node in self.nodes for dep in node.depends_on}
+        self.sinks = [node for node in self.nodes if node.name not in consumed]
+        # Expected latency of the slowest path after each node, kept in
+        # reserve from its budget like the later steps of a linear Pipeline
+        self._downstream: dict[str, float] = {}
+        for node in reversed(self.nodes):
+            self._downstream[node.name] = max(
+                (
+                    _expected_latency(later.step) + self._downstream[later.name]
+                    for later in self.nodes
+                    if node.name in later.depends_on
+                ),
+                default=0.0,
+            )
+
+    async def execute(
+        self, initial_data: PipelineData, timeout: float | None = None
+    ) -> PipelineData:
+        """Execute the graph and return the output of its sink node(s)."""
+        with deadline_scope(timeout):
+            if self.admission is None:
+                results = await self.execute_nodes(initial_data)
+            else:
+                async with self.admission.admit(self.admission_key):
+                    results = await self.execute_nodes(initial_data)
+        if len(self.sinks) == 1:
+            return results[self.sinks[0].name]
+        return merge_pipeline_data(
+            {node.name: results[node.name] for node in self.sinks}
+        )
+
+    async def execute_nodes(
+        self, initial_data: PipelineData
+    ) -> dict[str, PipelineData]:
+        """Execute the graph and return the output of every node by name."""
+        for root in self.roots:
+            self.validator.validate_initial_data(initial_data, root.step)
+
+        if not (_OTEL_ENABLED and _tracer):
+            return await self._run_graph(initial_data)
+
+        with _tracer.start_as_current_span(
+            "pipeline.execute",
+            attributes={
+                "pipeline.step_count": len(self.nodes),
+                "pipeline.dag": True,
+            },
+        ) as parent_span:
+            try:
+                return await self._run_graph(initial_data)
+            except Exception as e:
+                parent_span.set_status(trace.StatusCode.ERROR, str(e))
+                raise
+
+    def _node_budget(self, node: PipelineNode) -> float | None:
+        """
+        Time `node` may use: what is left of the deadline after reserving the
+        expected latency of its slowest downstream path. None without a
+        deadline. Raises DeadlineExceededError if the budget cannot cover
+        the node's own expected latency.
+        """
+        if remaining_time() is None:
+            return None
+        reserve = self._downstream[node.name]
+        remaining = check_budget(
+            f"node {node.name}", _required_latency(node.step) + reserve
+        )
+        return None if remaining is None else remaining - reserve
+
+    async def _run_graph(self, initial_data: PipelineData) -> dict[str, PipelineData]:
+        results: dict[str, PipelineData] = {}
+        done = {node.name: anyio.Event() for node in self.nodes}
+        errors: list[Exception] = []
+
+        async with anyio.create_task_group() as tg:
+
+            async def run_node(node: PipelineNode) -> None:
+                for dependency in node.depends_on:
+                    await done[dependency].wait()
+
+                try:
+                    if not node.depends_on:
+                        node_input = initial_data
+                    elif len(node.depends_on) == 1 and node.merge is None:
+                        node_input = results[node.depends_on[0]]
+                    else:
+                        merge = node.merge or merge_pipeline_data
+                        node_input = merge(
+                            {dep: results[dep] for dep in node.depends_on}
                         )
-                        current_data = result
 
-                    except Exception as e:
-                        step_span.record_exception(e)
-                        step_span.set_status(trace.StatusCode.ERROR, str(e))
-                        parent_span.set_status(
-                            trace.StatusCode.ERROR, f"Step {i} ({step_name}) failed"
+                    with enforce_budget(self._node_budget(node), f"node {node.name}"):
+                        results[node.name] = await _process_traced(
+                            node.step,
+                            node_input,
+                            f"pipeline.node.{node.name}",
+                            {
+                                "pipeline.node.name": node.name,
+                                "pipeline.node.step": node.step.__class__.__name__,
+                                "pipeline.node.depends_on": list(node.depends_on),
+                            },
                         )
-                        raise
+                except Exception as e:
+                    errors.append(e)
+                    tg.cancel_scope.cancel()
+                    return
+                done[node.name].set()
 
-            return current_data
+            for node in self.nodes:
+                tg.start_soon(run_node, node)
+
+        if errors:
+            raise errors[0]
+        return results
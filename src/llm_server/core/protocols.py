@@ -1,6 +1,13 @@
+from collections.abc import AsyncIterator
 from typing import Any, Protocol, runtime_checkable
 
-from llm_server.core.types import MediaType, PipelineData, ProgramMetadata
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEvent,
+    ProgramMetadata,
+)
 
 
 @runtime_checkable
@@ -13,6 +20,17 @@ class PipelineStep(Protocol):
     def accepted_media_types(self) -> list[MediaType]: ...
 
 
+@runtime_checkable
+class StreamingPipelineStep(PipelineStep, Protocol):
+    """
+    A pipeline step that can emit partial output while it runs. The stream
+    yields PARTIAL events and ends with a STEP_COMPLETED event carrying the
+    step's output.
+    """
+
+    def process_stream(self, data: PipelineData) -> AsyncIterator[PipelineEvent]: ...
+
+
 @runtime_checkable
 class ModelBackend(Protocol):
     """Protocol for model interaction implementations"""
@@ -28,6 +46,18 @@ class ModelBackend(Protocol):
     def get_lm_history(self) -> list[Any]: ...
 
 
+class ModelRegistry(Protocol):
+    """
+    What model-calling steps need of a model manager (see ModelManager):
+    the LM behind a model id, its shared runtime state, and routing within
+    groups of equivalent models.
+    """
+
+    def get_model(self, model_id: str) -> Any: ...
+    def get_runtime(self, model_id: str) -> ModelRuntime: ...
+    def select_model(self, model_id: str, exclude: tuple[str, ...] = ()) -> str: ...
+
+
 class StorageAdapter(Protocol):
     """Defines the contract for how the framework stores and retrieves program metadata."""
 
@@ -47,3 +77,16 @@ class OutputProcessor(Protocol):
     """Defines the contract for processing the raw output from a DSPy signature."""
 
     def process(self, result: Any, pipeline_data: PipelineData) -> Any: ...
+
+
+@runtime_checkable
+class StreamingOutputProcessor(OutputProcessor, Protocol):
+    """
+    An output processor that can also interpret output while it streams.
+    `create_stream_parser` is called once per stream with the signature's
+    output field annotations, and returns an object whose
+    `feed(field_name, chunk, is_last)` yields completed values
+    (see `StreamedOutputParser`).
+    """
+
+    def create_stream_parser(self, output_fields: dict[str, Any]) -> Any: ...
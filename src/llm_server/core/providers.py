@@ -1,9 +1,18 @@
+import inspect
+import os
 from dataclasses import dataclass, field
 from typing import Any
 
 import dspy
 
 from llm_server.core.config import FrameworkSettings
+from llm_server.core.http_pool import HTTPClientPool, HTTPPoolConfig
+from llm_server.core.stub import StubLM
+
+
+def _lm_accepts(parameter: str) -> bool:
+    """Whether dspy.LM takes `parameter` itself, rather than as a request kwarg"""
+    return parameter in inspect.signature(dspy.LM.__init__).parameters
 
 
 @dataclass
@@ -13,6 +22,10 @@ class ProviderConfig:
     api_key: str
     base_url: str | None = None
     default_params: dict[str, Any] = field(default_factory=dict)
+    # Label of a pooled key, e.g. "org-2" or "eastus"; None for the default key
+    name: str | None = None
+    # Per-key `rate_limits` block, for pooled keys
+    rate_limits: dict[str, Any] | None = None
 
     def __post_init__(self):
         if self.default_params is None:
@@ -22,7 +35,11 @@ class ProviderConfig:
 class ProviderManager:
     """Manages provider configurations and initialization"""
 
-    def __init__(self, settings: FrameworkSettings):
+    def __init__(
+        self,
+        settings: FrameworkSettings,
+        providers_config: dict[str, Any] | None = None,
+    ):
         self.providers = {
             "openai": ProviderConfig(
                 api_key=settings.openai_api_key, default_params={}
@@ -36,7 +53,48 @@ class ProviderManager:
             "gemini": ProviderConfig(
                 api_key=settings.gemini_api_key, default_params={}
             ),
+            # Local stand-in models that make no network calls (see StubLM)
+            "stub": ProviderConfig(api_key="", default_params={}),
         }
+        # Providers with several API keys or endpoints, from their `keys` list
+        self.key_pools: dict[str, list[ProviderConfig]] = {}
+        for provider, config in (providers_config or {}).items():
+            if config.get("keys"):
+                self.key_pools[provider] = [
+                    self._pooled_key(provider, index, entry)
+                    for index, entry in enumerate(config["keys"])
+                ]
+        # One keep-alive pool shared by every provider model, so models of
+        # the same provider reuse warm connections
+        self.http_pool: HTTPClientPool | None = None
+        if settings.http_pool_enabled:
+            self.http_pool = HTTPClientPool(
+                "providers",
+                HTTPPoolConfig(
+                    max_connections=settings.http_pool_max_connections,
+                    max_keepalive_connections=settings.http_pool_max_keepalive,
+                    keepalive_expiry=settings.http_pool_keepalive_expiry,
+                    http2=settings.http_pool_http2,
+                ),
+            )
+            self.http_pool.install()
+
+    def _pooled_key(
+        self, provider: str, index: int, entry: dict[str, Any]
+    ) -> ProviderConfig:
+        """Build one pool entry; keys are given inline or by environment variable."""
+        api_key = entry.get("api_key")
+        if not api_key and entry.get("api_key_env"):
+            api_key = os.getenv(entry["api_key_env"], "")
+        if not api_key:
+            raise ValueError(f"Key {index} of provider {provider} has no API key")
+        return ProviderConfig(
+            api_key=api_key,
+            base_url=entry.get("base_url"),
+            default_params=dict(entry.get("params", {})),
+            name=str(entry.get("name", index)),
+            rate_limits=entry.get("rate_limits"),
+        )
 
     def get_provider_config(self, model_name: str) -> ProviderConfig:
         """Get provider configuration based on model name"""
@@ -45,11 +103,18 @@ class ProviderManager:
             raise ValueError(f"Unsupported provider: {provider}")
         return self.providers[provider]
 
+    def get_key_pool(self, model_name: str) -> list[ProviderConfig]:
+        """The pooled keys/endpoints of the model's provider, if it has any"""
+        return self.key_pools.get(model_name.split("/")[0], [])
+
     def initialize_model(
-        self, model_name: str, model_config: dict[str, Any]
+        self,
+        model_name: str,
+        model_config: dict[str, Any],
+        provider_config: ProviderConfig | None = None,
     ) -> dspy.LM:
-        """Initialize a model with provider-specific configuration"""
-        provider_config = self.get_provider_config(model_name)
+        """Initialize a model with provider-specific (or pooled key) configuration"""
+        provider_config = provider_config or self.get_provider_config(model_name)
 
         # Start with provider default params
         params = provider_config.default_params.copy()
@@ -57,7 +122,26 @@ class ProviderManager:
         # Update with model-specific params, letting them override provider defaults
         model_params = model_config.get("additional_params", {})
         params.update(model_params)
+        if provider_config.base_url:
+            params.setdefault("api_base", provider_config.base_url)
 
+        if model_name.startswith("stub/"):
+            return StubLM(
+                model_name,
+                answers=model_config.get("answers"),
+                latency=model_config.get("latency", 0.0),
+                max_tokens=model_config.get("max_tokens", 1000),
+                **params,
+            )
+        # Retries belong to the framework (see RetryPolicy), where the breaker
+        # sees every attempt and the retry budget caps them; LiteLLM's own
+        # would multiply each attempt
+        params.setdefault("num_retries", 0)
+        if self.http_pool and _lm_accepts("engine"):
+            # The pool is installed into LiteLLM, so route calls through it.
+            # DSPy versions without engines always call LiteLLM, and would
+            # pass an unknown `engine` on to the provider
+            params.setdefault("engine", "litellm")
         return dspy.LM(
             model_name,
             api_key=provider_config.api_key,
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+import anyio
+import dspy
+
+from llm_server.core import logging
+from llm_server.core.deadline import remaining_time
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import RATE_LIMIT_EVENTS_TOTAL
+except ImportError:
+    RATE_LIMIT_EVENTS_TOTAL = None
+# --- End OTel Integration ---
+
+# Rough pre-flight estimate; corrected from the provider's reported usage
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 800
+DEFAULT_MAX_OUTPUT_TOKENS = 1000
+
+
+class RateLimitExceededError(RuntimeError):
+    """Raised when a call cannot be admitted by a client-side rate limit in time."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(inputs: Mapping[str, Any], max_output_tokens: int | None) -> int:
+    """Estimate a call's total tokens: its inputs plus the output allowance."""
+
+    def estimate(value: Any) -> int:
+        if isinstance(value, str):
+            return len(value) // CHARS_PER_TOKEN + 1
+        if isinstance(value, dspy.Image):
+            return IMAGE_TOKENS
+        if isinstance(value, (list, tuple)):
+            return sum(estimate(item) for item in value)
+        return len(str(value)) // CHARS_PER_TOKEN + 1
+
+    output = max_output_tokens or DEFAULT_MAX_OUTPUT_TOKENS
+    return sum(estimate(value) for value in inputs.values()) + output
+
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at `per_minute` units per minute, holding
+    at most `capacity` (one minute's worth by default). The level may go
+    negative when actual usage exceeds what was reserved; later callers then
+    wait out the debt.
+    """
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self._refill()
+        # Larger than the bucket: admit once it is full rather than never
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def cap(self, remaining: float) -> None:
+        """Lower the level to what the provider reports as remaining."""
+        self._refill()
+        self.level = min(self.level, remaining)
+
+
+def _header(headers: Mapping[str, Any], name: str) -> float | None:
+    # LiteLLM relays provider headers with an "llm_provider-" prefix
+    for key in (name, f"llm_provider-{name}"):
+        value = headers.get(key)
+        if value is not None:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class RateLimiter:
+    """
+    Client-side requests/min and tokens/min limits for a model or provider.
+
+    `acquire` reserves one request and an estimated token count, waiting up
+    to `max_wait` seconds (never past the request deadline) for capacity,
+    and raises RateLimitExceededError otherwise, so bursts are smoothed or
+    shed before they reach the provider as 429s. `settle` corrects the
+    reservation once the call's actual usage is known, and
+    `update_from_headers` applies the provider's own view of the remaining
+    quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        max_wait: float = 1.0,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self.stats = {"admitted": 0, "delayed": 0, "rejected": 0, "wait_s": 0.0}
+
+    @classmethod
+    def from_config(
+        cls, name: str, config: Mapping[str, Any] | None
+    ) -> "RateLimiter | None":
+        """Build a limiter from a `rate_limits` config block, if it sets any limit."""
+        if not config or not (config.get("rpm") or config.get("tpm")):
+            return None
+        return cls(
+            name,
+            rpm=config.get("rpm"),
+            tpm=config.get("tpm"),
+            max_wait=config.get("max_wait", 1.0),
+        )
+
+    def _try_reserve(self, tokens: int) -> float:
+        with self._lock:
+            wait = max(
+                self.requests.wait_time(1) if self.requests else 0.0,
+                self.tokens.wait_time(tokens) if self.tokens else 0.0,
+            )
+            if wait == 0.0:
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(tokens)
+            return wait
+
+    def _record(self, event: str) -> None:
+        if RATE_LIMIT_EVENTS_TOTAL:
+            RATE_LIMIT_EVENTS_TOTAL.add(1, {"limiter": self.name, "event": event})
+
+    async def acquire(self, tokens: int) -> None:
+        budget = self.max_wait
+        remaining = remaining_time()
+        if remaining is not None:
+            budget = min(budget, remaining)
+
+        waited = 0.0
+        while True:
+            wait = self._try_reserve(tokens)
+            if wait == 0.0:
+                with self._lock:
+                    self.stats["admitted"] += 1
+                    if waited:
+                        self.stats["delayed"] += 1
+                        self.stats["wait_s"] += waited
+                if waited:
+                    self._record("delayed")
+                return
+            if waited + wait > budget:
+                with self._lock:
+                    self.stats["rejected"] += 1
+                self._record("rejected")
+                logging.warning(
+                    f"Rate limit for '{self.name}' rejected a call "
+                    f"(needs {wait:.2f}s, budget {budget - waited:.2f}s)"
+                )
+                raise RateLimitExceededError(
+                    f"Rate limit for '{self.name}' exceeded. "
+                    f"Retry after {wait:.2f} seconds",
+                    retry_after=wait,
+                )
+            await anyio.sleep(wait)
+            waited += wait
+
+    def release(self, tokens: int) -> None:
+        """Return a reservation whose call was never sent."""
+        with self._lock:
+            if self.requests:
+                self.requests.give(1)
+            if self.tokens:
+                self.tokens.give(tokens)
+
+    def settle(self, reserved: int, actual: int) -> None:
+        """Correct a token reservation with the call's reported usage."""
+        if not self.tokens or actual == reserved:
+            return
+        with self._lock:
+            if actual < reserved:
+                self.tokens.give(reserved - actual)
+            else:
+                self.tokens.take(actual - reserved)
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Adopt the remaining quota reported in x-ratelimit-* response headers."""
+        remaining_requests = _header(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _header(headers, "x-ratelimit-remaining-tokens")
+        with self._lock:
+            if self.requests and remaining_requests is not None:
+                self.requests.cap(remaining_requests)
+            if self.tokens and remaining_tokens is not None:
+                self.tokens.cap(remaining_tokens)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self.stats)
+            if self.requests:
+                stats["requests_available"] = self.requests.level
+            if self.tokens:
+                stats["tokens_available"] = self.tokens.level
+        return stats
+
+
+def response_headers(lm: Any) -> Mapping[str, Any]:
+    """
+    Response headers of the last call made through `lm`, as relayed by
+    LiteLLM. Only a copy of the LM used by a single call (see
+    `ModelProcessor._call_lm`) is sure to have made that call last.
+    """
+    history = getattr(lm, "history", None)
+    if not isinstance(history, list) or not history:
+        return {}
+    response = history[-1].get("response")
+    hidden = getattr(response, "_hidden_params", None)
+    if not isinstance(hidden, dict):
+        return {}
+    headers = hidden.get("additional_headers") or {}
+    return headers if isinstance(headers, Mapping) else {}
@@ -0,0 +1,184 @@
+import random
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import anyio
+
+from llm_server.core import logging
+from llm_server.core.deadline import DeadlineExceededError, remaining_time
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import RETRY_EVENTS_TOTAL
+except ImportError:
+    RETRY_EVENTS_TOTAL = None
+# --- End OTel Integration ---
+
+T = TypeVar("T")
+
+# Request timeout, conflict, rate limited, and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+
+def status_code(error: BaseException) -> int | None:
+    """
+    The HTTP status of a provider error, looking through the exceptions it
+    was raised from, as DSPy wraps LiteLLM's errors in its own.
+    """
+    cause: BaseException | None = error
+    while cause is not None:
+        status = getattr(cause, "status_code", None)
+        if isinstance(status, int):
+            return status
+        cause = cause.__cause__
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is worth retrying: rate limits, 5xx responses,
+    timeouts and dropped connections. Client-side rejections (open circuit,
+    rate limiter, exhausted deadline) and other 4xx errors are not.
+    """
+    if isinstance(error, DeadlineExceededError):
+        return False
+    status = status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return isinstance(error, (TimeoutError, ConnectionError))
+
+
+def retry_after(error: BaseException) -> float | None:
+    """The delay a provider asked for in its Retry-After header, if any."""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        # HTTP-date form; fall back to backoff
+        return None
+    return None
+
+
+class RetryPolicy:
+    """
+    Retries transient model errors with exponential backoff and full jitter:
+    attempt n waits a random time up to `base_delay * 2**n`, capped at
+    `max_delay`, or at least what the provider's Retry-After asks for.
+
+    Retries draw on a budget shared by every call using the policy: each
+    call earns `budget_ratio` of a token (up to `budget_burst`) and each
+    retry spends one, so during an outage retries add at most that
+    fraction of extra load instead of multiplying it. Retries never sleep
+    past the request deadline.
+
+    Each attempt goes through the model's circuit breaker, so failed
+    attempts count towards opening it, and an open circuit ends the
+    retries immediately.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        budget_ratio: float = 0.1,
+        budget_burst: float = 10.0,
+        rng: random.Random | None = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self._tokens = budget_burst
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "retries": 0,
+            "recovered": 0,
+            "budget_exhausted": 0,
+            "gave_up": 0,
+        }
+
+    def backoff(
+        self, attempt: int, error: BaseException, honor_retry_after: bool = True
+    ) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, ceiling)
+        requested = retry_after(error) if honor_retry_after else None
+        return max(delay, requested) if requested is not None else delay
+
+    def _record(self, event: str, name: str) -> None:
+        with self._lock:
+            self.stats[event] += 1
+        if RETRY_EVENTS_TOTAL:
+            RETRY_EVENTS_TOTAL.add(1, {"event": event, "model_id": name})
+
+    def _try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    async def run(
+        self, call: Callable[[], Awaitable[T]], name: str, rotating: bool = False
+    ) -> T:
+        """
+        Run `call`, retrying transient failures within the policy's limits.
+        With `rotating`, retries go to a different backend (e.g. another key
+        of a pool), so the failed one's Retry-After need not be waited out.
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            self._tokens = min(self.budget_burst, self._tokens + self.budget_ratio)
+
+        attempt = 1
+        while True:
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if attempt >= self.max_attempts:
+                    self._record("gave_up", name)
+                    raise
+                delay = self.backoff(attempt, e, honor_retry_after=not rotating)
+                remaining = remaining_time()
+                if delay > self.max_delay or (
+                    remaining is not None and delay >= remaining
+                ):
+                    # Asked to wait longer than we can afford
+                    self._record("gave_up", name)
+                    raise
+                if not self._try_spend():
+                    self._record("budget_exhausted", name)
+                    raise
+                self._record("retries", name)
+                logging.warning(
+                    f"Retrying {name} in {delay:.2f}s after "
+                    f"{type(e).__name__} (attempt {attempt}/{self.max_attempts})"
+                )
+                await anyio.sleep(delay)
+                attempt += 1
+                continue
+
+            if attempt > 1:
+                self._record("recovered", name)
+            return result
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = dict(self.stats)
+        stats["retry_rate"] = stats["retries"] / (stats["calls"] or 1)
+        return stats
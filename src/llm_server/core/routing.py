@@ -0,0 +1,59 @@
+import random
+from collections.abc import Sequence
+
+from llm_server.core.runtime import ModelRuntime
+
+ROUTING_STRATEGIES = ("p2c", "least_outstanding")
+
+
+class ModelRouter:
+    """
+    Picks one backend out of a group of equivalent models using their live
+    runtime state.
+
+    Each backend is scored by its expected wait, EWMA latency times
+    (in-flight calls + 1), inflated by its recent error rate and by how
+    little of its rate-limit quota is left. Backends whose circuit is open,
+    or that are cooling down after a 429, are skipped while any other is
+    available. With "p2c" (power of two choices) two random candidates are
+    compared, which avoids herding onto a single backend whose stats are
+    stale; with "least_outstanding" the best-scoring backend always wins.
+
+    Backends without latency samples are scored with the fastest known
+    latency, so they receive traffic and learn.
+    """
+
+    def __init__(self, strategy: str = "p2c", rng: random.Random | None = None):
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown routing strategy '{strategy}', "
+                f"expected one of {ROUTING_STRATEGIES}"
+            )
+        self.strategy = strategy
+        self._rng = rng or random.Random()
+
+    def select(self, runtimes: Sequence[ModelRuntime]) -> ModelRuntime:
+        if not runtimes:
+            raise ValueError("Cannot route: no backends to choose from")
+        # All open: pick anyway and let the breaker reject the call
+        candidates = [
+            r for r in runtimes if not (r.breaker.is_blocking or r.cooling_down)
+        ] or list(runtimes)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        known = [r.latency.ewma for r in candidates if r.latency.ewma is not None]
+        default_latency = min(known) if known else 1.0
+
+        def score(runtime: ModelRuntime) -> float:
+            latency = runtime.latency.ewma
+            if latency is None:
+                latency = default_latency
+            health = max(1.0 - runtime.error_rate, 0.05)
+            # Up to twice the cost when the quota is nearly spent
+            quota = 2.0 - runtime.quota_headroom()
+            return latency * (runtime.in_flight + 1) * quota / health
+
+        if self.strategy == "p2c":
+            candidates = self._rng.sample(candidates, 2)
+        return min(candidates, key=score)
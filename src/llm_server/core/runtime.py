@@ -0,0 +1,132 @@
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import AbstractAsyncContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+from llm_server.core.circuit_breaker import CircuitBreaker
+from llm_server.core.concurrency import AdaptiveLimiter
+from llm_server.core.latency import LatencyTracker
+from llm_server.core.rate_limit import RateLimiter
+from llm_server.core.retry import retry_after, status_code
+
+# How long a model (or pooled key) is avoided after a 429 without Retry-After
+RATE_LIMITED_COOLDOWN = 1.0
+
+
+@dataclass
+class ModelRuntime:
+    """
+    Live state for one model, shared by every processor that calls it:
+    its circuit breaker, learned latency, calls in flight, recent error
+    rate, client-side rate limits and adaptive concurrency limit.
+    `ModelManager.get_runtime` hands these out so that, e.g., a failing
+    model only opens its own circuit, and the router can compare backends.
+    """
+
+    model_id: str
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    breaker: CircuitBreaker = field(init=False)
+    in_flight: int = 0
+    # EWMA of the failure indicator, so recent errors dominate
+    error_rate: float = 0.0
+    error_alpha: float = 0.1
+    # Most specific first: the model's own limits, then its provider's
+    limiters: list[RateLimiter] = field(default_factory=list)
+    concurrency: AdaptiveLimiter | None = None
+    # Set after a provider 429; routing avoids the model until then
+    cooldown_until: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        self.breaker = CircuitBreaker(name=self.model_id)
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Count a call as in flight. Successful calls record their latency,
+        failures raise the error rate (and a 429 starts a cooldown);
+        cancelled calls record neither.
+        """
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        outcome: bool | None = None
+        try:
+            yield
+            outcome = True
+        except Exception as e:
+            outcome = False
+            if status_code(e) == 429:
+                self.cool_down(retry_after(e) or RATE_LIMITED_COOLDOWN)
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if outcome is not None:
+                    failed = 0.0 if outcome else 1.0
+                    self.error_rate += self.error_alpha * (failed - self.error_rate)
+            if outcome:
+                self.latency.record(time.perf_counter() - start)
+
+    def cool_down(self, seconds: float) -> None:
+        with self._lock:
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + seconds)
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    def quota_headroom(self) -> float:
+        """Fraction (0-1) of rate-limit quota currently available; 1 without limits."""
+        levels = [
+            bucket.level / bucket.capacity
+            for limiter in self.limiters
+            for bucket in (limiter.requests, limiter.tokens)
+            if bucket is not None
+        ]
+        return min(1.0, max(0.0, min(levels))) if levels else 1.0
+
+    def slot(self) -> AbstractAsyncContextManager[None]:
+        """A slot under the adaptive concurrency limit, if one is configured."""
+        if self.concurrency is None:
+            return nullcontext()
+        return self.concurrency.acquire()
+
+    async def reserve(self, tokens: int) -> None:
+        """Reserve one call of about `tokens` tokens against every rate limiter."""
+        acquired: list[RateLimiter] = []
+        try:
+            for limiter in self.limiters:
+                await limiter.acquire(tokens)
+                acquired.append(limiter)
+        except BaseException:
+            # All or nothing: don't hold quota for a call that won't be sent
+            for limiter in acquired:
+                limiter.release(tokens)
+            raise
+
+    def settle(
+        self, reserved: int, actual: int | None, headers: Mapping[str, Any]
+    ) -> None:
+        """Correct a reservation with actual usage and the provider's rate headers."""
+        for limiter in self.limiters:
+            if actual is not None:
+                limiter.settle(reserved, actual)
+        if self.limiters and headers:
+            # Headers describe the quota of the model (or key) just called
+            self.limiters[0].update_from_headers(headers)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "error_rate": self.error_rate,
+            "circuit_state": self.breaker.state.value,
+            "cooling_down": self.cooling_down,
+            "latency": self.latency.get_stats(),
+            "concurrency": self.concurrency.get_stats() if self.concurrency else None,
+            "rate_limits": {
+                limiter.name: limiter.get_stats() for limiter in self.limiters
+            },
+        }
@@ -0,0 +1,241 @@
+import itertools
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+from fastapi import Request
+
+from llm_server.core.context import _current_request_class
+from llm_server.core.deadline import enforce_budget, remaining_time
+from llm_server.core.latency import LatencyTracker
+
+# --- OTel Integration ---
+try:
+    from llm_server.core.opentelemetry_integration import SCHEDULER_QUEUE_SECONDS
+except ImportError:
+    SCHEDULER_QUEUE_SECONDS = None
+# --- End OTel Integration ---
+
+# Highest priority first
+PRIORITY_CLASSES = ("interactive", "standard", "batch")
+
+
+@dataclass(frozen=True)
+class RequestClass:
+    """Who a request is for and how urgent it is, for scheduling model calls."""
+
+    tenant: str = "default"
+    priority: str = "standard"
+
+    def __post_init__(self):
+        if self.priority not in PRIORITY_CLASSES:
+            raise ValueError(
+                f"Unknown priority class '{self.priority}', "
+                f"expected one of {PRIORITY_CLASSES}"
+            )
+
+
+def current_request_class() -> RequestClass:
+    """The tenant and priority of the current request (defaults if unset)."""
+    return _current_request_class.get() or RequestClass()
+
+
+@contextmanager
+def request_scope(
+    tenant: str | None = None, priority: str | None = None
+) -> Iterator[RequestClass]:
+    """
+    Set the tenant and priority class for the enclosed code and every model
+    call it makes. Anything not given is inherited from an enclosing scope.
+    """
+    outer = current_request_class()
+    request_class = RequestClass(tenant or outer.tenant, priority or outer.priority)
+    token = _current_request_class.set(request_class)
+    try:
+        yield request_class
+    finally:
+        _current_request_class.reset(token)
+
+
+@dataclass
+class _Waiter:
+    tenant: str
+    finish_tag: float
+    seq: int
+    event: anyio.Event = field(default_factory=anyio.Event)
+
+
+@dataclass
+class _TenantState:
+    in_flight: int = 0
+    queued: int = 0
+    # Virtual finish time of the tenant's last enqueued call, per priority class
+    finish_tags: dict[str, float] = field(default_factory=dict)
+
+
+class FairScheduler:
+    """
+    Orders model calls by priority class, then fairly across tenants.
+
+    Up to `max_in_flight` calls run at once. When a slot frees up it goes to
+    the highest non-empty priority class, so interactive calls never queue
+    behind batch work while batch work still uses any capacity left over.
+    Within a class, tenants share slots by weighted fair queueing: each
+    call gets a virtual finish time of max(class clock, the tenant's last
+    finish) + 1/weight, and the earliest goes first. A tenant backfilling
+    thousands of calls therefore only delays others by its fair share.
+    `tenant_max_in_flight` caps any one tenant's running calls.
+
+    Waiting is bounded by the request deadline. Tenant and priority come
+    from `request_scope` unless passed to `slot` explicitly.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        max_in_flight: int = 16,
+        tenant_max_in_flight: int | None = None,
+        tenant_weights: dict[str, float] | None = None,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.tenant_max_in_flight = tenant_max_in_flight
+        self.tenant_weights = tenant_weights or {}
+        self.in_flight = 0
+        self._queues: dict[str, list[_Waiter]] = {p: [] for p in PRIORITY_CLASSES}
+        self._virtual_time: dict[str, float] = dict.fromkeys(PRIORITY_CLASSES, 0.0)
+        self._tenants: dict[str, _TenantState] = {}
+        self._seq = itertools.count()
+        self._queue_time = {p: LatencyTracker() for p in PRIORITY_CLASSES}
+        self._scheduled = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._lock = threading.Lock()
+
+    def _tenant(self, tenant: str) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _TenantState()
+        return state
+
+    def _eligible(self, tenant: str) -> bool:
+        cap = self.tenant_max_in_flight
+        return cap is None or self._tenants[tenant].in_flight < cap
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the next waiters, in priority then fair order."""
+        while self.in_flight < self.max_in_flight:
+            for priority in PRIORITY_CLASSES:
+                eligible = [
+                    w for w in self._queues[priority] if self._eligible(w.tenant)
+                ]
+                if eligible:
+                    waiter = min(eligible, key=lambda w: (w.finish_tag, w.seq))
+                    break
+            else:
+                return
+            self._queues[priority].remove(waiter)
+            weight = self.tenant_weights.get(waiter.tenant, 1.0)
+            self._virtual_time[priority] = waiter.finish_tag - 1.0 / weight
+            state = self._tenants[waiter.tenant]
+            state.queued -= 1
+            state.in_flight += 1
+            self.in_flight += 1
+            waiter.event.set()
+
+    def _release(self, tenant: str) -> None:
+        self._tenants[tenant].in_flight -= 1
+        self.in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self, tenant: str | None = None, priority: str | None = None
+    ) -> AsyncIterator[None]:
+        """Hold a scheduled slot for one model call."""
+        request_class = current_request_class()
+        tenant = tenant or request_class.tenant
+        priority = priority or request_class.priority
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class '{priority}'")
+
+        enqueued = time.perf_counter()
+        with self._lock:
+            state = self._tenant(tenant)
+            weight = self.tenant_weights.get(tenant, 1.0)
+            start = max(
+                self._virtual_time[priority], state.finish_tags.get(priority, 0.0)
+            )
+            waiter = _Waiter(tenant, start + 1.0 / weight, next(self._seq))
+            state.finish_tags[priority] = waiter.finish_tag
+            state.queued += 1
+            self._queues[priority].append(waiter)
+            self._dispatch()
+
+        if not waiter.event.is_set():
+            try:
+                with enforce_budget(remaining_time(), f"{self.name} scheduler"):
+                    await waiter.event.wait()
+            except BaseException:
+                with self._lock:
+                    if waiter.event.is_set():
+                        # Slot was handed over as we gave up; pass it on
+                        self._release(tenant)
+                    else:
+                        self._queues[priority].remove(waiter)
+                        state.queued -= 1
+                raise
+
+        queued = time.perf_counter() - enqueued
+        with self._lock:
+            self._scheduled[priority] += 1
+            self._queue_time[priority].record(queued)
+        if SCHEDULER_QUEUE_SECONDS:
+            SCHEDULER_QUEUE_SECONDS.record(
+                queued, {"scheduler": self.name, "priority": priority}
+            )
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release(tenant)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "classes": {
+                    priority: {
+                        "scheduled": self._scheduled[priority],
+                        "queued": len(self._queues[priority]),
+                        "queue_time_p50_s": self._queue_time[priority].percentile(50),
+                        "queue_time_p95_s": self._queue_time[priority].percentile(95),
+                    }
+                    for priority in PRIORITY_CLASSES
+                },
+                "tenants": {
+                    tenant: {"in_flight": state.in_flight, "queued": state.queued}
+                    for tenant, state in self._tenants.items()
+                },
+            }
+
+
+def add_request_class_middleware(
+    app, tenant_header: str = "X-Tenant-ID", priority_header: str = "X-Priority"
+):
+    """
+    Run each request of a FastAPI application in a `request_scope` taken
+    from its tenant and priority headers. An unknown priority is ignored.
+    """
+
+    @app.middleware("http")
+    async def request_class_middleware(request: Request, call_next):
+        priority = request.headers.get(priority_header)
+        if priority not in PRIORITY_CLASSES:
+            priority = None
+        with request_scope(request.headers.get(tenant_header), priority):
+            return await call_next(request)
+
+    return app
@@ -0,0 +1,50 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+from llm_server.core import logging
+from llm_server.core.types import PipelineEvent
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def format_sse(data: str, event: str | None = None) -> str:
+    """Format a single Server-Sent Event. Multi-line data is split per the spec."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+async def pipeline_events_to_sse(
+    events: AsyncIterator[PipelineEvent],
+) -> AsyncIterator[str]:
+    """
+    Serialize pipeline events as SSE messages. The event type becomes the SSE
+    `event:` name. A failure mid-stream is reported as an `error` event,
+    since the response status has already been sent.
+    """
+    try:
+        async for event in events:
+            yield format_sse(event.model_dump_json(), event=event.type.value)
+    except Exception as e:
+        logging.error(f"Pipeline stream failed: {type(e).__name__}: {e}")
+        payload: dict[str, Any] = {"error": type(e).__name__, "message": str(e)}
+        yield format_sse(json.dumps(payload), event="error")
+
+
+def sse_response(events: AsyncIterator[PipelineEvent]) -> StreamingResponse:
+    """
+    Wrap a pipeline event stream, such as `Pipeline.execute_stream(data)`, in
+    a FastAPI response that sends it as Server-Sent Events.
+    """
+    return StreamingResponse(
+        pipeline_events_to_sse(events),
+        media_type=SSE_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies such as nginx from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,52 @@
+import time
+from typing import Any
+
+import anyio
+from dspy.utils.dummies import DummyLM
+
+
+class StubLM(DummyLM):
+    """
+    A local stand-in for a provider model, for tests, health probes and
+    warm-up without network calls. Configure it with a `stub/` model name,
+    e.g. ``model_name: "stub/echo"``, and optionally `answers`.
+
+    `answers` maps a substring of the prompt to the output field values to
+    reply with; the default answers every prompt with ``output="ok"``. Each
+    call takes `latency` seconds, and raises `error` while it is set, to
+    simulate a slow or failing provider. A per-call `timeout` is accepted
+    like a provider LM's and ignored, since no connection is made.
+    """
+
+    def __init__(
+        self,
+        model: str = "stub/echo",
+        answers: dict[str, dict[str, Any]] | None = None,
+        latency: float = 0.0,
+        error: Exception | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(answers if answers is not None else {"": {"output": "ok"}})
+        self.model = model
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.kwargs.update(kwargs)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.pop("timeout", None)
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return super().__call__(*args, **kwargs)
+
+    async def acall(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.pop("timeout", None)
+        self.calls += 1
+        if self.latency:
+            await anyio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return await super().acall(*args, **kwargs)
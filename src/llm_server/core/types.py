@@ -1,3 +1,5 @@
+from collections import ChainMap
+from collections.abc import Mapping, MutableMapping
 from enum import Enum
 from typing import Any
 
@@ -16,12 +18,116 @@ class Usage(pydantic.BaseModel):
     completion_tokens: int = 0
 
 
+# Derived metadata chains longer than this are flattened into one dict, so
+# lookups stay cheap in long pipelines
+MAX_METADATA_LAYERS = 8
+
+_UNSET: Any = object()
+
+
 class PipelineData(pydantic.BaseModel):
-    """Container for data passing through pipeline steps"""
+    """
+    Container for data passing through pipeline steps.
+
+    Construct it normally (validated) at pipeline entry; steps should build
+    their output with `derive`, which skips re-validation and layers new
+    metadata over the input's instead of copying it.
+
+    `metadata` is then a ChainMap: reads see every layer, but writes and
+    deletes only reach the top one, so deleting a key set by an earlier
+    step raises KeyError. Use `dict(data.metadata)` for a flat copy.
+    """
 
     media_type: MediaType
     content: Any
-    metadata: dict[str, Any] = {}
+    metadata: MutableMapping[str, Any] = pydantic.Field(default_factory=dict)
+
+    @pydantic.field_serializer("metadata")
+    def _serialize_metadata(self, metadata: Mapping[str, Any]) -> dict[str, Any]:
+        # Derived metadata is a ChainMap; serialize it as the dict it stands for
+        return dict(metadata)
+
+    def derive(
+        self,
+        content: Any = _UNSET,
+        media_type: MediaType | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        **updates: Any,
+    ) -> "PipelineData":
+        """
+        Build the next step's data without re-validation.
+
+        `content` is passed by reference (large bytes are never copied) and
+        defaults to this object's. New metadata keys, from `metadata` and
+        `updates`, go into a fresh top layer over this object's metadata, so
+        nothing is copied and writes to the result's metadata do not leak
+        back into this object.
+        """
+        layer = {**metadata, **updates} if metadata else updates
+        parent = self.metadata
+        if not isinstance(parent, ChainMap):
+            chained = ChainMap(layer, parent)
+        elif len(parent.maps) < MAX_METADATA_LAYERS:
+            chained = parent.new_child(layer)
+        else:
+            # dict(ChainMap) looks every key up through the chain; merging
+            # the layers oldest-first is far cheaper
+            flat: dict[str, Any] = {}
+            for mapping in reversed(parent.maps):
+                flat.update(mapping)
+            chained = ChainMap(layer, flat)
+        return PipelineData._construct_trusted(
+            media_type or self.media_type,
+            self.content if content is _UNSET else content,
+            chained,
+        )
+
+    @classmethod
+    def _construct_trusted(
+        cls, media_type: MediaType, content: Any, metadata: Mapping[str, Any]
+    ) -> "PipelineData":
+        """
+        Fill BaseModel's slots directly. Equivalent to `model_construct` for
+        this model, at about half the cost, which matters once per step.
+        """
+        data = cls.__new__(cls)
+        object.__setattr__(
+            data,
+            "__dict__",
+            {"media_type": media_type, "content": content, "metadata": metadata},
+        )
+        object.__setattr__(data, "__pydantic_fields_set__", set(_ALL_FIELDS))
+        object.__setattr__(data, "__pydantic_extra__", None)
+        object.__setattr__(data, "__pydantic_private__", None)
+        return data
+
+
+class PipelineEventType(Enum):
+    STEP_STARTED = "step_started"
+    PARTIAL = "partial"
+    FIELD_COMPLETED = "field_completed"
+    STEP_COMPLETED = "step_completed"
+    FINAL = "final"
+
+
+class PipelineEvent(pydantic.BaseModel):
+    """An incremental event emitted while a pipeline executes in streaming mode"""
+
+    type: PipelineEventType
+    step: str | None = None
+    step_index: int | None = None
+    # For PARTIAL events: the output field being streamed and the new chunk
+    field: str | None = None
+    delta: Any = None
+    # For FIELD_COMPLETED events: where the completed value sits in the output
+    # (field name first, then keys/indices) and the parsed value
+    path: list[str | int] | None = None
+    value: Any = None
+    # For STEP_COMPLETED and FINAL events: the step's (or pipeline's) output
+    data: PipelineData | None = None
+
+
+_ALL_FIELDS = frozenset(PipelineData.model_fields)
 
 
 class ProgramMetadata(pydantic.BaseModel):
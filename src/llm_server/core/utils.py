@@ -1,9 +1,15 @@
 import datetime as dt
+import math
 import uuid
-from typing import Any
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, TypeVar
+
+import anyio
 
 from llm_server.core.types import ProgramMetadata
 
+T = TypeVar("T")
+
 
 def ensure_program_metadata_object(metadata: Any) -> ProgramMetadata | None:
     """
@@ -63,6 +69,46 @@ def format_timestamp(dt=None) -> str:
     return dt.isoformat()
 
 
+async def run_concurrently(
+    calls: Sequence[Callable[[], Awaitable[T]]], max_concurrency: int
+) -> list[T]:
+    """
+    Run async callables with at most `max_concurrency` in flight.
+
+    Results are returned in the order of `calls`. If any call fails, the
+    remaining calls are cancelled and the first exception is re-raised
+    as-is (rather than wrapped in an exception group).
+    """
+    results: list[Any] = [None] * len(calls)
+    errors: list[BaseException] = []
+    semaphore = anyio.Semaphore(max(1, max_concurrency))
+
+    async with anyio.create_task_group() as tg:
+
+        async def run(index: int, call: Callable[[], Awaitable[T]]) -> None:
+            async with semaphore:
+                try:
+                    results[index] = await call()
+                except Exception as e:
+                    errors.append(e)
+                    tg.cancel_scope.cancel()
+
+        for index, call in enumerate(calls):
+            tg.start_soon(run, index, call)
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (0-100) of an already sorted sequence; 0.0 if empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
 class MetadataCollector:
     """
     Helper class to enforce consistent metadata collection across all processors.
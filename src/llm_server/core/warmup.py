@@ -0,0 +1,208 @@
+import functools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import anyio
+import dspy
+from dspy.signatures.signature import Signature
+
+from llm_server.core import logging
+from llm_server.core.cancellation import run_sync_abandonable
+
+# Where each built-in provider is reached when a model sets no `api_base`
+DEFAULT_ORIGINS = {
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+}
+
+
+def _origin(lm: Any) -> str | None:
+    base = getattr(lm, "kwargs", {}).get("api_base")
+    if base:
+        parts = urlsplit(base)
+        return f"{parts.scheme}://{parts.netloc}"
+    return DEFAULT_ORIGINS.get(str(getattr(lm, "model", "")).split("/")[0])
+
+
+def warm_up_signature(signature: type[Signature]) -> float:
+    """
+    Build a predictor and its adapter prompt for `signature` once, so the
+    lazy imports and field-type schemas are ready before the first request.
+    """
+    start = time.perf_counter()
+    predictor = dspy.Predict(signature)
+    dspy.ChatAdapter().format_system_message(predictor.signature)
+    return time.perf_counter() - start
+
+
+def _uses_litellm(lm: Any) -> bool:
+    """
+    Whether calls to `lm` may go through LiteLLM: those of any dspy.LM on
+    a DSPy version without engines, or whose engine is "litellm" or "auto"
+    (which falls back to LiteLLM for what its native engine can't send).
+    """
+    if not isinstance(lm, dspy.LM):
+        return False
+    return getattr(lm, "engine", "litellm") in ("litellm", "auto")
+
+
+def _prepare(lm: Any) -> None:
+    """LiteLLM's lazy imports and model-info lookup, ahead of the first call"""
+    if not _uses_litellm(lm):
+        return
+    import litellm
+
+    try:
+        litellm.get_model_info(lm.model)
+    except Exception:
+        pass  # Models LiteLLM has no info for are served all the same
+
+
+async def _open_connection(http_pool: Any, origin: str, timeout: float) -> float:
+    """One request per client, so each holds a kept-alive connection to `origin`"""
+    start = time.perf_counter()
+    await run_sync_abandonable(
+        functools.partial(http_pool.client.head, origin, timeout=timeout), origin
+    )
+    await http_pool.async_client.head(origin, timeout=timeout)
+    return time.perf_counter() - start
+
+
+async def _warm_up_model(
+    lm: Any, completion: bool, prompt: str, timeout: float
+) -> dict[str, Any]:
+    timings: dict[str, Any] = {}
+    start = time.perf_counter()
+    await run_sync_abandonable(functools.partial(_prepare, lm), "warmup")
+    timings["prepare_s"] = time.perf_counter() - start
+    if completion:
+        start = time.perf_counter()
+        await run_sync_abandonable(
+            functools.partial(lm, prompt, max_tokens=1, cache=False, timeout=timeout),
+            "warmup",
+        )
+        timings["completion_s"] = time.perf_counter() - start
+    return timings
+
+
+async def warm_up(
+    model_manager: Any,
+    signatures: dict[str, type[Signature]] | None = None,
+    completion: bool = False,
+    model_ids: list[str] | None = None,
+    prompt: str = "Reply with OK.",
+    timeout: float = 30.0,
+) -> dict[str, Any]:
+    """
+    Warm every model concurrently and report how long each step took;
+    see `ModelManager.warmup`. Failures are reported, never raised, so a
+    slow or unavailable provider cannot block startup.
+    """
+    start = time.perf_counter()
+    if model_ids is None:
+        model_ids = [
+            model_id
+            for model_id, model_config in model_manager.model_configs.items()
+            if model_config.get("warmup", True)
+        ]
+    report: dict[str, Any] = {
+        "models": {model_id: {} for model_id in model_ids},
+        "connections": {},
+        "programs": {},
+    }
+
+    for name, signature in (signatures or {}).items():
+        try:
+            report["programs"][name] = warm_up_signature(signature)
+        except Exception as e:
+            logging.warning(f"Warm-up of program {name} failed: {e}")
+            report["programs"][name] = None
+
+    http_pool = getattr(model_manager.provider_manager, "http_pool", None)
+    origins = set()
+    if http_pool is not None:
+        origins = {_origin(model_manager.models[m]) for m in model_ids} - {None}
+
+    async def connect(origin: str) -> None:
+        try:
+            with anyio.fail_after(timeout):
+                report["connections"][origin] = await _open_connection(
+                    http_pool, origin, timeout
+                )
+        except Exception as e:
+            logging.warning(f"Warm-up connection to {origin} failed: {e}")
+            report["connections"][origin] = None
+
+    async def warm(model_id: str) -> None:
+        entry = report["models"][model_id]
+        model_start = time.perf_counter()
+        try:
+            with anyio.fail_after(timeout):
+                entry.update(
+                    await _warm_up_model(
+                        model_manager.models[model_id], completion, prompt, timeout
+                    )
+                )
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            logging.warning(f"Warm-up of {model_id} failed: {entry['error']}")
+        entry["seconds"] = time.perf_counter() - model_start
+
+    async with anyio.create_task_group() as tg:
+        for origin in origins:
+            tg.start_soon(connect, origin)
+        for model_id in model_ids:
+            tg.start_soon(warm, model_id)
+
+    report["seconds"] = time.perf_counter() - start
+    for model_id, entry in report["models"].items():
+        logging.info(f"Warmed up {model_id} in {entry['seconds']:.3f}s")
+    logging.info(
+        f"Warm-up of {len(model_ids)} models and {len(report['programs'])} "
+        f"programs took {report['seconds']:.3f}s"
+    )
+    return report
+
+
+@asynccontextmanager
+async def model_lifespan(
+    model_manager: Any,
+    program_manager: Any = None,
+    completion: bool = False,
+    timeout: float = 30.0,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Warms up the models (and the registered programs of `program_manager`)
+    before the application takes traffic, runs the background health
+    checks while it serves, and closes the shared HTTP pool on shutdown.
+    Yields the warm-up report. Use it inside a FastAPI lifespan::
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            async with model_lifespan(model_manager, program_manager) as report:
+                app.state.warmup = report
+                yield
+    """
+    signatures = {}
+    if program_manager is not None:
+        signatures = {
+            f"{program_id}/{version}": signature
+            for program_id, versions in program_manager.registry.programs.items()
+            for version, signature in versions.items()
+        }
+    report = await model_manager.warmup(
+        signatures=signatures, completion=completion, timeout=timeout
+    )
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(model_manager.run_health_checks)
+            yield report
+            tg.cancel_scope.cancel()
+    finally:
+        http_pool = getattr(model_manager.provider_manager, "http_pool", None)
+        if http_pool is not None:
+            await http_pool.aclose()
@@ -33,3 +33,6 @@ class YamlConfigProvider(ConfigProvider):
 
     def get_models(self) -> dict[str, Any]:
         return self.config.get("models", {})
+
+    def get_providers(self) -> dict[str, Any]:
+        return self.config.get("providers", {})
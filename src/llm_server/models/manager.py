@@ -1,7 +1,15 @@
+from typing import Any
+
 from llm_server.core import logging
+from llm_server.core.concurrency import AdaptiveLimiter
 from llm_server.core.config import FrameworkSettings
+from llm_server.core.health import HealthProber
 from llm_server.core.protocols import ConfigProvider
-from llm_server.core.providers import ProviderManager
+from llm_server.core.providers import ProviderConfig, ProviderManager
+from llm_server.core.rate_limit import RateLimiter
+from llm_server.core.routing import ModelRouter
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.warmup import warm_up
 
 
 class ModelManager:
@@ -10,23 +18,176 @@ class ModelManager:
         self.config_provider = config_provider
         self.config = self.config_provider.get_models()
         self.models = {}
-        self.provider_manager = ProviderManager(self.settings)
+        # The config behind each model, including pooled members
+        self.model_configs: dict[str, dict[str, Any]] = {}
+        self.runtimes: dict[str, ModelRuntime] = {}
+        # Logical groups of equivalent models, from each model's `group` key
+        self.groups: dict[str, list[str]] = {}
+        self.router = ModelRouter(settings.routing_strategy)
+        # Client-side rate limits from `rate_limits` blocks, per model and provider
+        get_providers = getattr(config_provider, "get_providers", None)
+        self.provider_config: dict[str, Any] = get_providers() if get_providers else {}
+        self.provider_limiters: dict[str, RateLimiter] = {}
+        self.model_limiters: dict[str, list[RateLimiter]] = {}
+        # Adaptive concurrency limits from `concurrency` blocks, per model
+        self.concurrency_limiters: dict[str, AdaptiveLimiter] = {}
+        self.provider_manager = ProviderManager(self.settings, self.provider_config)
         self._initialize_models()
+        # Models with `health_check: false` are never probed
+        self.health = HealthProber(
+            self,
+            interval=settings.health_check_interval,
+            model_ids=[
+                model_id
+                for model_id, model_config in self.model_configs.items()
+                if model_config.get("health_check", True)
+            ],
+        )
 
     def _initialize_models(self):
         for model_id, model_config in self.config.items():
-            try:
-                lm = self.provider_manager.initialize_model(
-                    model_config["model_name"], model_config
-                )
-                self.models[model_id] = lm
-                logging.info(f"Successfully initialized model: {model_id}")
-            except Exception as e:
-                logging.error(f"Failed to initialize model {model_id}: {str(e)}")
-                raise
+            pool = self.provider_manager.get_key_pool(model_config["model_name"])
+            if pool:
+                # One LM per pooled key/endpoint, routed as a group named
+                # after the model, e.g. "gpt-4o-mini" -> "gpt-4o-mini@org-2"
+                members = [
+                    self._add_model(f"{model_id}@{key.name}", model_config, key)
+                    for key in pool
+                ]
+                self.groups[model_id] = members
+            else:
+                members = [self._add_model(model_id, model_config)]
+            group = model_config.get("group")
+            if group:
+                self.groups.setdefault(group, []).extend(members)
+
+        for group, members in self.groups.items():
+            if group in self.models:
+                raise ValueError(f"Model group '{group}' clashes with a model id")
+            logging.info(f"Model group {group}: {', '.join(members)}")
+
+    def _add_model(
+        self,
+        model_id: str,
+        model_config: dict[str, Any],
+        key: ProviderConfig | None = None,
+    ) -> str:
+        try:
+            lm = self.provider_manager.initialize_model(
+                model_config["model_name"], model_config, key
+            )
+            self.models[model_id] = lm
+            self.model_configs[model_id] = model_config
+            logging.info(f"Successfully initialized model: {model_id}")
+        except Exception as e:
+            logging.error(f"Failed to initialize model {model_id}: {str(e)}")
+            raise
+        self.model_limiters[model_id] = self._build_limiters(
+            model_id, model_config, key
+        )
+        concurrency = AdaptiveLimiter.from_config(
+            model_id, model_config.get("concurrency")
+        )
+        if concurrency:
+            self.concurrency_limiters[model_id] = concurrency
+        return model_id
+
+    def _build_limiters(
+        self,
+        model_id: str,
+        model_config: dict[str, Any],
+        key: ProviderConfig | None = None,
+    ) -> list[RateLimiter]:
+        """
+        The model's own rate limiter, then the one shared by its provider,
+        or by its pooled key (whose own `rate_limits` take precedence)
+        """
+        limiters = []
+        limiter = RateLimiter.from_config(model_id, model_config.get("rate_limits"))
+        if limiter:
+            limiters.append(limiter)
+
+        provider = model_config["model_name"].split("/")[0]
+        limits = self.provider_config.get(provider, {}).get("rate_limits")
+        name = provider
+        if key is not None:
+            name = f"{provider}@{key.name}"
+            limits = key.rate_limits or limits
+        if name not in self.provider_limiters:
+            provider_limiter = RateLimiter.from_config(name, limits)
+            if provider_limiter:
+                self.provider_limiters[name] = provider_limiter
+        if name in self.provider_limiters:
+            limiters.append(self.provider_limiters[name])
+        return limiters
 
     def get_model(self, model_id: str):
         """Get a model instance directly without context manager"""
+        if model_id in self.groups:
+            model_id = self.select_model(model_id)
         if model_id not in self.models:
             raise ValueError(f"Model {model_id} not found")
         return self.models[model_id]
+
+    def get_runtime(self, model_id: str) -> ModelRuntime:
+        """Get the shared runtime state (breaker, latency) for a model"""
+        runtime = self.runtimes.get(model_id)
+        if runtime is None:
+            runtime = self.runtimes[model_id] = ModelRuntime(
+                model_id,
+                limiters=self.model_limiters.get(model_id, []),
+                concurrency=self.concurrency_limiters.get(model_id),
+            )
+        return runtime
+
+    def select_model(self, model_id: str, exclude: tuple[str, ...] = ()) -> str:
+        """
+        Resolve a model id or group name to the model to call next. Groups
+        are routed on live latency, load, errors and circuit state;
+        `exclude` skips members (e.g. the one a hedge duplicates) if others
+        remain.
+        """
+        members = self.groups.get(model_id)
+        if members is None:
+            return model_id
+        candidates = [m for m in members if m not in exclude] or members
+        return self.router.select([self.get_runtime(m) for m in candidates]).model_id
+
+    async def run_health_checks(self) -> None:
+        """
+        Probe every model in the background until cancelled, e.g. from a
+        task group in the application's lifespan. Returns at once if
+        LLM_HEALTH_CHECK_INTERVAL is 0.
+        """
+        if self.settings.health_check_interval <= 0:
+            return
+        await self.health.run()
+
+    async def warmup(
+        self,
+        signatures: dict[str, Any] | None = None,
+        completion: bool = False,
+        model_ids: list[str] | None = None,
+        timeout: float = 30.0,
+    ) -> dict[str, Any]:
+        """
+        Get every model (except those with `warmup: false`) ready to serve
+        at steady-state latency, concurrently: LiteLLM's lazy imports and
+        model info, kept-alive connections to each provider when the shared
+        HTTP pool is enabled, and, with `completion`, a one-token call. The
+        given signatures have their predictors and prompts built. Returns
+        the time each model, connection and signature took.
+        """
+        return await warm_up(
+            self,
+            signatures=signatures,
+            completion=completion,
+            model_ids=model_ids,
+            timeout=timeout,
+        )
+
+    def get_routing_stats(self, group: str) -> dict[str, Any]:
+        """Live routing signals for each member of a model group"""
+        if group not in self.groups:
+            raise ValueError(f"Model group {group} not found")
+        return {m: self.get_runtime(m).get_stats() for m in self.groups[group]}
@@ -1,12 +1,14 @@
 import asyncio
 import uuid
 from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import Any
 
 import dspy
 from dspy.signatures.signature import Signature
 
 from llm_server.core import logging
+from llm_server.core.admission import AdmissionController
 from llm_server.core.program_registry import ProgramRegistry
 from llm_server.core.protocols import StorageAdapter
 from llm_server.core.types import ProgramExecutionInfo, ProgramMetadata
@@ -18,7 +20,12 @@ class ProgramManager:
     Manager for DSPy programs, handling registration, execution tracking, and versioning.
     """
 
-    def __init__(self, model_manager, storage_adapter: StorageAdapter):
+    def __init__(
+        self,
+        model_manager,
+        storage_adapter: StorageAdapter,
+        admission: AdmissionController | None = None,
+    ):
         """
         Initializes the ProgramManager.
 
@@ -26,12 +33,20 @@ class ProgramManager:
             model_manager: An instance of the ModelManager.
             storage_adapter: A concrete implementation of the StorageAdapter protocol
                              that defines how and where program metadata is stored.
+            admission: Optional admission controller; executions are admitted
+                       per model id and rejected with OverloadedError at capacity.
         """
         self.model_manager = model_manager
+        self.admission = admission
         self.registry = ProgramRegistry(storage_adapter)
         self.executions: list[ProgramExecutionInfo] = []
         self.model_info = self._extract_model_info()
 
+    def _admitted(self, model_id: str) -> AbstractAsyncContextManager[None]:
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(model_id)
+
     def _extract_model_info(self) -> dict[str, dict[str, str]]:
         model_info = {}
         try:
@@ -116,61 +131,66 @@ class ProgramManager:
         if preprocessor and "image" in input_data:
             input_data["image"] = preprocessor(input_data["image"])
 
-        try:
-            # Create predictor and execute using the LM from dspy.context()
-            predictor = dspy.Predict(program_class)
-            result = await asyncio.to_thread(predictor, **input_data)
-
-            # Extract raw completion text from the current LM context
-            raw_completion_text = None
-            logging.info("Attempting to extract raw completion from LM history...")
+        # Shed load before doing any work, outside the error logging below
+        async with self._admitted(model_id):
             try:
-                # Get the current LM from DSPy's context
-                current_lm = dspy.settings.lm
-                if hasattr(current_lm, "history") and current_lm.history:
-                    last_interaction = current_lm.history[-1]
-
-                    # Robustly check for the raw completion in multiple possible locations
-                    if (
-                        "response" in last_interaction
-                        and "choices" in last_interaction["response"]
-                        and last_interaction["response"]["choices"]
-                    ):
-                        raw_completion_text = last_interaction["response"]["choices"][
-                            0
-                        ].get("text")
-                        logging.info(
-                            "SUCCESS: Extracted raw completion from history['response']['choices']."
-                        )
-                    elif "outputs" in last_interaction and last_interaction["outputs"]:
-                        raw_completion_text = last_interaction["outputs"][0]
-                        logging.info(
-                            "SUCCESS: Extracted raw completion from history['outputs']."
-                        )
+                # Create predictor and execute using the LM from dspy.context()
+                predictor = dspy.Predict(program_class)
+                result = await asyncio.to_thread(predictor, **input_data)
+
+                # Extract raw completion text from the current LM context
+                raw_completion_text = None
+                logging.info("Attempting to extract raw completion from LM history...")
+                try:
+                    # Get the current LM from DSPy's context
+                    current_lm = dspy.settings.lm
+                    if hasattr(current_lm, "history") and current_lm.history:
+                        last_interaction = current_lm.history[-1]
+
+                        # Robustly check for the raw completion in multiple possible locations
+                        if (
+                            "response" in last_interaction
+                            and "choices" in last_interaction["response"]
+                            and last_interaction["response"]["choices"]
+                        ):
+                            raw_completion_text = last_interaction["response"][
+                                "choices"
+                            ][0].get("text")
+                            logging.info(
+                                "SUCCESS: Extracted raw completion from history['response']['choices']."
+                            )
+                        elif (
+                            "outputs" in last_interaction
+                            and last_interaction["outputs"]
+                        ):
+                            raw_completion_text = last_interaction["outputs"][0]
+                            logging.info(
+                                "SUCCESS: Extracted raw completion from history['outputs']."
+                            )
+                        else:
+                            logging.warning(
+                                "History entry found, but a known key for raw output ('response' or 'outputs') is missing or empty."
+                            )
                     else:
                         logging.warning(
-                            "History entry found, but a known key for raw output ('response' or 'outputs') is missing or empty."
+                            "LM history is missing or empty. Cannot extract raw completion."
                         )
-                else:
-                    logging.warning(
-                        "LM history is missing or empty. Cannot extract raw completion."
+
+                except Exception as e:
+                    logging.error(
+                        f"ProgramManager failed to extract raw completion text: {e}",
+                        exc_info=True,
                     )
 
+                self.executions.append(execution_info)
+                return result, execution_info, raw_completion_text
+
             except Exception as e:
                 logging.error(
-                    f"ProgramManager failed to extract raw completion text: {e}",
+                    f"Error executing program {program_id}/{program_version}: {e}",
                     exc_info=True,
                 )
-
-            self.executions.append(execution_info)
-            return result, execution_info, raw_completion_text
-
-        except Exception as e:
-            logging.error(
-                f"Error executing program {program_id}/{program_version}: {e}",
-                exc_info=True,
-            )
-            raise
+                raise
 
     def get_execution_history(
         self,
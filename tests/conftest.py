@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture
+def litellm_calls(monkeypatch):
+    """Patch `litellm.completion` and record the kwargs of every call to it."""
+    monkeypatch.setenv("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    import litellm
+
+    calls: list[dict] = []
+
+    def completion(**kwargs):
+        calls.append(kwargs)
+        return litellm.ModelResponse(
+            model=kwargs["model"],
+            choices=[
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "OK"},
+                    "finish_reason": "stop",
+                }
+            ],
+            usage={"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+        )
+
+    monkeypatch.setattr(litellm, "completion", completion)
+    return calls
@@ -0,0 +1,133 @@
+import time
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from llm_server.core import (
+    AdmissionController,
+    OverloadedError,
+    Pipeline,
+    add_admission_handler,
+)
+from llm_server.core.types import MediaType, PipelineData
+
+
+class SlowStep:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await anyio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return data
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+@pytest.mark.anyio
+async def test_full_queue_is_rejected_immediately():
+    controller = AdmissionController(max_in_flight=1, max_queue=1)
+    outcomes: list[str] = []
+
+    async def request():
+        try:
+            async with controller.admit("m"):
+                await anyio.sleep(0.2)
+            outcomes.append("ok")
+        except OverloadedError as e:
+            assert e.retry_after >= 1
+            outcomes.append("rejected")
+
+    start = time.monotonic()
+    async with anyio.create_task_group() as tg:
+        for _ in range(3):
+            tg.start_soon(request)
+            await anyio.sleep(0.01)
+
+    assert sorted(outcomes) == ["ok", "ok", "rejected"]
+    assert outcomes[0] == "rejected"  # Shed at once, not after queueing
+    assert time.monotonic() - start < 1
+    stats = controller.get_stats()["m"]
+    assert stats["admitted"] == 2
+    assert stats["rejected_queue_full"] == 1
+
+
+@pytest.mark.anyio
+async def test_queue_timeout_rejects_waiting_requests():
+    controller = AdmissionController(max_in_flight=1, queue_timeout=0.1)
+
+    async def hold():
+        async with controller.admit():
+            await anyio.sleep(1)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(hold)
+        await anyio.sleep(0.01)
+        start = time.monotonic()
+        with pytest.raises(OverloadedError, match="queue timeout"):
+            async with controller.admit():
+                pass
+        assert time.monotonic() - start < 0.5
+        tg.cancel_scope.cancel()
+
+    assert controller.get_stats()["default"]["rejected_queue_timeout"] == 1
+
+
+@pytest.mark.anyio
+async def test_pipeline_bounds_in_flight_executions():
+    step = SlowStep(0.05)
+    pipeline = Pipeline([step], admission=AdmissionController(max_in_flight=2))
+    data = PipelineData(media_type=MediaType.TEXT, content="x")
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(pipeline.execute, data)
+
+    assert step.max_running == 2
+
+
+def test_overloaded_error_maps_to_503_with_retry_after():
+    app = add_admission_handler(FastAPI())
+
+    @app.get("/v1/predict")
+    async def predict():
+        raise OverloadedError("busy", retry_after=2.5)
+
+    with TestClient(app) as client:
+        response = client.get("/v1/predict")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert response.json() == {"detail": "busy"}
+
+
+@pytest.mark.anyio
+async def test_a_batch_is_admitted_once():
+    step = SlowStep(0.1)
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+    pipeline = Pipeline([step], admission=controller)
+    items = [PipelineData(media_type=MediaType.TEXT, content=i) for i in range(4)]
+
+    # More concurrent items than admission slots: none of them is shed
+    results = await pipeline.execute_many(items, concurrency=4)
+
+    assert [r.content for r in results] == [0, 1, 2, 3]
+    assert step.max_running == 4
+    assert controller.get_stats()["pipeline"]["admitted"] == 1
+
+    # While the batch holds the slot, other executions are shed
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(pipeline.execute_many, items)
+        await anyio.sleep(0.05)
+        with pytest.raises(OverloadedError):
+            await pipeline.execute(items[0])
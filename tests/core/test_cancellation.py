@@ -0,0 +1,136 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import ModelProcessor, Pipeline
+from llm_server.core.cancellation import (
+    CancelOnDisconnectMiddleware,
+    get_cancellation_stats,
+    run_sync_abandonable,
+)
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.types import MediaType, PipelineData
+from tests.fakes import StaticModelManager
+
+
+@pytest.mark.anyio
+async def test_cancelled_thread_call_is_abandoned_and_accounted():
+    release = threading.Event()
+    before = get_cancellation_stats()
+
+    with anyio.move_on_after(0.1):
+        await run_sync_abandonable(lambda: release.wait(5), "slow-model")
+
+    during = get_cancellation_stats()
+    assert during["cancelled_model_calls"] == before["cancelled_model_calls"] + 1
+    assert (
+        during["abandoned_threads_running"] == before["abandoned_threads_running"] + 1
+    )
+
+    release.set()
+    for _ in range(100):
+        if (
+            get_cancellation_stats()["abandoned_threads_running"]
+            == before["abandoned_threads_running"]
+        ):
+            break
+        await anyio.sleep(0.01)
+    assert (
+        get_cancellation_stats()["abandoned_threads_running"]
+        == before["abandoned_threads_running"]
+    )
+
+
+@pytest.mark.anyio
+async def test_disconnect_cancels_pipeline():
+    started = anyio.Event()
+    finished = False
+
+    class SlowStep:
+        accepted_media_types = [MediaType.TEXT]
+
+        async def process(self, data: PipelineData) -> PipelineData:
+            nonlocal finished
+            started.set()
+            await anyio.sleep(5)
+            finished = True
+            return data
+
+    async def app(scope, receive, send):
+        await receive()  # request body
+        await Pipeline([SlowStep()]).execute(
+            PipelineData(media_type=MediaType.TEXT, content="x")
+        )
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await started.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise AssertionError("no response should be sent")
+
+    before = get_cancellation_stats()["cancelled_requests"]
+    middleware = CancelOnDisconnectMiddleware(app)
+
+    with anyio.fail_after(2):
+        await middleware({"type": "http", "path": "/v1/pipeline/run"}, receive, send)
+
+    assert not finished
+    assert get_cancellation_stats()["cancelled_requests"] == before + 1
+
+
+@pytest.mark.anyio
+async def test_middleware_passes_app_errors_through():
+    async def app(scope, receive, send):
+        raise ValueError("bad request")
+
+    async def receive():
+        await anyio.sleep(5)
+
+    middleware = CancelOnDisconnectMiddleware(app)
+    with pytest.raises(ValueError, match="bad request"):
+        await middleware({"type": "http", "path": "/v1/predict"}, receive, None)
+
+
+@pytest.mark.anyio
+async def test_async_model_call_is_aborted_on_cancel(monkeypatch):
+    aborted = False
+
+    async def slow_acall(**kwargs):
+        nonlocal aborted
+        try:
+            await anyio.sleep(5)
+        except anyio.get_cancelled_exc_class():
+            aborted = True
+            raise
+
+    predictor = MagicMock()
+    predictor.acall = slow_acall
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(lm=MagicMock(spec=dspy.LM)),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        async_calls=True,
+    )
+    before = get_cancellation_stats()["cancelled_model_calls"]
+
+    start = time.monotonic()
+    with anyio.move_on_after(0.1):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="x"))
+
+    assert time.monotonic() - start < 1
+    assert aborted
+    assert get_cancellation_stats()["cancelled_model_calls"] == before + 1
@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock
+
+import dspy
+import pytest
+
+from llm_server.core import CascadeProcessor, FallbackPolicy, min_confidence
+from llm_server.core.circuit_breaker import CircuitOpenError
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.types import MediaType, PipelineData
+from tests.fakes import StaticModelManager
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Per-model predictions, keyed by the LM's model name."""
+    answers: dict[str, dict] = {}
+    calls: list[str] = []
+
+    async def acall(**kwargs):
+        model = dspy.settings.lm.model
+        calls.append(model)
+        answer = answers[model]
+        if isinstance(answer, Exception):
+            raise answer
+        usage = {model: {"prompt_tokens": 10, "completion_tokens": 2}}
+        return MagicMock(**answer, **{"get_lm_usage.return_value": usage})
+
+    predictor = MagicMock()
+    predictor.acall = acall
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    answers["calls"] = calls
+    return answers
+
+
+def make_cascade(**kwargs):
+    tiers = ["small", "medium", "large"]
+    return CascadeProcessor(
+        StaticModelManager(models={tier: MagicMock(model=tier) for tier in tiers}),
+        tiers=tiers,
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        async_calls=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.anyio
+async def test_cascade_stops_at_first_accepted_tier(answers):
+    answers["small"] = {"output": "unsure", "confidence": 0.3}
+    answers["medium"] = {"output": "sure", "confidence": 0.9}
+    cascade = make_cascade(accept=min_confidence(0.8))
+
+    result = await cascade.process(PipelineData(media_type=MediaType.TEXT, content="q"))
+
+    assert result.content == "sure"
+    assert answers["calls"] == ["small", "medium"]
+    record = result.metadata["cascade"]
+    assert record["tier"] == 1
+    assert record["model_id"] == "medium"
+    assert [a["accepted"] for a in record["attempts"]] == [False, True]
+    assert result.metadata["usage"].prompt_tokens == 20
+    assert cascade.stats["answered_by_tier"] == [0, 1, 0]
+
+
+@pytest.mark.anyio
+async def test_cascade_escalates_on_invalid_output_and_keeps_last_answer(answers):
+    answers["small"] = {"output": "a"}
+    answers["medium"] = {"output": "b"}
+    answers["large"] = {"output": "c"}
+
+    def accept(prediction, output):
+        if output == "a":
+            raise ValueError("does not match schema")
+        return False
+
+    result = await make_cascade(accept=accept).process(
+        PipelineData(media_type=MediaType.TEXT, content="q")
+    )
+
+    # Nothing accepted: the last tier answers anyway
+    assert result.content == "c"
+    assert result.metadata["cascade"]["tier"] == 2
+    assert answers["calls"] == ["small", "medium", "large"]
+
+
+@pytest.mark.anyio
+async def test_cascade_fans_out_per_item(answers):
+    answers["small"] = {"output": "ok", "confidence": 1.0}
+
+    result = await make_cascade(accept=min_confidence(0.5)).process(
+        PipelineData(media_type=MediaType.TEXT, content=["a", "b"])
+    )
+
+    assert result.content == ["ok", "ok"]
+    assert [r["tier"] for r in result.metadata["cascade"]] == [0, 0]
+
+
+@pytest.mark.anyio
+async def test_cascade_honors_its_fallback_policy(answers):
+    answers["small"] = CircuitOpenError("small is down")
+    cascade = make_cascade(
+        accept=min_confidence(0.8),
+        fallback=FallbackPolicy(
+            fallback_fn=lambda inputs: MagicMock(output="canned", confidence=1.0)
+        ),
+    )
+
+    result = await cascade.process(PipelineData(media_type=MediaType.TEXT, content="q"))
+
+    assert result.content == "canned"
+    assert result.metadata["degraded"]["reason"] == "circuit_open"
+    assert result.metadata["cascade"]["model_id"] is None
+    assert result.metadata["usage"].prompt_tokens == 0
+
+
+def test_cascade_needs_tiers():
+    with pytest.raises(ValueError, match="at least one"):
+        CascadeProcessor(StaticModelManager(), tiers=[], accept=min_confidence(0.5))
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import anyio
+import pytest
+
+from llm_server.core.circuit_breaker import CircuitBreaker, CircuitOpenError, State
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_are_not_serialized():
+    breaker = CircuitBreaker()
+    in_flight = 0
+    peak = 0
+
+    @breaker
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await anyio.sleep(0.01)
+        in_flight -= 1
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(call)
+
+    assert peak == 5
+    assert breaker.get_metrics()["successful_calls"] == 5
+
+
+@pytest.mark.anyio
+async def test_breaker_opens_and_recovers_with_single_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    @breaker
+    async def failing():
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await failing()
+    assert breaker.state == State.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await failing()
+    assert exc_info.value.retry_after > 0
+
+    # Pretend the reset timeout has elapsed; only one trial call is admitted
+    breaker.last_failure_time = datetime.now() - timedelta(seconds=61)
+    release = anyio.Event()
+    blocked: list[BaseException] = []
+
+    @breaker
+    async def trial():
+        await release.wait()
+
+    async def second_call():
+        try:
+            await trial()
+        except CircuitOpenError as e:
+            blocked.append(e)
+        release.set()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(trial)
+        await anyio.sleep(0)
+        tg.start_soon(second_call)
+
+    assert len(blocked) == 1
+    assert breaker.state == State.CLOSED
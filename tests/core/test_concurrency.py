@@ -0,0 +1,122 @@
+import anyio
+import pytest
+
+from llm_server.core import AdaptiveLimiter
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.deadline import DeadlineExceededError, deadline_scope
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, ProviderError
+
+
+async def hold(limiter: AdaptiveLimiter, delay: float = 0.0) -> None:
+    async with limiter.acquire():
+        await anyio.sleep(delay)
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter("m", algorithm="vegas")
+
+
+def test_from_config():
+    assert AdaptiveLimiter.from_config("m", None) is None
+    limiter = AdaptiveLimiter.from_config(
+        "m", {"algorithm": "aimd", "initial": 4, "min": 2, "max": 10}
+    )
+    assert limiter is not None
+    assert (limiter.algorithm, limiter.limit) == ("aimd", 4)
+    assert (limiter.min_limit, limiter.max_limit) == (2, 10)
+
+
+@pytest.mark.anyio
+async def test_calls_beyond_the_limit_wait_for_a_slot():
+    limiter = AdaptiveLimiter("m", algorithm="aimd", initial_limit=2, max_limit=2)
+    running = 0
+    max_running = 0
+
+    async def call():
+        nonlocal running, max_running
+        async with limiter.acquire():
+            running += 1
+            max_running = max(max_running, running)
+            await anyio.sleep(0.02)
+            running -= 1
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(call)
+
+    assert max_running == 2
+    stats = limiter.get_stats()
+    assert stats["waited"] == 4
+    assert (stats["in_flight"], stats["queued"]) == (0, 0)
+
+
+@pytest.mark.anyio
+async def test_waiting_respects_the_deadline():
+    limiter = AdaptiveLimiter("m", initial_limit=1)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(hold, limiter, 0.2)
+        await anyio.sleep(0.01)
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+            await hold(limiter)
+        assert limiter.get_stats()["queued"] == 0
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_aimd_grows_under_load_and_backs_off_on_overload():
+    limiter = AdaptiveLimiter(
+        "m", algorithm="aimd", initial_limit=2, max_limit=4, backoff_ratio=0.5
+    )
+    async with anyio.create_task_group() as tg:
+        for _ in range(8):
+            tg.start_soon(hold, limiter, 0.01)
+    assert limiter.limit == 4
+
+    with pytest.raises(ProviderError):
+        async with limiter.acquire():
+            raise ProviderError(503)
+    assert limiter.limit == 2
+
+    # Client errors say nothing about load
+    with pytest.raises(ProviderError):
+        async with limiter.acquire():
+            raise ProviderError(400)
+    assert limiter.limit == 2
+    assert limiter.get_stats()["drops"] == 1
+
+
+@pytest.mark.anyio
+async def test_gradient_shrinks_when_latency_inflates():
+    limiter = AdaptiveLimiter("m", initial_limit=20, min_limit=2, smoothing=0.5)
+    for _ in range(5):
+        await hold(limiter, 0.01)
+    assert limiter.limit == 20  # Idle: no reason to grow or shrink
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(20):
+            tg.start_soon(hold, limiter, 0.1)
+    assert limiter.limit < 20
+    assert limiter.recent_rtt > limiter.baseline_rtt
+
+
+@pytest.mark.anyio
+async def test_gradient_grows_while_latency_holds():
+    limiter = AdaptiveLimiter("m", initial_limit=4, max_limit=64)
+    async with anyio.create_task_group() as tg:
+        for _ in range(40):
+            tg.start_soon(hold, limiter, 0.01)
+    assert limiter.limit > 4
+
+
+def test_manager_gives_each_configured_model_its_own_limiter():
+    models = {
+        "a": {"model_name": "openai/gpt-4o-mini", "concurrency": {"initial": 3}},
+        "b": {"model_name": "openai/gpt-4o"},
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+    runtime = manager.get_runtime("a")
+    assert runtime.concurrency is not None
+    assert runtime.get_stats()["concurrency"]["limit"] == 3
+    assert manager.get_runtime("b").concurrency is None
@@ -0,0 +1,172 @@
+import time
+from unittest.mock import MagicMock
+
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import (
+    DAGPipeline,
+    DeadlineExceededError,
+    LatencyTracker,
+    ModelProcessor,
+    Pipeline,
+    PipelineNode,
+    deadline_scope,
+    remaining_time,
+)
+from llm_server.core.circuit_breaker import State
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.types import MediaType, PipelineData
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, StaticModelManager
+
+
+class TimedStep:
+    def __init__(self, delay: float = 0.0, expected_latency: float | None = None):
+        self.delay = delay
+        self.expected_latency = expected_latency
+        self.calls = 0
+        self.budgets: list[float | None] = []
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        self.calls += 1
+        self.budgets.append(remaining_time())
+        await anyio.sleep(self.delay)
+        return data
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+@pytest.fixture
+def text_data():
+    return PipelineData(media_type=MediaType.TEXT, content="hello")
+
+
+def test_nested_deadline_only_tightens():
+    assert remaining_time() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining_time() <= 10
+        with deadline_scope(1):
+            assert remaining_time() <= 1
+    assert remaining_time() is None
+
+
+@pytest.mark.anyio
+async def test_slow_step_is_cancelled_at_deadline(text_data):
+    slow = TimedStep(delay=5)
+    after = TimedStep()
+    pipeline = Pipeline([TimedStep(), slow, after])
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        await pipeline.execute(text_data, timeout=0.2)
+
+    assert time.monotonic() - start < 1
+    assert after.calls == 0
+
+
+@pytest.mark.anyio
+async def test_fail_fast_when_budget_cannot_cover_expected_latency(text_data):
+    first = TimedStep()
+    expensive = TimedStep(expected_latency=2.0)
+    pipeline = Pipeline([first, expensive])
+
+    with pytest.raises(DeadlineExceededError, match="typically takes"):
+        await pipeline.execute(text_data, timeout=1.0)
+
+    # Reserving time for the expensive step stops the pipeline before it starts
+    assert first.calls == 0
+    assert expensive.calls == 0
+
+
+@pytest.mark.anyio
+async def test_dag_nodes_reserve_time_for_their_downstream_path(text_data):
+    root = TimedStep(delay=0.2)
+    pipeline = DAGPipeline(
+        [
+            PipelineNode("root", root),
+            PipelineNode("fast", TimedStep(), depends_on=["root"]),
+            PipelineNode("slow", TimedStep(expected_latency=0.5), depends_on=["root"]),
+        ]
+    )
+    await pipeline.execute(text_data, timeout=2.0)
+
+    # The root may not eat into the 0.5s reserved for the slow branch
+    with pytest.raises(DeadlineExceededError, match="node root did not finish"):
+        await pipeline.execute(text_data, timeout=0.6)
+
+
+@pytest.mark.anyio
+async def test_model_processor_uses_remaining_budget_as_provider_timeout(
+    text_data, monkeypatch
+):
+    predictor = MagicMock(return_value=MagicMock(output="ok"))
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    lm = MagicMock(spec=dspy.LM)
+    lm.kwargs = {"timeout": 60}
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(lm=lm),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+
+    await Pipeline([processor]).execute(text_data, timeout=5)
+    timeout = predictor.call_args.kwargs["config"]["timeout"]
+    assert 4 < timeout <= 5
+
+    with deadline_scope(120):
+        await processor.process(text_data)
+    assert predictor.call_args.kwargs["config"]["timeout"] == 60
+
+    # A blocking call that outlives the deadline is abandoned, not waited on
+    predictor.side_effect = lambda **kwargs: time.sleep(1)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        await Pipeline([processor]).execute(text_data, timeout=0.1)
+    assert time.monotonic() - start < 0.8
+
+
+@pytest.mark.anyio
+async def test_deadline_expiries_are_not_model_failures(text_data):
+    models = {"slow": {"model_name": "stub/echo", "latency": 0.3}}
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+    processor = ModelProcessor(
+        model_manager=manager,
+        model_id="slow",
+        signature_class=dspy.Signature("input -> output"),
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+
+    # A client with a tight timeout must not shut the model off for others
+    for _ in range(11):
+        with pytest.raises(DeadlineExceededError), deadline_scope(0.05):
+            await processor.process(text_data)
+
+    runtime = manager.get_runtime("slow")
+    assert runtime.breaker.state == State.CLOSED
+    assert runtime.error_rate == 0
+    assert (await processor.process(text_data)).content == "ok"
+
+
+def test_latency_tracker():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(1.0)
+    tracker.record(1.0)
+    assert tracker.expected() is None
+    tracker.record(2.0)
+
+    assert tracker.expected() == pytest.approx(1.2)
+    assert tracker.percentile(50) == 1.0
+    assert tracker.percentile(99) == 2.0
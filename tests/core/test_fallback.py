@@ -0,0 +1,201 @@
+import time
+from unittest.mock import MagicMock
+
+import dspy
+import pytest
+
+from llm_server.core import FallbackPolicy, ModelProcessor, Pipeline, deadline_scope
+from llm_server.core.circuit_breaker import CircuitOpenError
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import MediaType, PipelineData, PipelineEventType
+from tests.fakes import ProviderError, StaticModelManager
+
+
+def make_processor(model_manager, fallback: FallbackPolicy) -> ModelProcessor:
+    return ModelProcessor(
+        model_manager=model_manager,
+        model_id="primary",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        fallback=fallback,
+    )
+
+
+@pytest.fixture
+def runtimes():
+    runtimes = {m: ModelRuntime(m) for m in ("primary", "backup")}
+    runtimes["primary"].breaker.failure_threshold = 1
+    return runtimes
+
+
+@pytest.fixture
+def model_manager(runtimes):
+    return StaticModelManager(lm=MagicMock(spec=dspy.LM), runtimes=runtimes)
+
+
+def text(content: str) -> PipelineData:
+    return PipelineData(media_type=MediaType.TEXT, content=content)
+
+
+def patch_predictor(monkeypatch, *results) -> MagicMock:
+    predictor = MagicMock(side_effect=list(results))
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    return predictor
+
+
+@pytest.mark.anyio
+async def test_open_circuit_serves_a_stale_response(monkeypatch, model_manager):
+    patch_predictor(monkeypatch, MagicMock(output="fresh"), ProviderError())
+    policy = FallbackPolicy(max_staleness=60)
+    processor = make_processor(model_manager, policy)
+
+    assert (await processor.process(text("hi"))).content == "fresh"
+    with pytest.raises(ProviderError):  # Opens the circuit
+        await processor.process(text("hi"))
+
+    result = await processor.process(text("hi"))
+    assert result.content == "fresh"
+    degraded = result.metadata["degraded"]
+    assert (degraded["reason"], degraded["source"]) == ("circuit_open", "stale")
+    assert result.metadata["served_by"] is None
+
+    # Nothing remembered for other inputs, and no other fallback configured
+    with pytest.raises(CircuitOpenError):
+        await processor.process(text("other"))
+    assert policy.get_stats()["unavailable"] == 1
+
+
+@pytest.mark.anyio
+async def test_open_circuit_routes_to_the_fallback_model(
+    monkeypatch, model_manager, runtimes
+):
+    predictor = patch_predictor(
+        monkeypatch, ProviderError(), MagicMock(output="from backup")
+    )
+    policy = FallbackPolicy(fallback_model_id="backup")
+    processor = make_processor(model_manager, policy)
+    with pytest.raises(ProviderError):
+        await processor.process(text("hi"))
+
+    result = await processor.process(text("hi"))
+
+    assert result.content == "from backup"
+    assert result.metadata["served_by"] == "backup"
+    assert result.metadata["degraded"]["source"] == "fallback_model"
+    assert predictor.call_count == 2
+    assert runtimes["backup"].breaker.metrics["successful_calls"] == 1
+
+
+@pytest.mark.anyio
+async def test_blown_deadline_runs_the_fallback_function(monkeypatch, model_manager):
+    def slow(**kwargs):
+        time.sleep(0.3)
+        return MagicMock(output="late")
+
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=slow))
+    policy = FallbackPolicy(
+        fallback_model_id="backup",
+        fallback_fn=lambda inputs: MagicMock(
+            output=f"canned reply to {inputs['input']}"
+        ),
+    )
+    processor = make_processor(model_manager, policy)
+
+    with deadline_scope(0.05):
+        result = await processor.process(text("hi"))
+
+    assert result.content == "canned reply to hi"
+    assert result.metadata["degraded"] == {
+        "reason": "deadline_exceeded",
+        "source": "fallback_function",
+    }
+    stats = policy.get_stats()
+    assert (stats["fallback_model"], stats["fallback_function"]) == (0, 1)
+
+
+class PassThrough:
+    expected_latency = 0.05
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        return data
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("later_steps", [0, 1])
+async def test_pipeline_deadline_reaches_the_fallback(
+    monkeypatch, model_manager, runtimes, later_steps
+):
+    def slow(**kwargs):
+        time.sleep(0.5)
+        return MagicMock(output="late")
+
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=slow))
+    processor = make_processor(
+        model_manager,
+        FallbackPolicy(fallback_fn=lambda inputs: MagicMock(output="canned")),
+    )
+    pipeline = Pipeline([processor] + [PassThrough()] * later_steps)
+
+    start = time.monotonic()
+    result = await pipeline.execute(text("hi"), timeout=0.2)
+
+    assert result.content == "canned"
+    assert result.metadata["degraded"]["reason"] == "deadline_exceeded"
+    assert time.monotonic() - start < 0.2
+
+    # A model too slow for the budget is not even tried
+    for _ in range(5):
+        runtimes["primary"].latency.record(1.0)
+    result = await pipeline.execute(text("hi"), timeout=0.2)
+    assert result.metadata["degraded"]["source"] == "fallback_function"
+
+
+@pytest.mark.anyio
+async def test_other_errors_are_not_masked(monkeypatch, model_manager):
+    patch_predictor(monkeypatch, ValueError("bad input"))
+    processor = make_processor(
+        model_manager, FallbackPolicy(fallback_fn=lambda inputs: "canned")
+    )
+    with pytest.raises(ValueError):
+        await processor.process(text("hi"))
+
+
+def test_stale_responses_expire(monkeypatch):
+    policy = FallbackPolicy(max_staleness=10, max_entries=1)
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    policy.remember("m", {"input": "a"}, "answer a")
+    policy.remember("m", {"input": "b"}, "answer b")
+
+    assert policy._stale("m", {"input": "a"}) == (None, 0.0)  # Evicted
+    now[0] = 105.0
+    assert policy._stale("m", {"input": "b"}) == ("answer b", 5.0)
+    now[0] = 111.0
+    assert policy._stale("m", {"input": "b"}) == (None, 0.0)
+
+
+@pytest.mark.anyio
+async def test_stream_falls_back_before_any_output(
+    monkeypatch, model_manager, runtimes
+):
+    patch_predictor(monkeypatch)
+    runtimes["primary"].breaker._handle_failure(ProviderError())
+    processor = make_processor(
+        model_manager,
+        FallbackPolicy(fallback_fn=lambda inputs: MagicMock(output="canned")),
+    )
+
+    events = [event async for event in processor.process_stream(text("hi"))]
+
+    assert [event.type for event in events] == [PipelineEventType.STEP_COMPLETED]
+    output = events[0].data
+    assert output.content == "canned"
+    assert output.metadata["degraded"]["reason"] == "circuit_open"
@@ -0,0 +1,147 @@
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import FairScheduler, HealthProber, ModelProcessor, StubLM
+from llm_server.core.circuit_breaker import State
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.types import MediaType, PipelineData
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, ProviderError
+
+
+@pytest.fixture
+def manager():
+    models = {
+        "a": {"model_name": "stub/a", "group": "pool"},
+        "b": {"model_name": "stub/b", "group": "pool", "health_check": False},
+    }
+    return ModelManager(DictConfigProvider(models), FrameworkSettings())
+
+
+def test_stub_models_come_from_config(manager):
+    lm = manager.get_model("a")
+    assert isinstance(lm, StubLM)
+    assert lm.kwargs["max_tokens"] == 1000
+    assert manager.health.model_ids == ["a"]
+
+
+@pytest.mark.anyio
+async def test_stub_model_serves_a_processor(manager):
+    processor = ModelProcessor(
+        model_manager=manager,
+        model_id="a",
+        signature_class=dspy.Signature("input -> output"),
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+    result = await processor.process(
+        PipelineData(media_type=MediaType.TEXT, content="hi")
+    )
+    assert result.content == "ok"
+
+
+@pytest.mark.anyio
+async def test_healthy_probe_closes_an_open_circuit(manager):
+    breaker = manager.get_runtime("a").breaker
+    breaker.record_probe(False, ProviderError(503))
+    assert breaker.state == State.OPEN
+
+    assert await manager.health.probe("a")
+    assert breaker.state == State.CLOSED
+    assert breaker.metrics["successful_recoveries"] == 1
+    assert manager.get_model("a").calls == 1
+
+
+@pytest.mark.anyio
+async def test_probe_sends_only_provider_parameters(litellm_calls):
+    models = {
+        "real": {
+            "model_name": "openai/gpt-4o-mini",
+            "additional_params": {"engine": "litellm"},
+        }
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+
+    assert await HealthProber(manager, timeout=3).probe("real")
+
+    (call,) = litellm_calls
+    assert (call["max_tokens"], call["timeout"]) == (1, 3)
+    assert "config" not in call
+
+
+@pytest.mark.anyio
+async def test_failing_probes_open_the_circuit_and_steer_routing(manager):
+    manager.get_model("a").error = ProviderError(503)
+
+    assert not await manager.health.probe("a")
+    assert manager.get_runtime("a").breaker.state == State.CLOSED
+    assert not await manager.health.probe("a")
+    assert manager.get_runtime("a").breaker.state == State.OPEN
+    assert {manager.select_model("pool") for _ in range(10)} == {"b"}
+
+    stats = manager.health.get_stats()["a"]
+    assert (stats["probes"], stats["consecutive_failures"]) == (2, 2)
+    assert stats["last_error"] == "ProviderError: HTTP 503"
+
+
+@pytest.mark.anyio
+async def test_rate_limited_probe_only_cools_the_model_down(manager):
+    manager.get_model("a").error = ProviderError(429)
+    prober = HealthProber(manager, failures_to_open=1)
+
+    assert not await prober.probe("a")
+    runtime = manager.get_runtime("a")
+    assert runtime.cooling_down
+    assert runtime.breaker.state == State.CLOSED
+
+
+@pytest.mark.anyio
+async def test_rejected_probes_leave_the_breaker_alone(manager):
+    # A bad key or a parameter the provider refuses is no outage
+    manager.get_model("a").error = ProviderError(401)
+    prober = HealthProber(manager, failures_to_open=1)
+
+    assert not await prober.probe("a")
+    assert manager.get_runtime("a").breaker.state == State.CLOSED
+    stats = prober.get_stats()["a"]
+    assert (stats["failures"], stats["consecutive_failures"]) == (1, 0)
+
+
+@pytest.mark.anyio
+async def test_probes_wait_for_the_rate_limits():
+    models = {"a": {"model_name": "stub/a", "rate_limits": {"rpm": 1, "max_wait": 0}}}
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+    scheduler = FairScheduler(max_in_flight=1)
+    prober = HealthProber(manager, scheduler=scheduler)
+
+    assert await prober.probe("a")
+    assert not await prober.probe("a")  # The minute's one request is spent
+
+    stats = prober.get_stats()["a"]
+    assert (stats["probes"], stats["skipped"], stats["failures"]) == (1, 1, 0)
+    assert scheduler.get_stats()["classes"]["batch"]["scheduled"] == 2
+
+
+@pytest.mark.anyio
+async def test_slow_probes_time_out(manager):
+    manager.get_model("a").latency = 0.5
+    prober = HealthProber(manager, timeout=0.05, failures_to_open=1)
+
+    with anyio.fail_after(0.4):
+        assert not await prober.probe("a")
+    assert manager.get_runtime("a").breaker.state == State.OPEN
+
+
+@pytest.mark.anyio
+async def test_background_probes_run_until_cancelled(manager):
+    manager.health.interval = 0.02
+    with anyio.move_on_after(0.2):
+        await manager.health.run()
+
+    stats = manager.health.get_stats()
+    assert stats["a"]["probes"] >= 3
+    assert "b" not in stats
@@ -0,0 +1,114 @@
+import time
+from unittest.mock import MagicMock
+
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import HedgePolicy, ModelProcessor
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import MediaType, PipelineData
+from tests.fakes import StaticModelManager
+
+
+def call_after(delay: float, result: str):
+    async def call() -> str:
+        await anyio.sleep(delay)
+        return result
+
+    return call
+
+
+@pytest.mark.anyio
+async def test_hedge_wins_when_primary_is_slow():
+    policy = HedgePolicy()
+
+    start = time.monotonic()
+    result = await policy.run(
+        call_after(5, "primary"), call_after(0, "hedge"), delay=0.05, model_id="m"
+    )
+
+    assert result == "hedge"
+    assert time.monotonic() - start < 1
+    stats = policy.get_stats()
+    assert stats["hedges_sent"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+@pytest.mark.anyio
+async def test_fast_primary_is_not_hedged():
+    hedge = MagicMock()
+    policy = HedgePolicy()
+
+    assert await policy.run(call_after(0, "primary"), hedge, 0.5, "m") == "primary"
+    # No latency learned yet: no hedge at all
+    assert await policy.run(call_after(0.1, "primary"), hedge, None, "m") == "primary"
+    hedge.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_hedge_budget_caps_extra_calls():
+    policy = HedgePolicy(max_extra_ratio=0.0, burst=1)
+
+    for _ in range(3):
+        await policy.run(call_after(0.1, "primary"), call_after(0, "hedge"), 0.01, "m")
+
+    stats = policy.get_stats()
+    assert stats["hedges_sent"] == 1
+    assert stats["budget_exhausted"] == 2
+
+
+@pytest.mark.anyio
+async def test_errors_surface_when_every_attempt_fails():
+    async def fail():
+        raise RuntimeError("provider down")
+
+    policy = HedgePolicy()
+    with pytest.raises(RuntimeError, match="provider down"):
+        await policy.run(fail, call_after(0, "hedge"), 5, "m")
+    # A failing primary doesn't wait for the hedge delay
+    assert policy.get_stats()["hedges_sent"] == 0
+
+
+@pytest.mark.anyio
+async def test_model_processor_hedges_to_alternate_model(monkeypatch):
+    calls: list[str] = []
+
+    async def acall(**kwargs):
+        model = dspy.settings.lm.model
+        calls.append(model)
+        await anyio.sleep(5 if model == "primary" else 0)
+        return MagicMock(output=model)
+
+    predictor = MagicMock()
+    predictor.acall = acall
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    runtimes = {name: ModelRuntime(name) for name in ("primary", "backup")}
+    model_manager = StaticModelManager(
+        models={name: MagicMock(model=name) for name in runtimes}, runtimes=runtimes
+    )
+    for _ in range(5):
+        runtimes["primary"].latency.record(0.05)
+
+    processor = ModelProcessor(
+        model_manager=model_manager,
+        model_id="primary",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        async_calls=True,
+        hedging=HedgePolicy(alternate_model_id="backup"),
+    )
+
+    start = time.monotonic()
+    result = await processor.process(
+        PipelineData(media_type=MediaType.TEXT, content="hi")
+    )
+
+    assert result.content == "backup"
+    assert calls == ["primary", "backup"]
+    assert time.monotonic() - start < 1
+    assert processor.hedging.get_stats()["hedge_wins"] == 1
@@ -0,0 +1,98 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import dspy
+import pytest
+
+from llm_server.core import HTTPClientPool, HTTPPoolConfig
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.providers import ProviderManager
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    ports: set[int] = set()
+
+    def do_GET(self):
+        Handler.ports.add(self.client_address[1])
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    Handler.ports = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_a_kept_alive_connection(server_url):
+    pool = HTTPClientPool("test", HTTPPoolConfig(max_connections=4))
+
+    for _ in range(3):
+        assert pool.client.get(f"{server_url}/v1/models").text == "ok"
+
+    assert len(Handler.ports) == 1
+    stats = pool.get_stats()
+    assert stats["sync"] == {"active": 0, "idle": 1, "utilization": 0.0}
+    assert stats["async"]["idle"] == 0
+    pool.client.close()
+
+
+@pytest.mark.anyio
+async def test_async_client_shares_its_pool(server_url):
+    pool = HTTPClientPool("test", HTTPPoolConfig(max_connections=4, http2=False))
+    for _ in range(2):
+        response = await pool.async_client.get(f"{server_url}/v1/models")
+        assert response.http_version == "HTTP/1.1"
+
+    assert len(Handler.ports) == 1
+    assert pool.get_stats()["async"]["idle"] == 1
+    await pool.aclose()
+
+
+def test_install_hands_the_clients_to_the_target():
+    target = SimpleNamespace(client_session=None, aclient_session=None)
+    pool = HTTPClientPool(config=HTTPPoolConfig(keepalive_expiry=30))
+
+    pool.install(target)
+
+    assert target.client_session is pool.client
+    assert target.aclient_session is pool.async_client
+    assert pool._transport._pool._keepalive_expiry == 30
+
+
+class LegacyLM:
+    """dspy.LM before engines: unknown keyword arguments go into the request"""
+
+    def __init__(self, model, max_tokens=1000, num_retries=3, **kwargs):
+        self.model = model
+        self.kwargs = kwargs
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_pooled_models_pick_the_litellm_engine_only_if_dspy_has_one(
+    monkeypatch, legacy
+):
+    if legacy:
+        monkeypatch.setattr(dspy, "LM", LegacyLM)
+    manager = ProviderManager(FrameworkSettings())
+    manager.http_pool = HTTPClientPool("test")  # Not installed into LiteLLM
+
+    lm = manager.initialize_model("openai/gpt-4o-mini", {})
+
+    if legacy:
+        assert "engine" not in lm.kwargs
+    else:
+        assert lm.engine == "litellm"
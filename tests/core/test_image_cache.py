@@ -0,0 +1,101 @@
+import io
+
+import pytest
+from PIL import ExifTags, Image
+
+from llm_server.core import ImageProcessor, ProcessedImageCache
+from llm_server.core.image_cache import ProcessedImage
+from llm_server.core.types import MediaType, PipelineData
+
+
+def _entry(size: int) -> ProcessedImage:
+    return ProcessedImage(
+        data=b"x" * size, mime_type="image/png", metadata={"processed_size": (1, 1)}
+    )
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = ProcessedImageCache(max_bytes=250)
+    cache.put("a", _entry(100))
+    cache.put("b", _entry(100))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", _entry(100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.get_stats()
+    assert stats["memory_bytes"] == 200
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == pytest.approx(3 / 4)
+
+
+def test_cache_spills_evicted_entries_to_disk(tmp_path):
+    cache = ProcessedImageCache(max_bytes=150, disk_dir=tmp_path)
+    cache.put("a", _entry(100))
+    cache.put("b", _entry(100))  # evicts "a" to disk
+
+    restored = cache.get("a")
+    assert restored is not None
+    assert restored.data == b"x" * 100
+    assert restored.metadata["processed_size"] == (1, 1)
+    assert cache.get_stats()["disk_hits"] == 1
+
+    # A new cache instance picks up the existing disk tier
+    assert ProcessedImageCache(disk_dir=tmp_path).get("a") is not None
+
+
+@pytest.mark.anyio
+async def test_image_processor_skips_work_on_cache_hit(monkeypatch):
+    buffer = io.BytesIO()
+    Image.new("RGB", (1000, 500)).save(buffer, format="PNG")
+    data = PipelineData(media_type=MediaType.IMAGE, content=buffer.getvalue())
+
+    processor = ImageProcessor(max_size=(800, 800), cache=ProcessedImageCache())
+    first = await processor.process(data)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("image was processed again")
+
+    monkeypatch.setattr(processor, "_process_image", fail)
+    second = await processor.process(data)
+
+    assert second.content == first.content
+    assert second.metadata["processed_size"] == (800, 400)
+    assert processor.cache is not None
+    assert processor.cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_cached_metadata_is_not_shared_with_callers():
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, format="PNG")
+    data = PipelineData(media_type=MediaType.IMAGE, content=[buffer.getvalue()])
+    processor = ImageProcessor(cache=ProcessedImageCache())
+
+    first = await processor.process(data)
+    first.metadata["images"][0]["processed_size"] = (1, 1)
+    second = await processor.process(data)
+
+    assert second.metadata["images"][0]["processed_size"] == (10, 10)
+
+
+@pytest.mark.anyio
+async def test_cached_nested_metadata_is_not_shared_with_callers():
+    exif = Image.Exif()
+    exif[ExifTags.Base.GPSInfo] = {
+        1: "N",
+        2: (40.0, 30.0, 0.0),
+        3: "W",
+        4: (79.0, 45.0, 0.0),
+    }
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, format="JPEG", exif=exif.tobytes())
+    data = PipelineData(media_type=MediaType.IMAGE, content=buffer.getvalue())
+    processor = ImageProcessor(cache=ProcessedImageCache())
+
+    first = await processor.process(data)
+    first.metadata["gps_location"]["latitude"] = 0.0
+    second = await processor.process(data)
+
+    assert second.metadata["gps_location"]["latitude"] == 40.5
@@ -0,0 +1,168 @@
+import base64
+import io
+
+import pytest
+from PIL import ExifTags, Image
+
+from llm_server.core import (
+    ImageLimitError,
+    ImageLimits,
+    ImageProcessor,
+    extract_gps_from_image,
+    inspect_image,
+)
+from llm_server.core.implementations import ImageContent
+from llm_server.core.types import MediaType, PipelineData
+
+
+@pytest.fixture
+def exif_jpeg_bytes():
+    """A 40x20 JPEG rotated via EXIF orientation 6 with a GPS location."""
+    image = Image.new("RGB", (40, 20), "red")
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[ExifTags.Base.GPSInfo] = {
+        1: "N",
+        2: (40.0, 30.0, 0.0),
+        3: "W",
+        4: (79.0, 45.0, 0.0),
+    }
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_inspect_image_reads_header_and_exif(exif_jpeg_bytes):
+    info = inspect_image(exif_jpeg_bytes)
+    assert info.size == (40, 20)
+    assert info.format == "JPEG"
+    assert info.mime_type == "image/jpeg"
+    assert info.orientation == 6
+    assert info.gps == {
+        "latitude": 40.5,
+        "longitude": -79.75,
+        "source": "photo_exif",
+    }
+
+
+def test_extract_gps_without_exif():
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, format="PNG")
+    assert extract_gps_from_image(buffer.getvalue()) is None
+
+
+def test_image_content_info_does_not_decode(exif_jpeg_bytes):
+    content = ImageContent(exif_jpeg_bytes)
+    assert content.info.orientation == 6
+    # Only the header has been parsed; no pixel data is loaded yet
+    assert content._pil_image is None
+
+
+@pytest.mark.anyio
+async def test_image_processor_uses_cached_orientation_and_gps(exif_jpeg_bytes):
+    data = PipelineData(media_type=MediaType.IMAGE, content=exif_jpeg_bytes)
+    result = await ImageProcessor(max_size=(800, 800)).process(data)
+    assert result.metadata["original_size"] == (20, 40)
+    assert result.metadata["gps_location"]["latitude"] == 40.5
+
+
+@pytest.fixture
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (30, 10), "blue").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_image_content_accepts_buffers_and_files(png_bytes, tmp_path):
+    import mmap
+    import tempfile
+
+    spooled = tempfile.SpooledTemporaryFile()
+    spooled.write(png_bytes)
+    spooled.seek(0)
+
+    path = tmp_path / "image.png"
+    path.write_bytes(png_bytes)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        sources = [bytearray(png_bytes), memoryview(png_bytes), spooled, m]
+        for source in sources:
+            content = ImageContent(source)
+            assert content.info.size == (30, 10)
+            assert content.detect_mime_type() == "image/png"
+            assert content.bytes == png_bytes
+            del content
+
+
+def test_image_content_decodes_base64_in_chunks(png_bytes, monkeypatch):
+    import base64
+
+    from llm_server.core import image_utils
+
+    monkeypatch.setattr(image_utils, "BASE64_CHUNK_CHARS", 8)
+    encoded = base64.b64encode(png_bytes).decode("ascii").rstrip("=")
+    wrapped = "\n".join(encoded[i : i + 7] for i in range(0, len(encoded), 7))
+
+    content = ImageContent(f"data:image/png;base64,{wrapped}")
+    assert content.bytes == png_bytes
+
+    with pytest.raises(ValueError):
+        ImageContent("data:image/png;base64,a")
+    with pytest.raises(ValueError):
+        ImageContent("data:image/png;base64")
+
+
+def _encode(image: Image.Image, image_format: str, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **kwargs)
+    return buffer.getvalue()
+
+
+@pytest.mark.anyio
+async def test_image_processor_rejects_images_over_limits():
+    png = _encode(Image.new("RGB", (2000, 1000)), "PNG")
+    gif = _encode(
+        Image.new("RGB", (10, 10)),
+        "GIF",
+        save_all=True,
+        append_images=[Image.new("RGB", (10, 10), c) for c in ("red", "blue")],
+    )
+    cases = [
+        (png, ImageLimits(max_bytes=100), "max_bytes"),
+        (png, ImageLimits(max_pixels=1_000_000), "max_pixels"),
+        (gif, ImageLimits(max_frames=2), "max_frames"),
+    ]
+    for content, limits, limit_name in cases:
+        processor = ImageProcessor(limits=limits)
+        data = PipelineData(media_type=MediaType.IMAGE, content=content)
+        with pytest.raises(ImageLimitError) as exc_info:
+            await processor.process(data)
+        assert exc_info.value.limit == limit_name
+
+
+def test_base64_over_the_byte_limit_is_rejected_before_decoding(monkeypatch):
+    def decode(*_args):
+        raise AssertionError("decoded an oversized payload")
+
+    monkeypatch.setattr("llm_server.core.implementations.decode_base64_text", decode)
+    text = base64.b64encode(b"x" * 300).decode("ascii")
+
+    with pytest.raises(ImageLimitError) as exc_info:
+        ImageContent(f"data:image/png;base64,{text}", limits=ImageLimits(max_bytes=100))
+    assert exc_info.value.actual == 300
+
+
+@pytest.mark.anyio
+async def test_oversized_jpeg_is_decoded_at_reduced_resolution():
+    jpeg = _encode(Image.new("RGB", (4000, 3000)), "JPEG")
+
+    decoded = ImageContent(jpeg).decode(draft_size=(800, 600))
+    assert decoded.size == (1000, 750)
+
+    # 12MP exceeds the pixel budget, but only the reduced decode is counted
+    processor = ImageProcessor(
+        max_size=(800, 800), limits=ImageLimits(max_pixels=1_000_000)
+    )
+    data = PipelineData(media_type=MediaType.IMAGE, content=jpeg)
+    result = await processor.process(data)
+    assert result.metadata["original_size"] == (4000, 3000)
+    assert result.metadata["processed_size"] == (800, 600)
@@ -0,0 +1,114 @@
+import json
+
+import anyio
+import pytest
+
+from llm_server.core import IncrementalJSONParser, Pipeline, StreamedOutputParser
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEvent,
+    PipelineEventType,
+)
+
+DOCUMENT = {
+    "name": 'Ada "the" Lovelace, {esq}',
+    "age": 36,
+    "tags": ["math", {"kind": "poet"}, [1, 2]],
+    "alive": False,
+}
+
+
+def _feed_in_chunks(parser, text, size):
+    completed = []
+    for i in range(0, len(text), size):
+        completed.append(parser.feed(text[i : i + size]))
+    return completed
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_parser_reports_fields_and_elements(chunk_size):
+    text = json.dumps(DOCUMENT, indent=2)
+    batches = _feed_in_chunks(IncrementalJSONParser(), text, chunk_size)
+    parsed = [(p.path, p.value) for batch in batches for p in batch]
+
+    assert parsed == [
+        (("name",), DOCUMENT["name"]),
+        (("age",), 36),
+        (("tags", 0), "math"),
+        (("tags", 1), {"kind": "poet"}),
+        (("tags", 2), [1, 2]),
+        (("tags",), DOCUMENT["tags"]),
+        (("alive",), False),
+        ((), DOCUMENT),
+    ]
+
+
+def test_parser_reports_fields_before_document_ends():
+    parser = IncrementalJSONParser()
+    text = json.dumps(DOCUMENT)
+
+    completed = parser.feed(text[: text.index('"age"')])
+
+    assert [(p.path, p.value) for p in completed] == [(("name",), DOCUMENT["name"])]
+    assert not parser.done
+
+
+def test_streamed_output_parser_fields():
+    parser = StreamedOutputParser({"summary": str, "items": list[str]})
+
+    assert parser.feed("summary", "Two ", False) == []
+    assert parser.feed("items", '["a", "b', False)[0].path == ("items", 0)
+    completed = parser.feed("items", '"]', True)
+    assert [(p.path, p.value) for p in completed] == [
+        (("items", 1), "b"),
+        (("items",), ["a", "b"]),
+    ]
+    completed = parser.feed("summary", "items ", True)
+    assert [(p.path, p.value) for p in completed] == [(("summary",), "Two items")]
+
+
+class NameStreamStep:
+    """Streams a structured output the way ModelProcessor would."""
+
+    def __init__(self, release: anyio.Event):
+        self.release = release
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        return data
+
+    async def process_stream(self, data: PipelineData):
+        parser = StreamedOutputParser({"person": dict})
+        for chunk, last in [('{"name": "Ada",', False), (' "bio": "..."}', True)]:
+            for parsed in parser.feed("person", chunk, last):
+                yield PipelineEvent(
+                    type=PipelineEventType.FIELD_COMPLETED,
+                    field="person",
+                    path=list(parsed.path),
+                    value=parsed.value,
+                )
+            # The model keeps generating until the early field was acted on
+            await self.release.wait()
+        yield PipelineEvent(type=PipelineEventType.STEP_COMPLETED, data=data)
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+@pytest.mark.anyio
+async def test_pipeline_acts_on_early_field():
+    release = anyio.Event()
+    pipeline = Pipeline([NameStreamStep(release)])
+    data = PipelineData(media_type=MediaType.TEXT, content="")
+    seen = []
+
+    with anyio.fail_after(2):
+        async for event in pipeline.execute_stream(data):
+            if event.type == PipelineEventType.FIELD_COMPLETED:
+                seen.append((event.path, event.value))
+                if event.path == ["person", "name"]:
+                    release.set()
+
+    assert seen[0] == (["person", "name"], "Ada")
+    assert seen[-1] == (["person"], {"name": "Ada", "bio": "..."})
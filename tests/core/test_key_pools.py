@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+import dspy
+import pytest
+
+from llm_server.core import ModelProcessor, RetryPolicy
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.providers import ProviderManager
+from llm_server.core.routing import ModelRouter
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import MediaType, PipelineData
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider
+
+
+class RateLimited(Exception):
+    status_code = 429
+    headers = {"retry-after": "30"}
+
+
+PROVIDERS = {
+    "openai": {
+        "keys": [
+            {"name": "org-1", "api_key": "sk-1", "rate_limits": {"rpm": 100}},
+            {"name": "org-2", "api_key_env": "POOL_TEST_KEY", "base_url": "http://b"},
+        ],
+        "rate_limits": {"rpm": 50},
+    }
+}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("POOL_TEST_KEY", "sk-2")
+    models = {
+        "mini": {"model_name": "openai/gpt-4o-mini"},
+        "big": {"model_name": "openai/gpt-4o"},
+        "flash": {"model_name": "gemini/gemini-2.0-flash"},
+    }
+    manager = ModelManager(DictConfigProvider(models, PROVIDERS), FrameworkSettings())
+    manager.router = ModelRouter("least_outstanding")
+    return manager
+
+
+def test_pooled_keys_become_routed_members(manager):
+    assert manager.groups == {
+        "mini": ["mini@org-1", "mini@org-2"],
+        "big": ["big@org-1", "big@org-2"],
+    }
+    assert manager.models["mini@org-1"].kwargs["api_key"] == "sk-1"
+    assert manager.models["mini@org-2"].kwargs["api_key"] == "sk-2"
+    assert manager.models["mini@org-2"].kwargs["api_base"] == "http://b"
+    assert "flash" in manager.models
+
+    # Limits are per key, shared by the models using it
+    key_one = manager.get_runtime("mini@org-1").limiters[0]
+    assert key_one.name == "openai@org-1"
+    assert key_one.requests.capacity == 100
+    assert manager.get_runtime("big@org-1").limiters[0] is key_one
+    assert manager.get_runtime("mini@org-2").limiters[0].requests.capacity == 50
+
+
+def test_pool_entry_without_key_is_rejected(monkeypatch):
+    monkeypatch.delenv("MISSING_KEY", raising=False)
+    config = {"openai": {"keys": [{"api_key_env": "MISSING_KEY"}]}}
+    with pytest.raises(ValueError, match="no API key"):
+        ProviderManager(FrameworkSettings(), config)
+
+
+def test_rate_limited_key_cools_down_and_is_avoided():
+    limited, other = ModelRuntime("a"), ModelRuntime("b")
+    with pytest.raises(RateLimited), limited.track():
+        raise RateLimited()
+
+    assert limited.cooling_down
+    assert limited.cooldown_until > other.cooldown_until
+    router = ModelRouter("least_outstanding")
+    assert router.select([limited, other]) is other
+
+
+@pytest.mark.anyio
+async def test_retry_rotates_to_another_key_on_429(manager, monkeypatch):
+    predictor = MagicMock(side_effect=[RateLimited(), MagicMock(output="ok")])
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    processor = ModelProcessor(
+        model_manager=manager,
+        model_id="mini",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        retry=RetryPolicy(base_delay=0.01, max_delay=60),
+    )
+
+    result = await processor.process(
+        PipelineData(media_type=MediaType.TEXT, content="hi")
+    )
+
+    assert result.content == "ok"
+    served = result.metadata["served_by"]
+    first = "mini@org-2" if served == "mini@org-1" else "mini@org-1"
+    assert manager.get_runtime(first).cooling_down
+    assert not manager.get_runtime(served).cooling_down
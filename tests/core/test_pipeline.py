@@ -0,0 +1,281 @@
+import itertools
+from unittest.mock import MagicMock
+
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import DAGPipeline, ModelProcessor, Pipeline, PipelineNode
+from llm_server.core.metrics_wrappers import BatchMetrics
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.types import MediaType, PipelineData
+from tests.fakes import StaticModelManager
+
+
+class SleepyStep:
+    """Text step that waits before tagging its input."""
+
+    def __init__(self, tag: str, delay: float = 0.0, fail: bool = False):
+        self.tag = tag
+        self.delay = delay
+        self.fail = fail
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        await anyio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.tag} failed")
+        return PipelineData(
+            media_type=MediaType.TEXT,
+            content=f"{data.content}|{self.tag}",
+            metadata={**data.metadata, self.tag: True},
+        )
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+class JoinStep:
+    """Joins the dict produced by the default merge."""
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        return PipelineData(
+            media_type=MediaType.TEXT,
+            content=sorted(data.content.values()),
+            metadata=data.metadata,
+        )
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+@pytest.fixture
+def text_data():
+    return PipelineData(media_type=MediaType.TEXT, content="in", metadata={})
+
+
+@pytest.mark.anyio
+async def test_dag_runs_branches_concurrently(text_data):
+    pipeline = DAGPipeline(
+        [
+            PipelineNode("join", JoinStep(), depends_on=["a", "b"]),
+            PipelineNode("a", SleepyStep("a", delay=0.2)),
+            PipelineNode("b", SleepyStep("b", delay=0.2)),
+        ]
+    )
+
+    start = anyio.current_time()
+    result = await pipeline.execute(text_data)
+    elapsed = anyio.current_time() - start
+
+    assert result.content == ["in|a", "in|b"]
+    assert result.metadata == {"a": True, "b": True}
+    # Both branches slept in parallel
+    assert elapsed < 0.35
+
+
+@pytest.mark.anyio
+async def test_dag_fan_out_returns_all_sinks(text_data):
+    pipeline = DAGPipeline(
+        [
+            PipelineNode("root", SleepyStep("root")),
+            PipelineNode("left", SleepyStep("left"), depends_on=["root"]),
+            PipelineNode("right", SleepyStep("right"), depends_on=["root"]),
+        ]
+    )
+
+    result = await pipeline.execute(text_data)
+
+    assert result.content == {"left": "in|root|left", "right": "in|root|right"}
+
+
+@pytest.mark.anyio
+async def test_dag_failure_cancels_other_nodes(text_data):
+    slow = SleepyStep("slow", delay=5)
+    pipeline = DAGPipeline(
+        [
+            PipelineNode("bad", SleepyStep("bad", fail=True)),
+            PipelineNode("slow", slow),
+        ]
+    )
+
+    with anyio.fail_after(2):
+        with pytest.raises(RuntimeError, match="bad failed"):
+            await pipeline.execute(text_data)
+
+
+@pytest.mark.anyio
+async def test_dag_merge_failure_is_raised_like_a_node_failure(text_data):
+    def conflicting(results):
+        raise ValueError("conflicting inputs")
+
+    pipeline = DAGPipeline(
+        [
+            PipelineNode("a", SleepyStep("a")),
+            PipelineNode("b", SleepyStep("b")),
+            PipelineNode("join", JoinStep(), depends_on=["a", "b"], merge=conflicting),
+        ]
+    )
+
+    with pytest.raises(ValueError, match="conflicting inputs"):
+        await pipeline.execute(text_data)
+
+
+@pytest.mark.anyio
+async def test_dag_siblings_do_not_write_into_their_shared_input(
+    monkeypatch, text_data
+):
+    def predict(**kwargs):
+        usage = {"prompt_tokens": dspy.settings.lm.tokens}
+        return MagicMock(output="ok", get_lm_usage=lambda: {"lm": usage})
+
+    monkeypatch.setattr(
+        "dspy.Predict", MagicMock(return_value=MagicMock(side_effect=predict))
+    )
+    lms = {"gpt-a": MagicMock(tokens=11), "gpt-b": MagicMock(tokens=99)}
+    manager = StaticModelManager(models=lms)
+
+    def node(model_id: str) -> PipelineNode:
+        return PipelineNode(
+            model_id,
+            ModelProcessor(
+                model_manager=manager,
+                model_id=model_id,
+                signature_class=dspy.Signature,
+                input_key="input",
+                output_processor=DefaultOutputProcessor(),
+                accepted_types=[MediaType.TEXT],
+                output_type=MediaType.TEXT,
+            ),
+        )
+
+    results = await DAGPipeline([node("gpt-a"), node("gpt-b")]).execute_nodes(text_data)
+
+    assert results["gpt-a"].metadata["usage"].prompt_tokens == 11
+    assert results["gpt-b"].metadata["usage"].prompt_tokens == 99
+    assert text_data.metadata == {}
+
+
+def test_dag_validation():
+    with pytest.raises(ValueError, match="cycle"):
+        DAGPipeline(
+            [
+                PipelineNode("a", SleepyStep("a"), depends_on=["b"]),
+                PipelineNode("b", SleepyStep("b"), depends_on=["a"]),
+            ]
+        )
+    with pytest.raises(ValueError, match="unknown node"):
+        DAGPipeline([PipelineNode("a", SleepyStep("a"), depends_on=["missing"])])
+    with pytest.raises(ValueError, match="Duplicate"):
+        DAGPipeline([PipelineNode("a", SleepyStep("a")), PipelineNode("a", JoinStep())])
+
+
+class CountingStep:
+    """Sleeps for the delay in its input and tracks how many items are in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay, value = data.content
+            await anyio.sleep(delay)
+            if value == "boom":
+                raise RuntimeError("boom")
+            return PipelineData(media_type=MediaType.TEXT, content=value)
+        finally:
+            self.in_flight -= 1
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+def _items(pairs):
+    return (PipelineData(media_type=MediaType.TEXT, content=pair) for pair in pairs)
+
+
+@pytest.mark.anyio
+async def test_execute_many_bounded_and_ordered():
+    step = CountingStep()
+    pipeline = Pipeline([step, SleepyStep("tag")])
+    metrics = BatchMetrics()
+    pairs = [(0.02 * (i % 3), f"item{i}") for i in range(20)]
+
+    results = await pipeline.execute_many(_items(pairs), concurrency=4, metrics=metrics)
+
+    assert [r.content for r in results] == [f"item{i}|tag" for i in range(20)]
+    assert step.max_in_flight == 4
+    summary = metrics.get_summary()
+    assert summary["succeeded"] == 20
+    assert summary["throughput_per_s"] > 0
+    assert [s["name"] for s in summary["steps"]] == ["CountingStep", "SleepyStep"]
+    assert summary["steps"][0]["p50_ms"] <= summary["steps"][0]["p99_ms"]
+
+
+@pytest.mark.anyio
+async def test_execute_many_stream_yields_in_completion_order():
+    pipeline = Pipeline([CountingStep()])
+    pairs = [(0.2, "slow"), (0.0, "fast")]
+
+    async with pipeline.execute_many_stream(_items(pairs), concurrency=2) as results:
+        completed = [(index, result.content) async for index, result in results]
+
+    assert completed == [(1, "fast"), (0, "slow")]
+
+
+@pytest.mark.anyio
+async def test_execute_many_exceptions():
+    pipeline = Pipeline([CountingStep()])
+    pairs = [(0.0, "ok"), (0.0, "boom"), (0.0, "fine")]
+
+    results = await pipeline.execute_many(_items(pairs), return_exceptions=True)
+    assert results[0].content == "ok"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2].content == "fine"
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await pipeline.execute_many(_items(pairs), concurrency=1)
+
+
+@pytest.mark.anyio
+async def test_execute_many_stream_early_exit_stops_workers():
+    step = CountingStep()
+    pipeline = Pipeline([step])
+    endless = (
+        PipelineData(media_type=MediaType.TEXT, content=(0.01, i))
+        for i in itertools.count()
+    )
+
+    async with pipeline.execute_many_stream(endless, concurrency=3) as results:
+        async for index, _ in results:
+            if index >= 5:
+                break
+
+    assert step.in_flight == 0
+
+    # An error in the consumer also stops the workers, in the consumer's task
+    with pytest.raises(ValueError, match="consumer"):
+        async with pipeline.execute_many_stream(endless, concurrency=3) as results:
+            async for _ in results:
+                raise ValueError("consumer failed")
+
+    assert step.in_flight == 0
+
+
+def test_batch_metrics_memory_is_bounded():
+    metrics = BatchMetrics(sample_size=100)
+    for i in range(10_000):
+        metrics.record_step(0, "Step", i / 1000)
+        metrics.record_item(i / 1000, success=True)
+
+    summary = metrics.get_summary()
+    assert len(metrics.item_durations.samples) == 100
+    assert summary["latency"]["count"] == 10_000
+    assert summary["latency"]["mean_ms"] == pytest.approx(4999.5)
+    # A uniform sample keeps the percentiles close to the true ones
+    assert 3000 < summary["steps"][0]["p50_ms"] < 7000
@@ -1,13 +1,23 @@
+import time
 from typing import Any
 from unittest.mock import MagicMock
 
+import anyio
 import dspy
 import pytest
 
 from llm_server.core import ImageProcessor, ModelProcessor, Pipeline, PipelineStep
+from llm_server.core.config import FrameworkSettings
 from llm_server.core.output_processors import DefaultOutputProcessor
 from llm_server.core.protocols import ModelBackend
-from llm_server.core.types import MediaType, PipelineData, ProgramMetadata
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEventType,
+    ProgramMetadata,
+)
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, StaticModelManager
 
 
 # Test Data
@@ -107,9 +117,7 @@ class TestModelProcessor:
     async def test_model_processor_basic(self, text_data, monkeypatch):
         """Test basic model processor functionality, borrowing mocking patterns from contactcapture-backend."""
         # ARRANGE
-        mock_model_manager = MagicMock()
-        mock_lm = MagicMock(spec=dspy.LM)
-        mock_model_manager.get_model.return_value = mock_lm
+        mock_model_manager = StaticModelManager(lm=MagicMock(spec=dspy.LM))
 
         mock_predictor_instance = MagicMock()
         mock_prediction_result = MagicMock()
@@ -144,9 +152,146 @@ class TestModelProcessor:
         mock_dspy_predict_class.assert_called_once_with(dspy.Signature)
         mock_predictor_instance.assert_called_once_with(input="test content")
 
+    @pytest.mark.anyio
+    async def test_model_processor_list_input(self, monkeypatch):
+        """A list-typed input field gets one call; a scalar field gets one call per item."""
+
+        class MultiImageSignature(dspy.Signature):
+            images: list[str] = dspy.InputField()
+            output: str = dspy.OutputField()
+
+        mock_model_manager = StaticModelManager(lm=MagicMock(spec=dspy.LM))
+        mock_predictor_instance = MagicMock(
+            side_effect=lambda **kwargs: MagicMock(output=str(kwargs))
+        )
+        monkeypatch.setattr(
+            "dspy.Predict", MagicMock(return_value=mock_predictor_instance)
+        )
+        data = PipelineData(media_type=MediaType.IMAGE, content=["page1", "page2"])
+
+        def make_processor(signature, input_key):
+            return ModelProcessor(
+                model_manager=mock_model_manager,
+                model_id="mock-model-id",
+                signature_class=signature,
+                input_key=input_key,
+                output_processor=DefaultOutputProcessor(),
+                accepted_types=[MediaType.IMAGE],
+                output_type=MediaType.TEXT,
+            )
+
+        result = await make_processor(MultiImageSignature, "images").process(data)
+        mock_predictor_instance.assert_called_once_with(images=["page1", "page2"])
+        assert result.content == str({"images": ["page1", "page2"]})
+
+        mock_predictor_instance.reset_mock()
+        result = await make_processor(dspy.Signature, "input").process(data)
+        assert mock_predictor_instance.call_count == 2
+        assert result.content == [str({"input": "page1"}), str({"input": "page2"})]
+
+    @pytest.mark.anyio
+    async def test_model_processor_stream(self, text_data, monkeypatch):
+        """Streamed chunks become PARTIAL events; the prediction completes the step."""
+        from dspy.streaming import StreamResponse
+
+        class QASignature(dspy.Signature):
+            input: str = dspy.InputField()
+            output: str = dspy.OutputField()
+
+        def fake_streamify(program, stream_listeners):
+            assert [lis.signature_field_name for lis in stream_listeners] == ["output"]
+
+            async def stream(**kwargs):
+                for chunk in ["Hel", "lo"]:
+                    yield StreamResponse("predict", "output", chunk, chunk == "lo")
+                yield dspy.Prediction(output="Hello")
+
+            return stream
+
+        monkeypatch.setattr("dspy.streamify", fake_streamify)
+        mock_model_manager = StaticModelManager(lm=MagicMock(spec=dspy.LM))
+        processor = ModelProcessor(
+            model_manager=mock_model_manager,
+            model_id="mock-model-id",
+            signature_class=QASignature,
+            input_key="input",
+            output_processor=DefaultOutputProcessor(),
+            accepted_types=[MediaType.TEXT],
+            output_type=MediaType.TEXT,
+        )
+
+        events = [event async for event in processor.process_stream(text_data)]
+
+        assert [(e.type, e.field, e.delta) for e in events[:2]] == [
+            (PipelineEventType.PARTIAL, "output", "Hel"),
+            (PipelineEventType.PARTIAL, "output", "lo"),
+        ]
+        assert (events[2].type, events[2].path, events[2].value) == (
+            PipelineEventType.FIELD_COMPLETED,
+            ["output"],
+            "Hello",
+        )
+        assert events[-1].type == PipelineEventType.STEP_COMPLETED
+        assert events[-1].data.content == "Hello"
+
+    @pytest.mark.anyio
+    async def test_model_processor_usage_ignores_concurrent_calls(
+        self, litellm_calls, monkeypatch
+    ):
+        """Usage counts the request's own calls, not others on the same LM."""
+        import litellm
+
+        class QASignature(dspy.Signature):
+            input: str = dspy.InputField()
+            output: str = dspy.OutputField()
+
+        respond = litellm.completion
+        # Prompt marker -> (prompt tokens, latency); "other" ends between a and b
+        calls = {"item-a": (100, 0.1), "other": (7, 0.2), "item-b": (100, 0.3)}
+
+        def completion(**kwargs):
+            prompt = str(kwargs["messages"])
+            tokens, latency = next(v for k, v in calls.items() if k in prompt)
+            time.sleep(latency)
+            response = respond(**kwargs)
+            response.choices[
+                0
+            ].message.content = "[[ ## output ## ]]\nok\n\n[[ ## completed ## ]]"
+            response.usage.prompt_tokens = tokens
+            return response
+
+        monkeypatch.setattr(litellm, "completion", completion)
+        models = {
+            "gpt": {
+                "model_name": "openai/gpt-4o-mini",
+                "additional_params": {"engine": "litellm", "cache": False},
+            }
+        }
+        processor = ModelProcessor(
+            model_manager=ModelManager(DictConfigProvider(models), FrameworkSettings()),
+            model_id="gpt",
+            signature_class=QASignature,
+            input_key="input",
+            output_processor=DefaultOutputProcessor(),
+            accepted_types=[MediaType.TEXT],
+            output_type=MediaType.TEXT,
+        )
+        results = {}
+
+        async def run(name, content):
+            data = PipelineData(media_type=MediaType.TEXT, content=content)
+            results[name] = (await processor.process(data)).metadata["usage"]
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(run, "fan_out", ["item-a", "item-b"])
+            tg.start_soon(run, "other", "other")
+
+        assert results["fan_out"].prompt_tokens == 200
+        assert results["other"].prompt_tokens == 7
+
     def test_model_processor_media_types(self):
         """Test model processor media type handling"""
-        mock_model_manager = MagicMock()
+        mock_model_manager = StaticModelManager()
         mock_output_processor = DefaultOutputProcessor()
 
         processor = ModelProcessor(
@@ -182,6 +327,32 @@ class TestImageProcessor:
         assert result.metadata["processed_size"] == (800, 800)
         assert result.metadata["processed"] is True
 
+    @pytest.mark.anyio
+    async def test_image_processing_batch(self):
+        """Test that a list of images is processed in order"""
+        import io
+
+        from PIL import Image
+
+        images = []
+        for size in [(1000, 500), (100, 100), (400, 1600)]:
+            buffer = io.BytesIO()
+            Image.new("RGB", size).save(buffer, format="PNG")
+            images.append(buffer.getvalue())
+        data = PipelineData(media_type=MediaType.IMAGE, content=images)
+
+        result = await ImageProcessor(max_size=(800, 800), max_concurrency=2).process(
+            data
+        )
+        assert len(result.content) == 3
+        assert all(isinstance(image, dspy.Image) for image in result.content)
+        assert result.metadata["image_count"] == 3
+        assert [m["processed_size"] for m in result.metadata["images"]] == [
+            (800, 400),
+            (100, 100),
+            (200, 800),
+        ]
+
     def test_image_processor_media_types(self):
         """Test image processor media type handling"""
         processor = ImageProcessor()
@@ -0,0 +1,194 @@
+import time
+from unittest.mock import MagicMock
+
+import dspy
+import pytest
+from dspy.utils.callback import BaseCallback
+
+from llm_server.core import (
+    DeadlineExceededError,
+    ModelProcessor,
+    RateLimiter,
+    RateLimitExceededError,
+    deadline_scope,
+)
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.rate_limit import estimate_tokens
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import MediaType, PipelineData
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, ProviderError, StaticModelManager
+
+
+@pytest.mark.anyio
+async def test_limiter_waits_briefly_then_rejects():
+    limiter = RateLimiter("m", rpm=600, max_wait=0.5)  # one request per 0.1s
+    limiter.requests.level = 0
+
+    start = time.monotonic()
+    await limiter.acquire(1)
+    assert 0.05 < time.monotonic() - start < 0.4
+    assert limiter.stats["delayed"] == 1
+
+    limiter.max_wait = 0
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.acquire(1)
+    assert exc_info.value.retry_after > 0
+    assert limiter.stats["rejected"] == 1
+
+
+@pytest.mark.anyio
+async def test_token_reservation_is_corrected_by_usage_and_headers():
+    limiter = RateLimiter("m", tpm=1000)
+    await limiter.acquire(500)
+    assert limiter.tokens.level == pytest.approx(500, abs=1)
+
+    limiter.settle(reserved=500, actual=100)
+    assert limiter.tokens.level == pytest.approx(900, abs=1)
+
+    limiter.update_from_headers({"llm_provider-x-ratelimit-remaining-tokens": "50"})
+    assert limiter.tokens.level == pytest.approx(50, abs=1)
+
+
+@pytest.mark.anyio
+async def test_runtime_reserve_is_all_or_nothing():
+    model = RateLimiter("model", rpm=60)
+    provider = RateLimiter("openai", rpm=60, max_wait=0)
+    provider.requests.level = 0
+    runtime = ModelRuntime("model", limiters=[model, provider])
+
+    with pytest.raises(RateLimitExceededError):
+        await runtime.reserve(10)
+    assert model.requests.level == pytest.approx(60, abs=0.1)
+
+
+def test_estimate_tokens_counts_inputs_and_output_allowance():
+    assert estimate_tokens({"input": "x" * 400}, 100) == 201
+    assert estimate_tokens({"input": ["ab", "cd"]}, None) == 1002
+
+
+def test_model_manager_shares_provider_limits():
+    models = {
+        "mini": {"model_name": "openai/gpt-4o-mini", "rate_limits": {"rpm": 10}},
+        "big": {"model_name": "openai/gpt-4o"},
+        "flash": {"model_name": "gemini/gemini-2.0-flash"},
+    }
+    providers = {"openai": {"rate_limits": {"tpm": 100000}}}
+    manager = ModelManager(DictConfigProvider(models, providers), FrameworkSettings())
+
+    mini, big = manager.get_runtime("mini"), manager.get_runtime("big")
+    assert [limiter.name for limiter in mini.limiters] == ["mini", "openai"]
+    assert big.limiters[0] is mini.limiters[1]
+    assert manager.get_runtime("flash").limiters == []
+
+
+@pytest.mark.anyio
+async def test_rejected_calls_do_not_trip_the_breaker(monkeypatch):
+    predictor = MagicMock(return_value=MagicMock(output="ok"))
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    limiter = RateLimiter("mock-model-id", rpm=60, max_wait=0)
+    limiter.requests.level = 0
+    runtime = ModelRuntime("mock-model-id", limiters=[limiter])
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(
+            lm=MagicMock(spec=dspy.LM), runtimes={"mock-model-id": runtime}
+        ),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+
+    with pytest.raises(RateLimitExceededError):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="hi"))
+    predictor.assert_not_called()
+    assert runtime.breaker.failures == 0
+
+
+@pytest.mark.anyio
+async def test_failed_and_cancelled_calls_refund_their_tokens(monkeypatch):
+    def predict(**kwargs):
+        if kwargs["input"] == "slow":
+            time.sleep(0.3)
+        raise ProviderError(500)
+
+    monkeypatch.setattr(
+        "dspy.Predict", MagicMock(return_value=MagicMock(side_effect=predict))
+    )
+    limiter = RateLimiter("mock-model-id", tpm=10000)
+    runtime = ModelRuntime("mock-model-id", limiters=[limiter])
+    lm = MagicMock(spec=dspy.LM)
+    lm.copy.return_value = lm
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(lm=lm, runtimes={"mock-model-id": runtime}),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+
+    with pytest.raises(ProviderError):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="x"))
+    with pytest.raises(DeadlineExceededError), deadline_scope(0.1):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="slow"))
+    assert limiter.tokens.level == pytest.approx(10000, abs=1)
+
+
+@pytest.mark.anyio
+async def test_calls_settle_from_their_own_response(litellm_calls, monkeypatch):
+    import litellm
+
+    respond = litellm.completion
+
+    def completion(**kwargs):
+        response = respond(**kwargs)
+        response.choices[
+            0
+        ].message.content = "[[ ## output ## ]]\nok\n\n[[ ## completed ## ]]"
+        response._hidden_params = {
+            "additional_headers": {"llm_provider-x-ratelimit-remaining-tokens": "9000"}
+        }
+        return response
+
+    monkeypatch.setattr(litellm, "completion", completion)
+    models = {
+        "gpt": {
+            "model_name": "openai/gpt-4o-mini",
+            "rate_limits": {"tpm": 10000},
+            "additional_params": {"engine": "litellm", "cache": False},
+        }
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+    shared_lm = manager.get_model("gpt")
+
+    class ConcurrentCall(BaseCallback):
+        def on_lm_end(self, call_id, outputs, exception=None):
+            # Another request's call lands on the shared LM right after this one
+            other = litellm.ModelResponse(model="gpt-4o-mini")
+            other._hidden_params = {
+                "additional_headers": {
+                    "llm_provider-x-ratelimit-remaining-tokens": "50"
+                }
+            }
+            shared_lm.history.append({"response": other, "usage": {}})
+
+    shared_lm.callbacks.append(ConcurrentCall())
+    processor = ModelProcessor(
+        model_manager=manager,
+        model_id="gpt",
+        signature_class=dspy.Signature("input -> output"),
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+    )
+
+    await processor.process(PipelineData(media_type=MediaType.TEXT, content="hi"))
+
+    (limiter,) = manager.get_runtime("gpt").limiters
+    assert limiter.tokens.level == pytest.approx(9000, abs=1)
@@ -0,0 +1,156 @@
+from unittest.mock import MagicMock
+
+import dspy
+import pytest
+
+from llm_server.core import ModelProcessor, RetryPolicy, deadline_scope
+from llm_server.core.circuit_breaker import CircuitOpenError
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.retry import is_retryable, retry_after
+from llm_server.core.runtime import ModelRuntime
+from llm_server.core.types import MediaType, PipelineData
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider, ProviderError, StaticModelManager
+
+
+def flaky(failures: list[Exception], result: str = "ok"):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    call.calls = calls
+    return call
+
+
+def test_error_classification():
+    assert is_retryable(ProviderError(429))
+    assert is_retryable(ProviderError(503))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(ProviderError(400))
+    assert not is_retryable(CircuitOpenError("open"))
+    # DSPy raises its own errors from LiteLLM's
+    wrapped = RuntimeError("server error")
+    wrapped.__cause__ = ProviderError(503)
+    assert is_retryable(wrapped)
+    assert retry_after(ProviderError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(ProviderError(429, {"retry-after-ms": "150"})) == 0.15
+
+
+@pytest.mark.anyio
+async def test_transient_errors_are_retried():
+    policy = RetryPolicy(base_delay=0.01)
+    call = flaky([ProviderError(503), ProviderError(429)])
+
+    assert await policy.run(call, "m") == "ok"
+    assert len(call.calls) == 3
+    stats = policy.get_stats()
+    assert stats["retries"] == 2
+    assert stats["recovered"] == 1
+
+
+@pytest.mark.anyio
+async def test_permanent_errors_and_exhausted_attempts_are_raised():
+    policy = RetryPolicy(max_attempts=2, base_delay=0.01)
+
+    call = flaky([ProviderError(401)])
+    with pytest.raises(ProviderError):
+        await policy.run(call, "m")
+    assert len(call.calls) == 1
+
+    call = flaky([ProviderError(500)] * 5)
+    with pytest.raises(ProviderError):
+        await policy.run(call, "m")
+    assert len(call.calls) == 2
+    assert policy.get_stats()["gave_up"] == 1
+
+
+@pytest.mark.anyio
+async def test_retry_budget_caps_retries():
+    policy = RetryPolicy(base_delay=0.001, budget_ratio=0.0, budget_burst=1)
+
+    with pytest.raises(ProviderError):
+        await policy.run(flaky([ProviderError(500)] * 5), "m")
+
+    stats = policy.get_stats()
+    assert stats["retries"] == 1
+    assert stats["budget_exhausted"] == 1
+
+
+@pytest.mark.anyio
+async def test_retries_stay_within_the_deadline():
+    policy = RetryPolicy()
+    call = flaky([ProviderError(429, {"retry-after": "5"})])
+
+    with deadline_scope(1), pytest.raises(ProviderError):
+        await policy.run(call, "m")
+    assert len(call.calls) == 1
+
+
+@pytest.mark.anyio
+async def test_model_processor_retries_through_the_breaker(monkeypatch):
+    predictor = MagicMock(side_effect=[ProviderError(503), MagicMock(output="ok")])
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    runtime = ModelRuntime("mock-model-id")
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(
+            lm=MagicMock(spec=dspy.LM), runtimes={"mock-model-id": runtime}
+        ),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        retry=RetryPolicy(base_delay=0.01),
+    )
+
+    result = await processor.process(
+        PipelineData(media_type=MediaType.TEXT, content="hi")
+    )
+
+    assert result.content == "ok"
+    assert predictor.call_count == 2
+    assert runtime.breaker.metrics["failed_calls"] == 1
+
+
+@pytest.mark.anyio
+async def test_a_failing_attempt_makes_one_provider_call(monkeypatch):
+    monkeypatch.setenv("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    import litellm
+    import litellm.main
+
+    calls = []
+
+    def completion(*args, **kwargs):
+        calls.append(kwargs)
+        raise litellm.InternalServerError(
+            "unavailable", llm_provider="openai", model="gpt-4o-mini"
+        )
+
+    # Below litellm.completion, so LiteLLM's own retries would show up here
+    monkeypatch.setattr(litellm.main.openai_chat_completions, "completion", completion)
+    models = {
+        "gpt": {
+            "model_name": "openai/gpt-4o-mini",
+            "additional_params": {"engine": "litellm", "cache": False},
+        }
+    }
+    processor = ModelProcessor(
+        model_manager=ModelManager(DictConfigProvider(models), FrameworkSettings()),
+        model_id="gpt",
+        signature_class=dspy.Signature("input -> output"),
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        retry=RetryPolicy(max_attempts=1),
+    )
+
+    with pytest.raises(Exception, match="unavailable"):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="hi"))
+    assert len(calls) == 1
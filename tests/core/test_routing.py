@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from llm_server.core.config import FrameworkSettings
+from llm_server.core.routing import ModelRouter
+from llm_server.core.runtime import ModelRuntime
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider
+
+
+def runtime_with_latency(model_id: str, seconds: float) -> ModelRuntime:
+    runtime = ModelRuntime(model_id)
+    for _ in range(5):
+        runtime.latency.record(seconds)
+    return runtime
+
+
+def test_runtime_tracks_in_flight_errors_and_latency():
+    runtime = ModelRuntime("m")
+    with runtime.track():
+        assert runtime.in_flight == 1
+    with pytest.raises(RuntimeError):
+        with runtime.track():
+            raise RuntimeError("boom")
+
+    assert runtime.in_flight == 0
+    assert runtime.latency.count == 1
+    assert runtime.error_rate == pytest.approx(0.1)
+
+
+def test_least_outstanding_balances_latency_and_load():
+    fast = runtime_with_latency("fast", 0.1)
+    slow = runtime_with_latency("slow", 1.0)
+    router = ModelRouter("least_outstanding")
+
+    assert router.select([slow, fast]) is fast
+    fast.in_flight = 20
+    assert router.select([slow, fast]) is slow
+
+
+def test_router_skips_open_circuits_and_unhealthy_backends():
+    fast = runtime_with_latency("fast", 0.1)
+    slow = runtime_with_latency("slow", 0.5)
+    router = ModelRouter("least_outstanding")
+
+    fast.error_rate = 0.9
+    assert router.select([fast, slow]) is slow
+
+    fast.error_rate = 0.0
+    for _ in range(fast.breaker.failure_threshold):
+        fast.breaker._handle_failure(RuntimeError("down"))
+    assert fast.breaker.is_blocking
+    assert router.select([fast, slow]) is slow
+    # Nothing else available: route anyway and let the breaker decide
+    assert router.select([fast]) is fast
+
+
+def test_power_of_two_choices_drains_slow_backend():
+    runtimes = [runtime_with_latency(f"m{i}", 0.1) for i in range(3)]
+    runtimes.append(runtime_with_latency("slow", 2.0))
+    router = ModelRouter("p2c", rng=random.Random(0))
+
+    picks = [router.select(runtimes).model_id for _ in range(300)]
+    assert "slow" not in picks
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown routing strategy"):
+        ModelRouter("random")
+
+
+def test_model_manager_routes_groups():
+    config = {
+        "mini-east": {"model_name": "openai/gpt-4o-mini", "group": "mini"},
+        "mini-west": {"model_name": "openai/gpt-4o-mini", "group": "mini"},
+        "flash": {"model_name": "gemini/gemini-2.0-flash"},
+    }
+    manager = ModelManager(DictConfigProvider(config), FrameworkSettings())
+    manager.router = ModelRouter("least_outstanding")
+
+    assert manager.groups == {"mini": ["mini-east", "mini-west"]}
+    assert manager.select_model("flash") == "flash"
+
+    manager.runtimes["mini-east"] = runtime_with_latency("mini-east", 2.0)
+    manager.runtimes["mini-west"] = runtime_with_latency("mini-west", 0.2)
+    assert manager.select_model("mini") == "mini-west"
+    assert manager.select_model("mini", exclude=("mini-west",)) == "mini-east"
+    assert manager.get_model("mini") is manager.models["mini-west"]
+    assert manager.get_routing_stats("mini")["mini-west"]["in_flight"] == 0
+
+
+def test_group_name_cannot_shadow_model():
+    config = {"flash": {"model_name": "gemini/gemini-2.0-flash", "group": "flash"}}
+    with pytest.raises(ValueError, match="clashes"):
+        ModelManager(DictConfigProvider(config), FrameworkSettings())
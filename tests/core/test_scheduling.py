@@ -0,0 +1,165 @@
+from unittest.mock import MagicMock
+
+import anyio
+import dspy
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from llm_server.core import (
+    FairScheduler,
+    ModelProcessor,
+    add_request_class_middleware,
+    deadline_scope,
+    request_scope,
+)
+from llm_server.core.deadline import DeadlineExceededError
+from llm_server.core.output_processors import DefaultOutputProcessor
+from llm_server.core.scheduling import current_request_class
+from llm_server.core.types import MediaType, PipelineData
+from tests.fakes import StaticModelManager
+
+
+async def run_in_order(scheduler: FairScheduler, calls: list[tuple[str, str]]):
+    """Queue `calls` (tenant, priority) behind a blocker; return the service order."""
+    order: list[tuple[str, str]] = []
+    release = anyio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def call(tenant: str, priority: str):
+        async with scheduler.slot(tenant, priority):
+            order.append((tenant, priority))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0.01)
+        for tenant, priority in calls:
+            tg.start_soon(call, tenant, priority)
+            await anyio.sleep(0.001)
+        release.set()
+    return order
+
+
+def test_request_scope_nests_and_validates():
+    assert current_request_class().priority == "standard"
+    with request_scope(tenant="acme", priority="batch"):
+        with request_scope(priority="interactive") as inner:
+            assert (inner.tenant, inner.priority) == ("acme", "interactive")
+        assert current_request_class().priority == "batch"
+    assert current_request_class().tenant == "default"
+    with pytest.raises(ValueError), request_scope(priority="urgent"):
+        pass
+
+
+@pytest.mark.anyio
+async def test_higher_priority_classes_go_first():
+    scheduler = FairScheduler(max_in_flight=1)
+    order = await run_in_order(
+        scheduler, [("a", "batch"), ("a", "standard"), ("a", "interactive")]
+    )
+    assert [priority for _, priority in order] == ["interactive", "standard", "batch"]
+    assert scheduler.get_stats()["classes"]["batch"]["scheduled"] == 1
+
+
+@pytest.mark.anyio
+async def test_tenants_share_a_class_fairly():
+    scheduler = FairScheduler(max_in_flight=1)
+    backfill = [("bulk", "batch")] * 6
+    order = await run_in_order(scheduler, [*backfill, ("small", "batch")])
+    # The late tenant is served second, not behind the whole backfill
+    assert [tenant for tenant, _ in order][:2] == ["bulk", "small"]
+
+
+@pytest.mark.anyio
+async def test_tenant_weights_split_capacity():
+    scheduler = FairScheduler(max_in_flight=1, tenant_weights={"gold": 2.0})
+    order = await run_in_order(
+        scheduler, [("gold", "standard")] * 6 + [("free", "standard")] * 6
+    )
+    first_six = [tenant for tenant, _ in order][:6]
+    assert first_six.count("gold") == 4
+
+
+@pytest.mark.anyio
+async def test_tenant_in_flight_cap():
+    scheduler = FairScheduler(max_in_flight=4, tenant_max_in_flight=2)
+    running = {"a": 0, "b": 0}
+    max_running = {"a": 0, "b": 0}
+
+    async def call(tenant: str):
+        async with scheduler.slot(tenant):
+            running[tenant] += 1
+            max_running[tenant] = max(max_running[tenant], running[tenant])
+            await anyio.sleep(0.02)
+            running[tenant] -= 1
+
+    async with anyio.create_task_group() as tg:
+        for tenant in ["a"] * 5 + ["b"] * 2:
+            tg.start_soon(call, tenant)
+
+    assert max_running == {"a": 2, "b": 2}
+    assert scheduler.get_stats()["tenants"]["a"] == {"in_flight": 0, "queued": 0}
+
+
+@pytest.mark.anyio
+async def test_waiting_respects_the_deadline():
+    scheduler = FairScheduler(max_in_flight=1)
+    release = anyio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0.01)
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+            async with scheduler.slot():
+                pass
+        assert scheduler.get_stats()["classes"]["standard"]["queued"] == 0
+        release.set()
+    assert scheduler.in_flight == 0
+
+
+def test_middleware_sets_the_request_class():
+    app = add_request_class_middleware(FastAPI())
+
+    @app.get("/whoami")
+    async def whoami():
+        request_class = current_request_class()
+        return {"tenant": request_class.tenant, "priority": request_class.priority}
+
+    client = TestClient(app)
+    response = client.get(
+        "/whoami", headers={"X-Tenant-ID": "acme", "X-Priority": "interactive"}
+    )
+    assert response.json() == {"tenant": "acme", "priority": "interactive"}
+    response = client.get("/whoami", headers={"X-Priority": "urgent"})
+    assert response.json() == {"tenant": "default", "priority": "standard"}
+
+
+@pytest.mark.anyio
+async def test_model_processor_schedules_calls_for_the_current_tenant(monkeypatch):
+    predictor = MagicMock(return_value=MagicMock(output="ok"))
+    monkeypatch.setattr("dspy.Predict", MagicMock(return_value=predictor))
+    scheduler = FairScheduler()
+    processor = ModelProcessor(
+        model_manager=StaticModelManager(lm=MagicMock(spec=dspy.LM)),
+        model_id="mock-model-id",
+        signature_class=dspy.Signature,
+        input_key="input",
+        output_processor=DefaultOutputProcessor(),
+        accepted_types=[MediaType.TEXT],
+        output_type=MediaType.TEXT,
+        scheduler=scheduler,
+    )
+
+    with request_scope(tenant="acme", priority="interactive"):
+        await processor.process(PipelineData(media_type=MediaType.TEXT, content="hi"))
+
+    stats = scheduler.get_stats()
+    assert stats["classes"]["interactive"]["scheduled"] == 1
+    assert stats["tenants"] == {"acme": {"in_flight": 0, "queued": 0}}
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from llm_server.core import Pipeline, sse_response
+from llm_server.core.metrics_middleware import PerformanceMetricsMiddleware
+from llm_server.core.types import (
+    MediaType,
+    PipelineData,
+    PipelineEvent,
+    PipelineEventType,
+)
+
+
+class UpperStep:
+    async def process(self, data: PipelineData) -> PipelineData:
+        return PipelineData(media_type=MediaType.TEXT, content=data.content.upper())
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+class WordStreamStep:
+    """Streams its input back one word at a time."""
+
+    async def process(self, data: PipelineData) -> PipelineData:
+        return data
+
+    async def process_stream(self, data: PipelineData):
+        for word in data.content.split():
+            yield PipelineEvent(
+                type=PipelineEventType.PARTIAL, field="output", delta=word
+            )
+        yield PipelineEvent(type=PipelineEventType.STEP_COMPLETED, data=data)
+
+    @property
+    def accepted_media_types(self):
+        return [MediaType.TEXT]
+
+
+def make_pipeline() -> Pipeline:
+    return Pipeline([UpperStep(), WordStreamStep()])
+
+
+@pytest.mark.anyio
+async def test_execute_stream_events():
+    data = PipelineData(media_type=MediaType.TEXT, content="hello world")
+
+    events = [event async for event in make_pipeline().execute_stream(data)]
+
+    assert [(e.type.value, e.step) for e in events] == [
+        ("step_started", "UpperStep"),
+        ("step_completed", "UpperStep"),
+        ("step_started", "WordStreamStep"),
+        ("partial", "WordStreamStep"),
+        ("partial", "WordStreamStep"),
+        ("step_completed", "WordStreamStep"),
+        ("final", None),
+    ]
+    assert [e.delta for e in events if e.type == PipelineEventType.PARTIAL] == [
+        "HELLO",
+        "WORLD",
+    ]
+    assert events[-1].data.content == "HELLO WORLD"
+
+
+def test_sse_response_passes_through_metrics_middleware():
+    app = FastAPI()
+    app.add_middleware(PerformanceMetricsMiddleware)
+
+    @app.get("/v1/pipeline/stream")
+    async def stream():
+        data = PipelineData(media_type=MediaType.TEXT, content="hi there")
+        return sse_response(make_pipeline().execute_stream(data))
+
+    with TestClient(app) as client:
+        response = client.get("/v1/pipeline/stream")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [m for m in response.text.split("\n\n") if m]
+    assert messages[0].startswith("event: step_started\n")
+    assert messages[-1].startswith("event: final\n")
+    final = json.loads(messages[-1].split("data: ", 1)[1])
+    assert final["data"]["content"] == "HI THERE"
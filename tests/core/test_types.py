@@ -0,0 +1,46 @@
+from llm_server.core.types import MAX_METADATA_LAYERS, MediaType, PipelineData
+
+
+def test_metadata_default_is_not_shared():
+    first = PipelineData(media_type=MediaType.TEXT, content="a")
+    first.metadata["key"] = "value"
+
+    assert PipelineData(media_type=MediaType.TEXT, content="b").metadata == {}
+
+
+def test_derive_layers_metadata_without_copying():
+    content = b"\0" * 1024
+    base = PipelineData(media_type=MediaType.IMAGE, content=content, metadata={"a": 1})
+
+    derived = base.derive(media_type=MediaType.TEXT, b=2)
+    derived.metadata["c"] = 3
+    derived.metadata["a"] = 10
+
+    assert derived.content is content
+    assert derived.media_type == MediaType.TEXT
+    assert derived.metadata == {"a": 10, "b": 2, "c": 3}
+    # Writes land in the derived layer only
+    assert base.metadata == {"a": 1}
+
+
+def test_derive_matches_model_construct():
+    base = PipelineData(media_type=MediaType.TEXT, content="x", metadata={"a": 1})
+
+    derived = base.derive(content="y", b=2)
+    expected = PipelineData.model_construct(
+        media_type=MediaType.TEXT, content="y", metadata={"a": 1, "b": 2}
+    )
+
+    assert derived == expected
+    assert derived.model_fields_set == expected.model_fields_set
+    assert derived.model_dump() == expected.model_dump()
+    assert derived.model_dump_json() == expected.model_dump_json()
+
+
+def test_long_chains_are_flattened():
+    data = PipelineData(media_type=MediaType.TEXT, content="x")
+    for i in range(MAX_METADATA_LAYERS * 3):
+        data = data.derive(**{f"step_{i}": i})
+
+    assert len(data.metadata.maps) <= MAX_METADATA_LAYERS
+    assert data.metadata == {f"step_{i}": i for i in range(MAX_METADATA_LAYERS * 3)}
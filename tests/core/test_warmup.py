@@ -0,0 +1,152 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anyio
+import dspy
+import pytest
+
+from llm_server.core import HTTPClientPool, HTTPPoolConfig, model_lifespan
+from llm_server.core.circuit_breaker import State
+from llm_server.core.config import FrameworkSettings
+from llm_server.models.manager import ModelManager
+from tests.fakes import DictConfigProvider
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def manager():
+    models = {
+        "a": {"model_name": "stub/a"},
+        "b": {"model_name": "stub/b", "latency": 0.1},
+        "skipped": {"model_name": "stub/c", "warmup": False},
+    }
+    return ModelManager(DictConfigProvider(models), FrameworkSettings())
+
+
+class Describe(dspy.Signature):
+    """Describe the input."""
+
+    input: str = dspy.InputField()
+    tags: list[str] = dspy.OutputField()
+
+
+@pytest.mark.anyio
+async def test_warmup_runs_models_concurrently_and_reports_timings(manager):
+    manager.get_model("a").latency = 0.1
+    report = await manager.warmup(
+        signatures={"describe/1.0.0": Describe}, completion=True
+    )
+
+    models = report["models"]
+    assert set(models) == {"a", "b"}
+    assert models["b"]["completion_s"] >= 0.1
+    # The two models were warmed together, not one after the other
+    assert report["seconds"] < models["a"]["seconds"] + models["b"]["seconds"] - 0.05
+    assert report["programs"]["describe/1.0.0"] is not None
+    assert manager.get_model("a").calls == 1
+    assert manager.get_model("skipped").calls == 0
+
+
+@pytest.mark.anyio
+async def test_warmup_completion_sends_only_provider_parameters(litellm_calls):
+    models = {
+        "real": {
+            "model_name": "openai/gpt-4o-mini",
+            "additional_params": {"engine": "litellm"},
+        }
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+
+    report = await manager.warmup(completion=True, timeout=7)
+
+    assert "error" not in report["models"]["real"]
+    (call,) = litellm_calls
+    assert (call["max_tokens"], call["timeout"]) == (1, 7)
+    assert "config" not in call
+
+
+@pytest.mark.anyio
+async def test_warmup_prepares_litellm_for_models_that_use_it(monkeypatch):
+    monkeypatch.setenv("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    import litellm
+
+    looked_up = []
+    monkeypatch.setattr(litellm, "get_model_info", looked_up.append)
+    models = {
+        "default": {"model_name": "openai/gpt-4o-mini"},
+        "stub": {"model_name": "stub/a"},
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+
+    await manager.warmup()
+
+    assert looked_up == ["openai/gpt-4o-mini"]
+
+
+@pytest.mark.anyio
+async def test_failed_warmup_is_reported_not_raised(manager):
+    manager.get_model("a").error = ConnectionError("refused")
+
+    report = await manager.warmup(completion=True)
+
+    assert report["models"]["a"]["error"] == "ConnectionError: refused"
+    assert "error" not in report["models"]["b"]
+    assert manager.get_runtime("a").breaker.state == State.CLOSED
+
+
+@pytest.mark.anyio
+async def test_warmup_opens_pooled_connections(server_url):
+    models = {
+        "a": {"model_name": "stub/a", "additional_params": {"api_base": server_url}},
+        "b": {
+            "model_name": "stub/b",
+            "additional_params": {"api_base": f"{server_url}/v1"},
+        },
+    }
+    manager = ModelManager(DictConfigProvider(models), FrameworkSettings())
+    pool = manager.provider_manager.http_pool = HTTPClientPool(
+        "test", HTTPPoolConfig(http2=False)
+    )
+
+    report = await manager.warmup()
+
+    assert list(report["connections"]) == [server_url]
+    stats = pool.get_stats()
+    assert (stats["sync"]["idle"], stats["async"]["idle"]) == (1, 1)
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+async def test_lifespan_warms_up_then_runs_health_checks(manager):
+    manager.settings.health_check_interval = 0.02
+    manager.health.interval = 0.02
+    program_manager = type("Programs", (), {})()
+    program_manager.registry = type("Registry", (), {})()
+    program_manager.registry.programs = {"describe": {"1.0.0": Describe}}
+
+    async with model_lifespan(manager, program_manager, completion=True) as report:
+        assert list(report["programs"]) == ["describe/1.0.0"]
+        await anyio.sleep(0.15)
+
+    assert manager.health.get_stats()["a"]["probes"] >= 1
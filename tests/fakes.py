@@ -0,0 +1,61 @@
+"""Stand-ins for config providers, model managers and provider errors."""
+
+from typing import Any
+
+from llm_server.core.runtime import ModelRuntime
+
+
+class DictConfigProvider:
+    """A ConfigProvider serving `models` (and `providers`) config from dicts."""
+
+    def __init__(
+        self,
+        models: dict[str, Any],
+        providers: dict[str, Any] | None = None,
+    ):
+        self.models = models
+        self.providers = providers or {}
+
+    def get_models(self) -> dict[str, Any]:
+        return self.models
+
+    def get_providers(self) -> dict[str, Any]:
+        return self.providers
+
+
+class StaticModelManager:
+    """
+    A ModelRegistry over fixed LMs: `models` by id, else `lm` for any id.
+    There are no groups, and each model gets a ModelRuntime on first use
+    unless one is given in `runtimes`.
+    """
+
+    def __init__(
+        self,
+        models: dict[str, Any] | None = None,
+        lm: Any = None,
+        runtimes: dict[str, ModelRuntime] | None = None,
+    ):
+        self.models = models or {}
+        self.lm = lm
+        self.runtimes = runtimes if runtimes is not None else {}
+
+    def get_model(self, model_id: str) -> Any:
+        return self.models.get(model_id, self.lm)
+
+    def get_runtime(self, model_id: str) -> ModelRuntime:
+        if model_id not in self.runtimes:
+            self.runtimes[model_id] = ModelRuntime(model_id)
+        return self.runtimes[model_id]
+
+    def select_model(self, model_id: str, exclude: tuple[str, ...] = ()) -> str:
+        return model_id
+
+
+class ProviderError(Exception):
+    """An error from a provider call, carrying its HTTP status and headers."""
+
+    def __init__(self, status_code: int = 503, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}